@@ -0,0 +1,114 @@
+import inspect
+from functools import reduce
+
+import numpy as np
+
+from CybORG.Shared.ActionSpace import get_action_params
+
+
+class ActionTable:
+    """Flat integer encoding of every combination of action class and parameter values.
+
+    The table is compiled once per set of action classes and parameter values. Each row of
+    `table` holds the index of the action class followed by the index of each of its
+    parameter values, and an Action object is only instantiated for the index that is
+    looked up. Indices follow the order the wrappers have always used: action classes in
+    action space order, then the cartesian product of the parameter values with the first
+    parameter varying slowest.
+
+    With cache_actions=True the same Action object is returned every time an index is
+    looked up, until the table is recompiled.
+    """
+
+    def __init__(self, cache_actions: bool = False):
+        self.key = None
+        self.classes = []
+        self.param_names = []
+        self.param_values = []
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.table = np.zeros((0, 1), dtype=np.int32)
+        self.action_space = None
+        self.cache_actions = cache_actions
+        self._actions = {}
+
+    @staticmethod
+    def get_param_names(action_class) -> list:
+        """Parameters of the action class that are taken from the action space"""
+        return [name for name, parameter in get_action_params(action_class).items()
+                if name != 'priority' and parameter.kind != inspect.Parameter.VAR_KEYWORD]
+
+    def compile(self, action_space: dict) -> int:
+        """Rebuilds the table from an action space dict if its actions or parameter values changed.
+
+        Returns the number of actions in the table.
+        """
+        self.action_space = action_space
+        param_names = [self.get_param_names(action_class) for action_class in action_space['action']]
+        used_params = sorted({name for names in param_names for name in names})
+        key = (tuple(action_space['action']), tuple((name, tuple(action_space[name])) for name in used_params))
+        if key != self.key:
+            self.set_blocks([(action_class, names, [list(action_space[name]) for name in names])
+                             for action_class, names in zip(action_space['action'], param_names)])
+            self.key = key
+        return len(self)
+
+    def set_blocks(self, blocks: list):
+        """Sets the table from a list of (action class, parameter names, list of values for each parameter)"""
+        self.classes = []
+        self.param_names = []
+        self.param_values = []
+        self._actions = {}
+        sizes = []
+        rows = []
+        width = 1 + max((len(names) for _, names, _ in blocks), default=0)
+        for class_id, (action_class, names, values) in enumerate(blocks):
+            self.classes.append(action_class)
+            self.param_names.append(tuple(names))
+            self.param_values.append(values)
+            shape = tuple(len(v) for v in values)
+            indices = np.indices(shape).reshape(len(shape), -1).T if shape else np.zeros((1, 0), dtype=int)
+            block = np.zeros((len(indices), width), dtype=np.int32)
+            block[:, 0] = class_id
+            block[:, 1:1 + len(shape)] = indices
+            rows.append(block)
+            sizes.append(len(block))
+        self.offsets = np.concatenate(([0], np.cumsum(sizes, dtype=np.int64)))
+        self.table = np.concatenate(rows) if rows else np.zeros((0, width), dtype=np.int32)
+        self.key = None
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def get_params(self, index: int) -> dict:
+        row = self.table[index]
+        class_id = row[0]
+        values = self.param_values[class_id]
+        return {name: values[i][row[1 + i]] for i, name in enumerate(self.param_names[class_id])}
+
+    def __getitem__(self, index: int):
+        index = int(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f'Action index {index} out of range for {len(self)} actions')
+        if self.cache_actions and index in self._actions:
+            return self._actions[index]
+        action = self.classes[self.table[index][0]](**self.get_params(index))
+        if self.cache_actions:
+            self._actions[index] = action
+        return action
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def mask(self) -> np.ndarray:
+        """Boolean array marking the actions whose class and parameter values are all flagged valid in the action space"""
+        if self.action_space is None:
+            return np.ones(len(self), dtype=bool)
+        blocks = []
+        for action_class, names, values in zip(self.classes, self.param_names, self.param_values):
+            flags = [np.array([bool(self.action_space[name][value]) for value in v], dtype=bool)
+                     for name, v in zip(names, values)]
+            block = reduce(np.multiply.outer, flags, np.array(bool(self.action_space['action'][action_class])))
+            blocks.append(np.asarray(block, dtype=bool).reshape(-1))
+        return np.concatenate(blocks) if blocks else np.zeros(0, dtype=bool)
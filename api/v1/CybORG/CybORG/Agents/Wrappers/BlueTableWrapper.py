@@ -6,14 +6,46 @@ from CybORG.Shared.Results import Results
 from CybORG.Agents.Wrappers.BaseWrapper import BaseWrapper
 from CybORG.Agents.Wrappers.TrueTableWrapper import TrueTableWrapper
 
+# two entries of the vector observation for each column of the table
+ACTIVITY_BITS = {'None': (0, 0), 'Scan': (1, 0), 'Exploit': (1, 1)}
+COMPROMISED_BITS = {'No': (0, 0), 'Unknown': (1, 0), 'User': (0, 1), 'Privileged': (1, 1)}
+ACTIVITY_NAMES = {bits: name for name, bits in ACTIVITY_BITS.items()}
+COMPROMISED_NAMES = {bits: name for name, bits in COMPROMISED_BITS.items()}
+
+
+def fingerprint(value):
+    """Hashable copy of an observation value that is equal for values that compare equal"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, fingerprint(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(fingerprint(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(fingerprint(item) for item in value)
+    return value
+
+
 class BlueTableWrapper(BaseWrapper):
+    """Summarises the Blue observation as one row per host of activity and compromised level.
+
+    The state of every host is kept in `host_state`, an int8 array with one row per host in
+    the order of the initial observation holding the activity and compromised bits of the
+    vector observation. It is updated in place each step. The table is only built for the
+    'table' output mode and by get_table.
+    """
     def __init__(self,env=None, output_mode='table'):
         super().__init__(env)
         self.env = TrueTableWrapper(env=env)
 
         self.baseline = None
         self.output_mode = output_mode
+        # hostname -> [subnet, ip address, hostname]
         self.blue_info = {}
+        self.host_index = {}
+        self.host_state = np.zeros((0, 4), dtype=np.int8)
+        # hostid -> (fingerprint of the host, fingerprints of its files and processes)
+        self.baseline_index = {}
+        # hostid -> (fingerprint of the host, anomalies) from the last step
+        self.last_anomalies = {}
 
     def reset(self, agent='Blue', seed=None):        
         result = self.env.reset(agent)
@@ -41,21 +73,20 @@ class BlueTableWrapper(BaseWrapper):
 
     def observation_change(self,agent,observation,baseline=False):
         obs = observation if type(observation) == dict else observation.data
-        obs = deepcopy(observation)
+        if self.output_mode == 'anomaly':
+            # the anomalies returned share their process and file dicts with the observation
+            obs = deepcopy(obs)
         success = obs['success']
 
+        # activity is only reported for the current step
+        self.host_state[:, :2] = 0
         self._process_last_action()
-        anomaly_obs = self._detect_anomalies(obs) if not baseline else obs
-        del obs['success']
-        # TODO check what info is for baseline
-        info = self._process_anomalies(anomaly_obs)
         if baseline:
-            for host in info:
-                info[host][-2] = 'None'
-                info[host][-1] = 'No'
-                self.blue_info[host][-1] = 'No'
-
-        self.info = info
+            anomaly_obs = {hostid: host for hostid, host in obs.items() if hostid != 'success'}
+            self.host_state[:, 2:] = 0
+        else:
+            anomaly_obs = self._detect_anomalies(obs)
+            self._process_anomalies(anomaly_obs)
 
         if self.output_mode == 'table':
             return self._create_blue_table(success)
@@ -81,9 +112,26 @@ class BlueTableWrapper(BaseWrapper):
             subnet = interface['Subnet']
             ip = str(interface['IP Address'])
             hostname = host['System info']['Hostname']
-            self.blue_info[hostname] = [str(subnet),str(ip),hostname, 'None','No']
+            self.blue_info[hostname] = [str(subnet),str(ip),hostname]
+        self.baseline_index = {}
+        for hostid, host in self.baseline.items():
+            fields = {key: fingerprint(value) for key, value in host.items()}
+            self.baseline_index[hostid] = (tuple(sorted(fields.items())),
+                                           {key: set(fields.get(key, ())) for key in ('Files', 'Processes')})
+        self.last_anomalies = {}
+        self.host_index = {hostname: i for i, hostname in enumerate(self.blue_info)}
+        self.host_state = np.zeros((len(self.blue_info), 4), dtype=np.int8)
         return self.blue_info
 
+    def _set_activity(self, hostname, activity):
+        self.host_state[self.host_index[hostname], :2] = ACTIVITY_BITS[activity]
+
+    def _set_compromised(self, hostname, compromised):
+        self.host_state[self.host_index[hostname], 2:] = COMPROMISED_BITS[compromised]
+
+    def _get_compromised(self, hostname):
+        return COMPROMISED_NAMES[tuple(self.host_state[self.host_index[hostname], 2:])]
+
     def _process_last_action(self):
         action = self.get_last_action(agent='Blue')
         if action is not None:
@@ -91,67 +139,59 @@ class BlueTableWrapper(BaseWrapper):
             hostname = action.get_params()['hostname'] if name in ('Restore','Remove') else None
 
             if name == 'Restore':
-                self.blue_info[hostname][-1] = 'No'
+                self._set_compromised(hostname, 'No')
             elif name == 'Remove':
-                compromised = self.blue_info[hostname][-1]
+                compromised = self._get_compromised(hostname)
                 if compromised != 'No':
-                    self.blue_info[hostname][-1] = 'Unknown'
+                    self._set_compromised(hostname, 'Unknown')
 
     def _detect_anomalies(self,obs):
         if self.baseline is None:
             raise TypeError('BlueTableWrapper was unable to establish baseline. This usually means the environment was not reset before calling the step method.')
 
         anomaly_dict = {}
+        last_anomalies = {}
 
         for hostid,host in obs.items():
             if hostid == 'success':
                 continue
 
-            host_baseline = self.baseline[hostid]
-            if host == host_baseline:
-                continue
-
-            host_anomalies = {}
-            if 'Files' in host:
-                baseline_files = host_baseline.get('Files',[])
-                anomalous_files = []
-                for f in host['Files']:
-                    if f not in baseline_files:
-                        anomalous_files.append(f)
-                if anomalous_files:
-                    host_anomalies['Files'] = anomalous_files
-
-            if 'Processes' in host:
-                baseline_processes = host_baseline.get('Processes',[])
-                anomalous_processes = []
-                for p in host['Processes']:
-                    if p not in baseline_processes:
-                        anomalous_processes.append(p)
-                if anomalous_processes:
-                    host_anomalies['Processes'] = anomalous_processes
+            fields = {key: fingerprint(value) for key, value in host.items()}
+            host_fingerprint = tuple(sorted(fields.items()))
+            last = self.last_anomalies.get(hostid)
+            if last is not None and last[0] == host_fingerprint:
+                # the host has not changed since the last step, so neither have its anomalies
+                host_anomalies = last[1]
+            else:
+                baseline_fingerprint, baseline_items = self.baseline_index[hostid]
+                host_anomalies = {}
+                if host_fingerprint != baseline_fingerprint:
+                    for key in ('Files', 'Processes'):
+                        if key in host:
+                            anomalous = [item for item, item_fingerprint in zip(host[key], fields[key])
+                                         if item_fingerprint not in baseline_items[key]]
+                            if anomalous:
+                                host_anomalies[key] = anomalous
+            last_anomalies[hostid] = (host_fingerprint, host_anomalies)
 
             if host_anomalies:
                 anomaly_dict[hostid] = host_anomalies
 
+        self.last_anomalies = last_anomalies
         return anomaly_dict
 
     def _process_anomalies(self,anomaly_dict):
-        info = deepcopy(self.blue_info)
         for hostid, host_anomalies in anomaly_dict.items():
             assert len(host_anomalies) > 0
             if 'Processes' in host_anomalies:
                 connection_type = self._interpret_connections(host_anomalies['Processes'])
-                info[hostid][-2] = connection_type
+                self._set_activity(hostid, connection_type)
                 if connection_type == 'Exploit':
-                    info[hostid][-1] = 'User'
-                    self.blue_info[hostid][-1] = 'User'
+                    self._set_compromised(hostid, 'User')
             if 'Files' in host_anomalies:
                 malware = [f['Density'] >= 0.9 for f in host_anomalies['Files']]
                 if any(malware):
-                    info[hostid][-1] = 'Privileged'
-                    self.blue_info[hostid][-1] = 'Privileged'
-
-        return info
+                    self._set_compromised(hostid, 'Privileged')
 
     def _interpret_connections(self,activity:list):                
         num_connections = len(activity)
@@ -200,45 +240,16 @@ class BlueTableWrapper(BaseWrapper):
             'Activity',
             'Compromised'
             ])
-        for hostid in self.info:
-            table.add_row(self.info[hostid])
+        for hostname, row in self.blue_info.items():
+            state = self.host_state[self.host_index[hostname]]
+            table.add_row(row + [ACTIVITY_NAMES[tuple(state[:2])], COMPROMISED_NAMES[tuple(state[2:])]])
         
         table.sortby = 'Hostname'
         table.success = success
         return table
 
     def _create_vector(self, success):
-        table = self._create_blue_table(success)._rows
-
-        proto_vector = []
-        for row in table:
-            # Activity
-            activity = row[3]
-            if activity == 'None':
-                value = [0,0]
-            elif activity == 'Scan':
-                value = [1,0]
-            elif activity == 'Exploit':
-                value = [1,1]
-            else:
-                raise ValueError('Table had invalid Access Level')
-            proto_vector.extend(value)
-
-            # Compromised
-            compromised = row[4]
-            if compromised == 'No':
-                value = [0, 0]
-            elif compromised == 'Unknown':
-                value = [1, 0]
-            elif compromised == 'User':
-                value = [0,1]
-            elif compromised == 'Privileged':
-                value = [1,1]
-            else:
-                raise ValueError('Table had invalid Access Level')
-            proto_vector.extend(value)
-
-        return np.array(proto_vector)
+        return self.host_state.flatten()
 
     def get_attr(self,attribute:str):
         return self.env.get_attr(attribute)
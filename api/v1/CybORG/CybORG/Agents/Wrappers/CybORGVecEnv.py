@@ -0,0 +1,171 @@
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from gym import Env
+
+
+def _worker(conn, env_fn: Callable[[int], Env], seed: int, index: int):
+    """Runs a single environment, writing its observations into row `index` of the shared buffer.
+
+    Every command is answered with ('ok', result) or ('error', message).
+    """
+    buffer = None
+    observations = None
+    try:
+        env = env_fn(seed)
+        conn.send(('ok', (env.observation_space, env.action_space)))
+    except Exception as e:
+        conn.send(('error', f'{type(e).__name__}: {e}'))
+        conn.close()
+        return
+    while True:
+        command, data = conn.recv()
+        if command == 'close':
+            break
+        try:
+            if command == 'attach':
+                buffer = shared_memory.SharedMemory(name=data[0])
+                observations = np.ndarray(data[1], dtype=np.float32, buffer=buffer.buf)
+                result = None
+            elif command == 'reset':
+                observations[index] = env.reset()
+                result = None
+            elif command == 'step':
+                observation, reward, done, info = env.step(data)
+                if done:
+                    # the caller sees the first observation of the next episode, the last one is kept in info
+                    info = dict(info, terminal_observation=np.array(observation, dtype=np.float32))
+                    observation = env.reset()
+                observations[index] = observation
+                result = (reward, done, info)
+            elif command == 'call':
+                result = getattr(env, data[0])(*data[1], **data[2])
+            else:
+                raise ValueError(f'Unknown command {command}')
+            conn.send(('ok', result))
+        except Exception as e:
+            conn.send(('error', f'{type(e).__name__}: {e}'))
+    if buffer is not None:
+        del observations
+        buffer.close()
+    conn.close()
+
+
+class CybORGVecEnv:
+    """Steps several gym environments built around CybORG in parallel worker processes.
+
+    Each worker builds its environment with `env_fn(seed + i)`, so environment i is as
+    reproducible as the single environment created with that seed. Observations are written
+    by the workers into one shared float32 buffer and returned stacked, shape
+    (num_envs, observation size). Environments that finish an episode are reset automatically
+    and the final observation of the episode is put in info['terminal_observation'].
+
+    env_fn is sent to the worker processes, so with the 'spawn' and 'forkserver' start
+    methods it must be picklable, e.g. a module level function.
+    """
+
+    def __init__(self, env_fn: Callable[[int], Env], num_envs: int, seed: int = 0, start_method: Optional[str] = None):
+        self.num_envs = num_envs
+        self.closed = True
+        self.waiting = False
+        ctx = multiprocessing.get_context(start_method)
+        # workers must share the parent's resource tracker, otherwise one of their own unlinks
+        # the observation buffer when the worker exits
+        resource_tracker.ensure_running()
+        self.conns = []
+        self.processes = []
+        for i in range(num_envs):
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(target=_worker, args=(child_conn, env_fn, seed + i, i), daemon=True)
+            process.start()
+            child_conn.close()
+            self.conns.append(parent_conn)
+            self.processes.append(process)
+        spaces = self._receive()
+        self.observation_space, self.action_space = spaces[0]
+        assert all(observation_space.shape == self.observation_space.shape for observation_space, _ in spaces), \
+            'All environments must have the same observation shape'
+
+        shape = (num_envs,) + self.observation_space.shape
+        self._buffer = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)), 1) * np.dtype(np.float32).itemsize)
+        self._observations = np.ndarray(shape, dtype=np.float32, buffer=self._buffer.buf)
+        self.closed = False
+        for conn in self.conns:
+            conn.send(('attach', (self._buffer.name, shape)))
+        self._receive()
+
+    def _receive(self) -> list:
+        """Collects one reply from every worker, raising if any of them failed"""
+        replies = []
+        for conn in self.conns:
+            try:
+                replies.append(conn.recv())
+            except EOFError:
+                replies.append(('error', 'worker process exited'))
+        errors = [f'env {i}: {result}' for i, (status, result) in enumerate(replies) if status != 'ok']
+        if errors:
+            raise RuntimeError('; '.join(errors))
+        return [result for _, result in replies]
+
+    def reset(self) -> np.ndarray:
+        for conn in self.conns:
+            conn.send(('reset', None))
+        self._receive()
+        return self._observations.copy()
+
+    def step_async(self, actions):
+        """Sends one action to each environment without waiting for the results"""
+        assert len(actions) == self.num_envs, f'Expected {self.num_envs} actions, got {len(actions)}'
+        for conn, action in zip(self.conns, actions):
+            conn.send(('step', action))
+        self.waiting = True
+
+    def step_wait(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[dict]]:
+        self.waiting = False
+        results = self._receive()
+        rewards, dones, infos = zip(*results)
+        return self._observations.copy(), np.array(rewards, dtype=np.float32), np.array(dones, dtype=bool), list(infos)
+
+    def step(self, actions) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[dict]]:
+        self.step_async(actions)
+        return self.step_wait()
+
+    def env_method(self, method_name: str, *args, **kwargs) -> list:
+        """Calls a method on every environment and returns the results in environment order"""
+        for conn in self.conns:
+            conn.send(('call', (method_name, args, kwargs)))
+        return self._receive()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self.waiting:
+            try:
+                self.step_wait()
+            except RuntimeError:
+                pass
+        for conn in self.conns:
+            try:
+                conn.send(('close', None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        del self._observations
+        self._buffer.close()
+        self._buffer.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __del__(self):
+        if not getattr(self, 'closed', True):
+            self.close()
@@ -1,17 +1,19 @@
 import copy
-import inspect, pprint
+import pprint
 from typing import Union
 
+import numpy as np
+
 from CybORG.Agents.SimpleAgents import BaseAgent
 from CybORG.Agents.Wrappers import BaseWrapper
+from CybORG.Agents.Wrappers.ActionTable import ActionTable
 from CybORG.Shared import Results
 
 
 class EnumActionWrapper(BaseWrapper):
     def __init__(self, env: Union[type, BaseWrapper] = None):
         super().__init__(env)
-        self.possible_actions = None
-        self.action_signature = {}
+        self.possible_actions = ActionTable()
         self.get_action_space('Red')
 
     def step(self, agent=None, action: int = None) -> Results:
@@ -23,34 +25,8 @@ class EnumActionWrapper(BaseWrapper):
         assert type(action_space) is dict, \
             f"Wrapper required a dictionary action space. " \
             f"Please check that the wrappers below return the action space as a dict "
-        possible_actions = []
-        temp = {}
-        params = ['action']
-        # for action in action_space['action']:
-        for i, action in enumerate(action_space['action']):
-            if action not in self.action_signature:
-                self.action_signature[action] = inspect.signature(action).parameters
-            param_dict = {}
-            param_list = [{}]
-            for p in self.action_signature[action]:
-                if p == 'priority':
-                    continue
-                temp[p] = []
-                if p not in params:
-                    params.append(p)
-
-                if len(action_space[p]) == 1:
-                    for p_dict in param_list:
-                        p_dict[p] = list(action_space[p].keys())[0]
-                else:
-                    new_param_list = []
-                    for p_dict in param_list:
-                        for key, val in action_space[p].items():
-                            p_dict[p] = key
-                            new_param_list.append({key: value for key, value in p_dict.items()})
-                    param_list = new_param_list
-            for p_dict in param_list:
-                possible_actions.append(action(**p_dict))
+        return self.possible_actions.compile(action_space)
 
-        self.possible_actions = possible_actions
-        return len(possible_actions)
+    def action_mask(self) -> np.ndarray:
+        """Boolean array over the integer actions, True where the action and all its parameters are valid"""
+        return self.possible_actions.mask()
@@ -0,0 +1,205 @@
+from datetime import datetime
+from functools import partial
+
+import numpy as np
+
+
+def enum_fraction(size: int, value) -> float:
+    """Enum value divided by the number of members of the enum, -1 stays -1"""
+    if value != -1:
+        return value.value / size
+    return -1.0
+
+
+def enum_value(value) -> int:
+    if value != -1:
+        return value.value
+    return -1
+
+
+def scaled(scale: float, value) -> float:
+    return float(value) / scale
+
+
+def address_fraction(value) -> float:
+    return float(int(value)) / 4294967296
+
+
+def seconds_since_2020(value) -> float:
+    return (value - datetime(2020, 1, 1)).total_seconds()
+
+
+def subnet_fractions(value) -> tuple:
+    return float(int(value.network_address)) / 4294967296, float(int(value.prefixlen)) / 4294967296
+
+
+def constant(constant_value, value):
+    return constant_value
+
+
+def enum_fraction_of(enum_class):
+    return partial(enum_fraction, len(enum_class.__members__))
+
+
+class Index:
+    """Field encoded as the order in which its value was first seen, in the id map `name` of the encoder"""
+
+    def __init__(self, name: str, scale: float = None):
+        self.name = name
+        self.scale = scale
+
+
+class Block:
+    """Fixed size encoding of a dict: one slot per field followed by the nested blocks.
+
+    Fields are (key, transform) or (key, transform, width) tuples where transform is None
+    to copy the value, a callable or an Index. A callable of width > 1 returns that many values.
+    """
+
+    def __init__(self, fields: list, children: list = ()):
+        self.fields = fields
+        self.children = children
+        self.size = sum(field[2] if len(field) > 2 else 1 for field in fields) + sum(child.size for _, child in children)
+
+
+class ListBlock:
+    """The first `count` entries of a list, each encoded by `item` (a Block, or a transform for lists of values).
+
+    Entries past `count` are dropped, or raise ValueError with strict=True.
+    """
+
+    def __init__(self, count: int, item, strict: bool = False):
+        self.count = count
+        self.item = item
+        self.strict = strict
+        self.size = count * (item.size if isinstance(item, Block) else 1)
+
+
+class FlatObservationEncoder:
+    """Writes CybORG observation dicts into a fixed size numpy vector.
+
+    The layout of a host is compiled once from a Block schema, so every field has a fixed offset
+    and encoding a host only writes the fields present in the observation into a vector filled
+    with -1. Entries of the observation are encoded in order, 'success' as a single value and
+    every other entry as a host, up to max_hosts entries. Missing hosts are left as -1.
+
+    Values of Index fields are numbered in the order they are first seen, the id maps are kept
+    in `ids` across observations and only cleared by reset_ids.
+    """
+
+    def __init__(self, host: Block, max_hosts: int, success=None, skip_keys: tuple = (), dtype=np.float32,
+                 ids: dict = None):
+        self.max_hosts = max_hosts
+        self.success = success
+        self.skip_keys = skip_keys
+        self.dtype = dtype
+        self.ids = {} if ids is None else ids
+        self.host = self._compile(host)
+        self.host_size = host.size
+        # length of the observations that have a 'success' entry
+        self.size = 1 + (max_hosts - 1) * host.size
+        self.buffer = np.full(max_hosts * host.size, -1, dtype=dtype)
+
+    def _compile(self, block: Block) -> tuple:
+        """Turns a Block into (fields, children) with the offset of each field and nested block.
+
+        Children are (key, offset, compiled block or transform, list spec) where the list spec is
+        None for a nested dict and (count, item size, strict) for a ListBlock.
+        """
+        fields = []
+        offset = 0
+        for field in block.fields:
+            key, transform = field[:2]
+            width = field[2] if len(field) > 2 else 1
+            if isinstance(transform, Index):
+                # the scale the id is divided by takes the place of the transform
+                ids = self.ids.setdefault(transform.name, {})
+                fields.append((key, offset, width, ids, transform.scale))
+            else:
+                fields.append((key, offset, width, None, transform))
+            offset += width
+        children = []
+        for key, child in block.children:
+            if isinstance(child, ListBlock):
+                if isinstance(child.item, Block):
+                    item, item_size = self._compile(child.item), child.item.size
+                else:
+                    item, item_size = child.item, 1
+                children.append((key, offset, item, (child.count, item_size, child.strict)))
+            else:
+                children.append((key, offset, self._compile(child), None))
+            offset += child.size
+        return fields, children
+
+    def reset_ids(self):
+        for ids in self.ids.values():
+            ids.clear()
+
+    def encoded_size(self, observation: dict) -> int:
+        entries = [key for key in observation if key not in self.skip_keys][:self.max_hosts]
+        return (self.max_hosts - entries.count('success')) * self.host_size + entries.count('success')
+
+    def encode(self, observation: dict, out: np.ndarray = None) -> np.ndarray:
+        """Encodes the observation into `out`, e.g. a row of a batch, or into the encoder's own buffer.
+
+        Returns the written part of the vector. The encoder's buffer is reused by the next call.
+        The observation is not modified.
+        """
+        size = self.encoded_size(observation)
+        if out is None:
+            out = self.buffer
+        elif len(out) < size:
+            raise ValueError(f'Observation needs {size} values, the output only holds {len(out)}')
+        out = out[:size]
+        out.fill(-1)
+        position = 0
+        count = 0
+        for key, host in observation.items():
+            if key in self.skip_keys:
+                continue
+            if count == self.max_hosts:
+                break
+            count += 1
+            if key == 'success':
+                out[position] = self.success(host)
+                position += 1
+            elif not isinstance(host, dict):
+                raise ValueError('Host data must be a dict')
+            else:
+                self._write(self.host, host, out, position)
+                position += self.host_size
+        return out
+
+    def _write(self, block: tuple, data: dict, out: np.ndarray, start: int):
+        fields, children = block
+        for key, offset, width, ids, transform in fields:
+            if key not in data:
+                continue
+            value = data[key]
+            if ids is not None:
+                if value not in ids:
+                    ids[value] = len(ids)
+                value = ids[value] if transform is None else ids[value] / transform
+            elif transform is not None:
+                value = transform(value)
+            if width == 1:
+                out[start + offset] = value
+            else:
+                out[start + offset:start + offset + width] = value
+        for key, offset, child, list_spec in children:
+            if key not in data:
+                continue
+            if list_spec is None:
+                self._write(child, data[key], out, start + offset)
+                continue
+            count, item_size, strict = list_spec
+            entries = data[key]
+            if len(entries) > count:
+                if strict:
+                    raise ValueError(f'Too many {key} in observation for fixed size of {count}')
+                entries = entries[:count]
+            for i, entry in enumerate(entries):
+                if isinstance(child, tuple):
+                    self._write(child, entry, out, start + offset + i * item_size)
+                else:
+                    out[start + offset + i] = entry if child is None else child(entry)
@@ -53,13 +53,9 @@ class IntListToActionWrapper(BaseWrapper):
         # first remove old parameters
         for param in self.params_to_fix_at_start:
             if param in self.fixed_size:
-                remove_keys = []
-                for p in action_space[param].keys():
-                    if p not in self.fixed_size[param]:
-                        remove_keys.append(p)
-
-                for key in remove_keys:
-                    action_space[param].pop(key)
+                # filtered into a new dict, the values dicts belong to the agent's ActionSpace
+                action_space[param] = {key: value for key, value in action_space[param].items()
+                                       if key in self.fixed_size[param]}
                 # action_space[param] = self.fixed_size[param]
             else:
                 self.fixed_size[param] = list(action_space[param].keys())
@@ -1,5 +1,3 @@
-import inspect
-
 import numpy as np
 from gym import spaces, Env
 from typing import Union, List, Optional, Tuple
@@ -7,6 +5,7 @@ from typing import Union, List, Optional, Tuple
 from prettytable import PrettyTable
 
 from CybORG.Agents.SimpleAgents.BaseAgent import BaseAgent
+from CybORG.Agents.Wrappers.ActionTable import ActionTable
 from CybORG.Agents.Wrappers.BaseWrapper import BaseWrapper
 
 
@@ -15,7 +14,7 @@ class OpenAIGymWrapper(Env, BaseWrapper):
     def __init__(self, env: BaseWrapper, agent_name: str):
         super().__init__(env)
         self.agent_name = agent_name
-        self.action_signature = {}
+        self.possible_actions = ActionTable()
         if isinstance(self.get_action_space(self.agent_name), list):
             self.action_space = spaces.MultiDiscrete(self.get_action_space(self.agent_name))
         else:
@@ -80,34 +79,8 @@ class OpenAIGymWrapper(Env, BaseWrapper):
         assert type(action_space) is dict, \
             f"Wrapper required a dictionary action space. " \
             f"Please check that the wrappers below return the action space as a dict "
-        possible_actions = []
-        temp = {}
-        params = ['action']
-        # for action in action_space['action']:
-        for i, action in enumerate(action_space['action']):
-            if action not in self.action_signature:
-                self.action_signature[action] = inspect.signature(action).parameters
-            param_dict = {}
-            param_list = [{}]
-            for p in self.action_signature[action]:
-                if p == 'priority':
-                    continue
-                temp[p] = []
-                if p not in params:
-                    params.append(p)
-
-                if len(action_space[p]) == 1:
-                    for p_dict in param_list:
-                        p_dict[p] = list(action_space[p].keys())[0]
-                else:
-                    new_param_list = []
-                    for p_dict in param_list:
-                        for key, val in action_space[p].items():
-                            p_dict[p] = key
-                            new_param_list.append({key: value for key, value in p_dict.items()})
-                    param_list = new_param_list
-            for p_dict in param_list:
-                possible_actions.append(action(**p_dict))
-
-        self.possible_actions = possible_actions
-        return len(possible_actions)
+        return self.possible_actions.compile(action_space)
+
+    def action_mask(self) -> np.ndarray:
+        """Boolean array over the integer actions, True where the action and all its parameters are valid"""
+        return self.possible_actions.mask()
@@ -5,6 +5,7 @@ from gym import spaces
 
 from CybORG import CybORG
 from CybORG.Agents.Wrappers import BaseWrapper
+from CybORG.Agents.Wrappers.ActionTable import ActionTable
 from CybORG.Simulator.Actions import Sleep
 
 
@@ -166,30 +167,22 @@ class PettingZooParallelWrapper(BaseWrapper):
         Returns a dictionary containing dictionaries that maps the number selected by the agent to a specific CybORG action
 
         '''
+        action_space = self.env.get_action_space(self.active_agents[0])
+        sessions = [0] if 0 in action_space['session'] else []
         cyborg_agent_actions = {}
         for agent in self.active_agents:
-            cyborg_action_to_int = {}
-            act_count = 0
-            for action in self.env.get_action_space(self.active_agents[0])['action'].keys():
-                params_dict = {}
+            blocks = []
+            for action in action_space['action'].keys():
                 if action.__name__ == 'Sleep':
-                    cyborg_action_to_int[act_count] = Sleep()
-                    act_count+=1
+                    blocks.append((Sleep, [], []))
                 elif action.__name__ == 'RemoveOtherSessions':
-                    params_dict['agent'] = agent
-                    params_dict['session'] = 0
-                    cyborg_action_to_int[act_count] = action(**params_dict)
-                    act_count+=1
+                    blocks.append((action, ['agent', 'session'], [[agent], [0]]))
                 else:
-                    for ip in self.env.get_action_space(self.active_agents[0])['ip_address'].keys():
-                        for sess in self.env.get_action_space(self.active_agents[0])['session'].keys():
-                            if sess == 0:
-                                params_dict['session'] = 0
-                                params_dict['ip_address'] = ip
-                                params_dict['agent'] = agent
-                                cyborg_action_to_int[act_count] = action(**params_dict)
-                                act_count+=1
-            cyborg_agent_actions[agent] = cyborg_action_to_int
+                    blocks.append((action, ['ip_address', 'session', 'agent'], [list(action_space['ip_address']), sessions, [agent]]))
+            # actions are built when first chosen and then reused for the rest of the episode
+            table = ActionTable(cache_actions=True)
+            table.set_blocks(blocks)
+            cyborg_agent_actions[agent] = table
         return cyborg_agent_actions
     
     def get_action_space(self, agent):
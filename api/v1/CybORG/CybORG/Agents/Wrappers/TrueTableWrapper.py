@@ -41,7 +41,8 @@ class TrueTableWrapper(BaseWrapper):
                 self.scanned_ips.add(ip)
 
     def _create_true_table(self):
-        true_obs = deepcopy(self.env.get_agent_state('True'))
+        # shallow copy of the shared true state, only the top level is modified
+        true_obs = dict(self.get_attr('get_cached_agent_state')('True'))
         success = true_obs.pop('success')
         table = PrettyTable([
             'Subnet',
@@ -9,3 +9,4 @@ from .ChallengeWrapper import ChallengeWrapper
 from .IntFixedFlatWrapper import IntFixedFlatWrapper
 from .SimpleRedWrapper import SimpleRedWrapper
 from .PettingZooParallelWrapper import PettingZooParallelWrapper
+from .CybORGVecEnv import CybORGVecEnv
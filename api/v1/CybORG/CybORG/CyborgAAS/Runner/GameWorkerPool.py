@@ -0,0 +1,289 @@
+import logging
+import multiprocessing
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set
+
+from CybORG.Shared.StepProfiler import CybORGProfiler
+
+logger = logging.getLogger(__name__)
+
+
+def _worker_main(conn):
+    """Entry point of a pool worker process.
+
+    CybORG (and with it networkx, gym and pettingzoo) is imported once when the
+    worker starts, so creating a game afterwards only costs building the
+    environment. Every game hosted by this worker lives in `runners`, keyed by
+    game_id, and commands are served one at a time from the pipe.
+
+    A 'stream' command sends each step as an ('item', state) message and stops
+    after the current step once a 'cancel' message is received. A 'cancel' that
+    arrives after the stream has already finished is ignored.
+    """
+    from CybORG.CyborgAAS.Runner.SimpleAgentRunner import SimpleAgentRunner, CybORGFactory
+
+    # parse the default scenario file up front so the first game does not pay for it
+    CybORGFactory.get_scenario_generator(CybORGFactory.file_name)
+
+    runners: Dict[str, SimpleAgentRunner] = {}
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        op, game_id, kwargs = message
+        if op == 'cancel':
+            continue
+        try:
+            if op == 'create':
+                runner = SimpleAgentRunner(**kwargs)
+                runner.configure()
+                runners[game_id] = runner
+                result = {
+                    'state_snapshot': runner.keyframe,
+                    'current_step': runner.current_step
+                }
+            elif op == 'step':
+                runner = runners[game_id]
+                result = {
+                    'state_snapshot': runner.run_next_step(),
+                    'current_step': runner.current_step
+                }
+            elif op == 'command':
+                result = runners[game_id].handle_command(kwargs['command'])
+            elif op == 'stream':
+                runner = runners[game_id]
+                for state in runner.iter_steps(kwargs['count']):
+                    conn.send(('item', state))
+                    if conn.poll() and conn.recv()[0] == 'cancel':
+                        break
+                result = {
+                    'current_step': runner.current_step,
+                    'done': runner.current_step >= runner.max_steps
+                }
+            elif op == 'end':
+                runners.pop(game_id, None)
+                result = None
+            elif op == 'metrics':
+                result = CybORGProfiler.collect()
+            else:
+                raise ValueError(f'Unknown worker command {op}')
+            conn.send(('ok', result))
+        except Exception as e:
+            logger.exception(f"Command {op} failed for game {game_id}")
+            conn.send(('error', f'{type(e).__name__}: {e}'))
+    conn.close()
+
+
+@dataclass
+class _Worker:
+    """Handle on a single worker process held by the parent."""
+    process: multiprocessing.Process
+    conn: object
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    games: Set[str] = field(default_factory=set)
+
+    def call(self, op: str, game_id: Optional[str], timeout: Optional[float] = None, **kwargs):
+        """Sends a command and waits for its reply, raising TimeoutError if the worker
+        stays busy with other commands for longer than `timeout` seconds"""
+        # the pipe carries a single request/reply at a time
+        if not self.lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise TimeoutError(f'Worker {self.process.pid} is busy')
+        try:
+            self.conn.send((op, game_id, kwargs))
+            status, result = self.conn.recv()
+        finally:
+            self.lock.release()
+        if status != 'ok':
+            raise RuntimeError(result)
+        return result
+
+    def stream(self, op: str, game_id: str, **kwargs) -> '_Stream':
+        """Like call, but returns an iterator over every ('item', value) message sent before the final reply"""
+        return _Stream(self, (op, game_id, kwargs))
+
+
+class _Stream:
+    """Iterator over the items of a streaming worker command.
+
+    The worker stays locked from the first item until the stream is exhausted or
+    closed. Closing it early asks the worker to stop after its current step and
+    returns the items the worker had already sent, so the caller does not lose
+    steps that were executed.
+    """
+
+    def __init__(self, worker: _Worker, message: tuple):
+        self.worker = worker
+        self.message = message
+        self.started = False
+        self.finished = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.finished:
+            raise StopIteration
+        if not self.started:
+            self.worker.lock.acquire()
+            self.started = True
+            try:
+                self.worker.conn.send(self.message)
+            except BaseException:
+                self._finish()
+                raise
+        try:
+            status, result = self.worker.conn.recv()
+        except BaseException:
+            self._finish()
+            raise
+        if status == 'item':
+            return result
+        self._finish()
+        if status != 'ok':
+            raise RuntimeError(result)
+        raise StopIteration
+
+    def close(self) -> list:
+        """Stops the stream and returns the items received from the worker after the last one consumed"""
+        if not self.started or self.finished:
+            self.finished = True
+            return []
+        remaining = []
+        try:
+            self.worker.conn.send(('cancel', self.message[1], {}))
+            # the worker may have run a step before it saw the cancel, the pipe
+            # is read up to the final reply to keep it in sync
+            while True:
+                status, result = self.worker.conn.recv()
+                if status != 'item':
+                    break
+                remaining.append(result)
+        finally:
+            self._finish()
+        if status != 'ok':
+            logger.error(f"Stream for game {self.message[1]} failed after it was closed: {result}")
+        return remaining
+
+    def _finish(self):
+        self.finished = True
+        self.worker.lock.release()
+
+
+class GameWorkerPool:
+    """A pool of long-lived worker processes that each host many games.
+
+    Replaces spawning one `SimpleAgentRunner.py` interpreter per game. Workers are
+    started once with CybORG already imported and each one keeps a
+    `SimpleAgentRunner` per game_id. New games go to the worker currently hosting
+    the fewest games.
+
+    All methods are blocking and thread safe; async callers should run them in a
+    thread (e.g. `asyncio.to_thread`).
+    """
+
+    def __init__(self, num_workers: Optional[int] = None):
+        self.num_workers = num_workers or int(os.getenv('CYBORG_NUM_WORKERS', 0)) or os.cpu_count() or 1
+        self.workers = []
+        self.game_to_worker: Dict[str, _Worker] = {}
+        self._lock = threading.Lock()
+        # spawn rather than fork: the parent is an asyncio server with threads running
+        self._ctx = multiprocessing.get_context('spawn')
+
+    def start(self):
+        for _ in range(self.num_workers - len(self.workers)):
+            parent_conn, child_conn = self._ctx.Pipe()
+            process = self._ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+            process.start()
+            child_conn.close()
+            self.workers.append(_Worker(process=process, conn=parent_conn))
+        logger.info(f"Started {len(self.workers)} game workers.")
+
+    def shutdown(self):
+        for worker in self.workers:
+            try:
+                with worker.lock:
+                    worker.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        self.workers = []
+        self.game_to_worker = {}
+
+    def has_game(self, game_id: str) -> bool:
+        return game_id in self.game_to_worker
+
+    def load(self) -> Dict[int, int]:
+        """Returns the number of games hosted by each worker, keyed by worker pid"""
+        return {worker.process.pid: len(worker.games) for worker in self.workers}
+
+    def create_game(self, game_id: str, num_steps: int, wrapper_type: str, red_agent_type: str,
+                    blue_agent_type: str):
+        if not self.workers:
+            self.start()
+        with self._lock:
+            worker = min(self.workers, key=lambda w: len(w.games))
+            worker.games.add(game_id)
+            self.game_to_worker[game_id] = worker
+        try:
+            return worker.call('create', game_id, num_steps=num_steps, wrapper_type=wrapper_type,
+                               red_agent_type=red_agent_type, blue_agent_type=blue_agent_type)
+        except Exception:
+            self._forget(game_id)
+            raise
+
+    def run_next_step(self, game_id: str):
+        return self._get_worker(game_id).call('step', game_id)
+
+    def run_steps(self, game_id: str, count: int = None):
+        """Runs `count` steps (or the rest of the game if None) in a single round trip"""
+        command = {'command': 'run'} if count is None else {'command': 'step', 'count': count}
+        return self._get_worker(game_id).call('command', game_id, command=command)
+
+    def iter_steps(self, game_id: str, count: int = None):
+        """Runs `count` steps (or the rest of the game if None) back to back,
+        yielding each {'state_snapshot', 'current_step'} as soon as the worker sends it.
+
+        Calling close() on the returned iterator before it is exhausted stops the game
+        after the current step and returns the steps that were not consumed yet.
+        """
+        return self._get_worker(game_id).stream('stream', game_id, count=count)
+
+    def metrics(self, timeout: float = 1.0) -> list:
+        """Step timing histograms of every worker merged together, see CybORGProfiler.
+
+        Workers only record them when started with CYBORG_PROFILE set. A worker that is
+        still busy after `timeout` seconds, e.g. streaming a whole game, is left out.
+        """
+        collections = []
+        for worker in self.workers:
+            try:
+                collections.append(worker.call('metrics', None, timeout=timeout))
+            except TimeoutError:
+                logger.info(f"Worker {worker.process.pid} is busy, its metrics are left out.")
+        return CybORGProfiler.merge(collections)
+
+    def end_game(self, game_id: str):
+        worker = self._get_worker(game_id)
+        try:
+            worker.call('end', game_id)
+        finally:
+            self._forget(game_id)
+
+    def _get_worker(self, game_id: str) -> _Worker:
+        worker = self.game_to_worker.get(game_id)
+        if worker is None:
+            raise KeyError(f'Game {game_id} is not hosted by this pool')
+        return worker
+
+    def _forget(self, game_id: str):
+        with self._lock:
+            worker = self.game_to_worker.pop(game_id, None)
+            if worker is not None:
+                worker.games.discard(game_id)
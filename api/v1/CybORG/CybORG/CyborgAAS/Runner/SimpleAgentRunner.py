@@ -1,7 +1,6 @@
 import argparse
 import inspect
 import sys
-import time
 from statistics import mean, stdev
 from pprint import pprint
 from dataclasses import dataclass
@@ -21,10 +20,6 @@ from CybORG.Simulator.Scenarios.FileReaderScenarioGenerator import FileReaderSce
 
 from CybORG.GameVisualizer.GameStateCollector import GameStateCollector
 
-import os
-import json
-import redis
-
 import logging
 from pathlib import Path
 
@@ -62,19 +57,29 @@ class BlueAgentFactory:
         else:
             return BlueReactRemoveAgent()  
 
+# Parsed scenario files shared by every game in this process.
+# create_scenario deep copies the parsed scenario so sharing a generator is safe.
+_scenario_generators = {}
+
 @dataclass
 class CybORGFactory:
     """Class for keeping building agents."""
     type: str = "wrap"
     file_name: str = "Scenario2"
     
+    @staticmethod
+    def get_scenario_generator(file_name: str) -> FileReaderScenarioGenerator:
+        if file_name not in _scenario_generators:
+            path = str(inspect.getfile(CybORG))
+            path = path[:-7] + f'/Simulator/Scenarios/scenario_files/{file_name}.yaml'
+            _scenario_generators[file_name] = FileReaderScenarioGenerator(path)
+        return _scenario_generators[file_name]
+
     def wrap(self, env):
         return ChallengeWrapper(env=env, agent_name='Blue')
     
     def create(self, type: str, red_agent) -> CybORG:
-        path = str(inspect.getfile(CybORG))
-        path = path[:-7] + f'/Simulator/Scenarios/scenario_files/{self.file_name}.yaml'
-        sg = FileReaderScenarioGenerator(path)
+        sg = self.get_scenario_generator(self.file_name)
         cyborg = CybORG(sg, 'sim', agents={'Red': red_agent})
         
         if type == "wrap":
@@ -103,6 +108,7 @@ class SimpleAgentRunner:
         self.cyborg = None
         
         self.game_state_manager = GameStateCollector(environment='sim')
+        self.keyframe = None
 
     def set_red_type(self, red_agent_type: str):
         self.red_agent_type = red_agent_type
@@ -123,6 +129,8 @@ class SimpleAgentRunner:
             blue_agent_name=self.blue_agent_type,
             num_steps=self.max_steps
         )
+        # full view for step 0, the snapshots of later steps are deltas against it
+        self.keyframe = self.game_state_manager.create_keyframe()
         logger.info("Environment configured.")
 
     def run_next_step(self):
@@ -154,6 +162,50 @@ class SimpleAgentRunner:
         logger.info(f"Completed step {self.current_step}.")
         return state_snapshot
 
+    def iter_steps(self, count: int = None):
+        """Runs `count` steps back to back, or until the end of the game if count is None.
+
+        Yields a {'state_snapshot', 'current_step'} dict as soon as each step is executed.
+        """
+        remaining = self.max_steps - self.current_step
+        count = remaining if count is None else min(count, remaining)
+        for _ in range(max(count, 0)):
+            state_snapshot = self.run_next_step()
+            yield {
+                'state_snapshot': state_snapshot,
+                'current_step': self.current_step
+            }
+
+    def run_steps(self, count: int = None) -> list:
+        """Same as iter_steps but returns all the executed steps as a list"""
+        return list(self.iter_steps(count))
+
+    def handle_command(self, command: dict) -> dict:
+        """Executes a step command and returns the reply.
+
+        Commands are dicts of the form
+            {"command": "step", "count": K}  run K steps (count defaults to 1)
+            {"command": "run"}                run to the end of the game
+        A ValueError is raised for anything else.
+        """
+        if not isinstance(command, dict):
+            raise ValueError(f'Commands must be objects, got {command!r}')
+        name = command.get('command', 'step')
+        if name == 'step':
+            count = command.get('count', 1)
+            if isinstance(count, bool) or not isinstance(count, int) or count < 1:
+                raise ValueError(f'count must be a positive integer, got {count!r}')
+            states = self.run_steps(count)
+        elif name == 'run':
+            states = self.run_steps()
+        else:
+            raise ValueError(f'Unknown command {name!r}')
+        return {
+            'states': states,
+            'current_step': self.current_step,
+            'done': self.current_step >= self.max_steps
+        }
+
 def parse_args():
     parser = argparse.ArgumentParser(description='Run a simple agent.')
     parser.add_argument('--game_id', type=str, default='1', help='Game ID.')
@@ -164,29 +216,9 @@ def parse_args():
     return parser.parse_args()
 
 if __name__ == '__main__':
+    # games served by the API are hosted by GameWorkerPool, this runs a single game locally
     args = parse_args()
     logger.info(f"Starting SimpleAgentRunner with game_id: {args.game_id}")
-
-    # Connect to redis server
-    redis_server = os.getenv('REDIS_SERVER', 'localhost')
-    try:
-        redis_client = redis.Redis(host=redis_server, port=6379, db=0) 
-        # Test connection
-        redis_client.ping()
-        logger.info(f"Connected to Redis server at {redis_server}.")
-    except redis.ConnectionError:
-        logger.error(f'Error connecting to Redis server at {redis_server}.')
-        sys.exit(1)
-    
-    pubsub = redis_client.pubsub()
-    try:
-        pubsub.subscribe(f'game_{args.game_id}_main')
-        logger.info(f"Subscribed to Redis channel 'game_{args.game_id}_main'.")
-    except redis.RedisError as e:
-        logger.error(f"Failed to subscribe to channel: {e}")
-        sys.exit(1)
-    
-    # Create an instance of SimpleAgentRunner
     runner = SimpleAgentRunner(
         num_steps=args.num_steps,
         wrapper_type=args.wrapper_type,
@@ -194,28 +226,9 @@ if __name__ == '__main__':
         blue_agent_type=args.blue_agent_type
     )
     runner.configure()
-    
     try:
-        while runner.current_step < runner.max_steps:
-            # logger.info("Waiting for message on Redis channel...")
-            message = pubsub.get_message(timeout=1.0)
-            if message and message.get('type') == 'message':
-                logger.info(f"Received message: {message}")
-                state_snapshot = runner.run_next_step()
-                data = { 
-                    'state_snapshot': state_snapshot,
-                    'current_step': runner.current_step
-                }
-                # Push the state_snapshot onto a Redis list
-                redis_client.rpush(f'game:{args.game_id}:states', json.dumps(data))
-                logger.info("Pushed state snapshot to Redis list.")
-                time.sleep(1)
-            else:
-                logger.debug("No message received.")
+        reply = runner.handle_command({'command': 'run'})
+        logger.info(f"Game {args.game_id} finished after {reply['current_step']} steps.")
+        pprint(runner.game_state_manager.get_rewards())
     except KeyboardInterrupt:
         logger.info("Interrupted by user. Exiting...")
-    except Exception as e:
-        logger.error(f"An unexpected error occurred: {e}")
-    finally:
-        pubsub.close()
-        logger.info("Redis pubsub connection closed.")
@@ -3,6 +3,7 @@ import inspect
 import time
 import os
 from copy import deepcopy
+from types import MappingProxyType
 from statistics import mean, stdev
 import random
 import collections
@@ -13,6 +14,9 @@ from enum import Enum
 from CybORG.Agents.Wrappers.TrueTableWrapper import true_obs_to_table
 
 from CybORG.GameVisualizer.GameStateCollector.utils import get_host_info, get_node_color, get_node_border
+from CybORG.GameVisualizer.GameStateCollector.delta import make_delta
+from CybORG.GameVisualizer.GameStateCollector.layout_cache import get_node_positions, topology_fingerprint
+from CybORG.Simulator.Scenarios.FileReaderScenarioGenerator import FileReaderScenarioGenerator
 
 class RewardTracker:
     def __init__(self):
@@ -29,7 +33,6 @@ class GameStateCollector:
         self.num_steps = None
         self.ip_map = None
         self.host_map = None
-        self.true_state = None
         self.true_table = None
         self.accumulated_rewards = collections.defaultdict(lambda: collections.defaultdict(float))
         self.game_states = collections.defaultdict(lambda: collections.defaultdict(lambda: collections.defaultdict(dict)))
@@ -40,6 +43,12 @@ class GameStateCollector:
         self.discovered_subnets = set()
         self.discovered_systems = set()
 
+        # last full view sent for each agent, deltas are computed against it
+        self.last_views = {}
+
+        # (fingerprint, node link data, node positions) of the last seen link diagram
+        self.topology = None
+
     def set_environment(self, cyborg=None, red_agent_name=None, blue_agent_name=None, num_steps=30):
         self.cyborg = cyborg
         self.blue_agent_name = blue_agent_name
@@ -56,7 +65,15 @@ class GameStateCollector:
         self.cyborg_host_to_ip_map = {host: str(ip) for host, ip in self.cyborg.get_ip_map().items()}
 
     def _get_true_state(self):
-        return deepcopy(self.cyborg.get_agent_state('True'))
+        """Read only view of the true state, built at most once per change of the simulation state.
+
+        The underlying dict is shared with the reward calculators and wrappers of the same step.
+        Use _get_true_state_copy to get a copy that may be modified.
+        """
+        return MappingProxyType(self.cyborg.get_cached_agent_state('True'))
+
+    def _get_true_state_copy(self):
+        return deepcopy(dict(self._get_true_state()))
 
     def _get_last_reward(self, agent_type):
         return self.cyborg.get_rewards()[agent_type]
@@ -71,6 +88,19 @@ class GameStateCollector:
     def get_rewards(self):
         return {agent: dict(rewards) for agent, rewards in self.accumulated_rewards.items()}
 
+    def create_keyframe(self):
+        """Full view of the environment before any step is taken, stored as step 0.
+
+        Following snapshots from create_state_snapshot are deltas against it.
+        """
+        state_snapshot = {}
+        for host_type in ['Blue', 'Red']:
+            action_info = {"action": "", "success": None}
+            view = self._build_view(target_host="", action_info=action_info)
+            self.last_views[host_type] = view
+            state_snapshot[host_type] = dict(view, keyframe=True)
+        return state_snapshot
+
     def create_state_snapshot(self, actions:dict, observations:dict):
         ############
         ## fo viz ##
@@ -82,15 +112,18 @@ class GameStateCollector:
             action = actions[host_type]
             observation = observations[host_type]
             
-            state_snapshot[host_type] = self.generate_state_snapshot(action, observation, host_type)
+            view = self.generate_state_snapshot(action, observation, host_type)
+            previous = self.last_views.get(host_type)
+            self.last_views[host_type] = view
+            if previous is None:
+                state_snapshot[host_type] = dict(view, keyframe=True)
+            else:
+                state_snapshot[host_type] = make_delta(previous, view)
                 
         return state_snapshot   
 
     def generate_state_snapshot(self, action, observation, host_type: str):
         target_host, action_type, isSuccess = self.parse_observation(action, observation, self.host_map, self.ip_map)
-        true_obs = self._get_true_state() | {}
-        
-        link_diagram = self.cyborg.environment_controller.state.link_diagram
         
         # @To-Do: handles string in a very ad-hoc manner 
         if action_type == "Monitor":
@@ -114,7 +147,19 @@ class GameStateCollector:
             remove_host,
             restore_host
         ) = self.update_hosts(target_host, action_type, self.host_map, self.ip_map, host_type)
-        
+
+        reward = self._get_last_reward(host_type)
+
+        self._update_rewards(host_type, reward)
+
+        return self._build_view(target_host, action_info)
+
+    def _build_view(self, target_host, action_info):
+        """Full view of the current environment for the visualizer"""
+        true_obs = self._get_true_state()
+
+        link_diagram = self.cyborg.environment_controller.state.link_diagram
+
         node_colors = [get_node_color(node, 
                                       self.discovered_subnets, 
                                       self.discovered_systems, 
@@ -127,18 +172,7 @@ class GameStateCollector:
 
         compromised_hosts = self.compromised_hosts.copy()
 
-        reward = self._get_last_reward(host_type)
-
-        self._update_rewards(host_type, reward)
-
-        accu_reward = self._get_agent_rewards(host_type)
-        # print(self.accumulated_rewards)
-
-        positions = nx.spring_layout(link_diagram, dim=3, seed=3113794652)
-        node_positions = [
-            {'id': str(node), 'x': float(pos[0]), 'y': float(pos[1]), 'z': float(pos[2])}
-            for node, pos in positions.items()
-        ]
+        link_data, node_positions = self._get_topology(link_diagram)
         
         # action_snapshot = {
         #     # Populate with necessary state information
@@ -157,11 +191,11 @@ class GameStateCollector:
 
         action_snapshot = {
             # Populate with necessary state information
-            'link_diagram': nx.node_link_data(link_diagram),  # Assuming link_diagram is a NetworkX graph
+            'link_diagram': link_data,
             'node_positions': node_positions,
             'node_colors': node_colors,
             'node_borders': node_borders,
-            'compromised_hosts': list(compromised_hosts),
+            'compromised_hosts': sorted(compromised_hosts),
             'host_info': host_info,
             'action_info': action_info,
             'host_map': self.host_map,
@@ -169,6 +203,25 @@ class GameStateCollector:
 
         return action_snapshot 
         
+    def _get_topology(self, link_diagram):
+        """Returns the node link data and 3D layout of the link diagram.
+
+        Both only change when State.update_data_links changes the graph, so they are
+        reused until the topology fingerprint changes.
+        """
+        fingerprint = topology_fingerprint(link_diagram)
+        if self.topology is None or self.topology[0] != fingerprint:
+            node_positions = get_node_positions(link_diagram, fingerprint, persist=self._is_builtin_scenario())
+            self.topology = (fingerprint, nx.node_link_data(link_diagram), node_positions)
+        return self.topology[1], self.topology[2]
+
+    def _is_builtin_scenario(self):
+        """Built-in scenario files have a static topology worth persisting the layout of"""
+        scenario_generator = self.cyborg.environment_controller.scenario_generator
+        if not isinstance(scenario_generator, FileReaderScenarioGenerator):
+            return False
+        return scenario_generator.file_path.parent.name == 'scenario_files'
+
     def parse_observation(self, action, observation, host_map, ip_map):
         isSuccess = str(observation['success']) == 'TRUE'
         action_str_split = action.split(" ")
@@ -235,6 +288,8 @@ class GameStateCollector:
         self.escalated_hosts = set(['User0'])
         self.discovered_subnets = set()
         self.discovered_systems = set()
+        self.last_views = {}
+        self.topology = None
         self._create_ip_host_maps()
 
     def store_state(self, state_snapshot, episode, step):
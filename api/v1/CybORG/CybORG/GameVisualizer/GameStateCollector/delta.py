@@ -0,0 +1,74 @@
+from copy import deepcopy
+
+# per node lists, a delta only holds the entries that changed, keyed by node index
+INDEXED_FIELDS = ['node_colors', 'node_borders', 'host_info']
+# replaced wholesale when they change
+REPLACED_FIELDS = ['link_diagram', 'node_positions', 'compromised_hosts', 'host_map']
+
+
+def make_delta(previous: dict, view: dict) -> dict:
+    """Returns the delta that turns the `previous` agent view into `view`.
+
+    action_info is always included as it describes the step itself.
+    """
+    delta = {'keyframe': False, 'action_info': view['action_info']}
+    for field in INDEXED_FIELDS:
+        old, new = previous[field], view[field]
+        if len(old) != len(new):
+            delta[field] = dict(enumerate(new))
+            continue
+        changed = {i: value for i, (old_value, value) in enumerate(zip(old, new)) if old_value != value}
+        if changed:
+            delta[field] = changed
+    for field in REPLACED_FIELDS:
+        if previous[field] != view[field]:
+            delta[field] = view[field]
+    return delta
+
+
+def apply_delta(view: dict, delta: dict) -> dict:
+    """Applies a delta to a full agent view in place and returns it.
+
+    Indexed entries may have str keys once the delta has been through JSON.
+    """
+    for field in INDEXED_FIELDS:
+        if field in delta:
+            values = view[field]
+            for i, value in delta[field].items():
+                i = int(i)
+                if i < len(values):
+                    values[i] = value
+                else:
+                    values.append(value)
+    for field in REPLACED_FIELDS:
+        if field in delta:
+            view[field] = delta[field]
+    view['action_info'] = delta['action_info']
+    return view
+
+
+def reconstruct_snapshot(snapshots: list) -> dict:
+    """Rebuilds the full view of the last snapshot in `snapshots`.
+
+    Snapshots must be in step order and the first one must be a keyframe,
+    e.g. the stored snapshots from step 0 up to the requested step.
+    """
+    full = None
+    for snapshot in snapshots:
+        full = apply_snapshot(full, snapshot)
+    return full
+
+
+def apply_snapshot(full: dict, snapshot: dict) -> dict:
+    """Applies a (keyframe or delta) snapshot holding one entry per agent to a full snapshot"""
+    if not snapshot:
+        return full
+    if full is None:
+        full = {}
+    for agent, agent_snapshot in snapshot.items():
+        if agent_snapshot.get('keyframe', True):
+            full[agent] = deepcopy(agent_snapshot)
+        else:
+            full[agent] = apply_delta(full[agent], agent_snapshot)
+        full[agent]['keyframe'] = True
+    return full
@@ -0,0 +1,79 @@
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+import networkx as nx
+
+logger = logging.getLogger(__name__)
+
+LAYOUT_SEED = 3113794652
+# layouts of the built-in scenario topologies shipped with the package, only ever read
+LAYOUT_DIR = Path(__file__).parent / 'layouts'
+# optional writable directory that newly computed built-in layouts are saved to
+LAYOUT_CACHE_DIR = os.environ.get('CYBORG_LAYOUT_CACHE_DIR')
+# number of topologies kept in memory, drone scenarios produce a new topology almost every step
+MAX_CACHED_LAYOUTS = int(os.environ.get('CYBORG_MAX_CACHED_LAYOUTS', 64))
+
+# fingerprint -> {node: (x, y, z)}, shared by every game in the process, least recently used first
+_layouts = OrderedDict()
+
+
+def topology_fingerprint(graph: nx.Graph) -> str:
+    """Hash of the node set and edge set of the graph, independent of insertion order"""
+    nodes = sorted(str(node) for node in graph.nodes)
+    edges = sorted(tuple(sorted((str(a), str(b)))) for a, b in graph.edges)
+    return hashlib.sha1(json.dumps([nodes, edges]).encode()).hexdigest()
+
+
+def get_node_positions(graph: nx.Graph, fingerprint: str = None, persist: bool = False) -> list:
+    """Returns the 3D spring layout of the graph as a list of {'id', 'x', 'y', 'z'} in node order.
+
+    The last MAX_CACHED_LAYOUTS layouts are kept in memory. With persist=True, which is meant
+    for the static built-in scenarios, the layout is also looked up in LAYOUT_DIR and
+    LAYOUT_CACHE_DIR, and a newly computed layout is written to LAYOUT_CACHE_DIR if it is set.
+    """
+    if fingerprint is None:
+        fingerprint = topology_fingerprint(graph)
+    positions = _layouts.get(fingerprint)
+    if positions is None and persist:
+        positions = _load_layout(fingerprint)
+    if positions is None:
+        layout = nx.spring_layout(graph, dim=3, seed=LAYOUT_SEED)
+        positions = {str(node): tuple(float(p) for p in pos) for node, pos in layout.items()}
+        if persist:
+            _save_layout(fingerprint, positions)
+    _layouts[fingerprint] = positions
+    _layouts.move_to_end(fingerprint)
+    while len(_layouts) > MAX_CACHED_LAYOUTS:
+        _layouts.popitem(last=False)
+    return [
+        {'id': str(node), 'x': positions[str(node)][0], 'y': positions[str(node)][1], 'z': positions[str(node)][2]}
+        for node in graph.nodes
+    ]
+
+
+def _load_layout(fingerprint: str):
+    for directory in (LAYOUT_DIR, LAYOUT_CACHE_DIR):
+        if directory is None:
+            continue
+        path = Path(directory) / f'{fingerprint}.json'
+        if path.exists():
+            with path.open() as f:
+                return {node: tuple(pos) for node, pos in json.load(f).items()}
+    return None
+
+
+def _save_layout(fingerprint: str, positions: dict):
+    if LAYOUT_CACHE_DIR is None:
+        return
+    try:
+        directory = Path(LAYOUT_CACHE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        with (directory / f'{fingerprint}.json').open('w') as f:
+            json.dump(positions, f)
+    except OSError as e:
+        # the in memory cache still applies
+        logger.warning(f"Could not persist layout {fingerprint}: {e}")
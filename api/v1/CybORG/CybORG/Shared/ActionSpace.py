@@ -1,6 +1,7 @@
 # Copyright DST Group. Licensed under the MIT license.
 
 import sys
+from functools import lru_cache
 from inspect import signature
 
 from CybORG.Shared import CybORGLogger
@@ -18,7 +19,34 @@ MAX_FILES = 20
 MAX_PATHS = 20
 
 
+@lru_cache(maxsize=None)
+def get_action_params(action) -> dict:
+    """Parameters of the action class's constructor, shared by every action space"""
+    return signature(action).parameters
+
+
 class ActionSpace(CybORGLogger):
+    """The actions and parameter values an agent knows about, each flagged whether it may be used.
+
+    Alongside the dicts returned by get_action_space, `valid` holds the set of values flagged
+    True for every key of the action space. It is kept up to date by update and reset, so
+    is_valid checks an action with one set lookup per parameter. The dicts returned by
+    get_action_space must therefore only be changed through this class.
+    """
+    # key of the action space -> attribute holding its values
+    PARAMETERS = {
+        'action': 'actions',
+        'subnet': 'subnet',
+        'ip_address': 'ip_address',
+        'session': 'server_session',
+        'username': 'username',
+        'password': 'password',
+        'process': 'process',
+        'port': 'port',
+        'target_session': 'client_session',
+        'agent': 'agent',
+        'hostname': 'hostname',
+    }
 
     def __init__(self, actions, agent, allowed_subnets):
         # load in the stuff that the agent is allowed to know about
@@ -26,7 +54,7 @@ class ActionSpace(CybORGLogger):
         self.actions = {i: True for i in actions}
         self.action_params = {}
         for action in self.actions:
-            self.action_params[action] = signature(action).parameters
+            self.action_params[action] = get_action_params(action)
         self.allowed_subnets = allowed_subnets
         self.subnet = {}
         self.ip_address = {}
@@ -38,6 +66,40 @@ class ActionSpace(CybORGLogger):
         self.port = {}
         self.hostname = {}
         self.agent = {agent: True}
+        self._build_index()
+
+    def __getstate__(self):
+        # signature parameters are mappingproxies, which cannot be pickled, so they are rebuilt on load
+        state = self.__dict__.copy()
+        del state['action_params']
+        del state['valid']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.action_params = {action: get_action_params(action) for action in self.actions}
+        self._build_index()
+
+    def _build_index(self):
+        self.valid = {key: {value for value, known in getattr(self, attribute).items() if known}
+                      for key, attribute in self.PARAMETERS.items()}
+
+    def _set(self, key: str, value, known: bool):
+        getattr(self, self.PARAMETERS[key])[value] = known
+        if known:
+            self.valid[key].add(value)
+        else:
+            self.valid[key].discard(value)
+
+    def is_valid(self, action) -> bool:
+        """Whether the action's class and every parameter of it that is part of the action space are flagged True"""
+        if type(action) not in self.valid['action']:
+            return False
+        for name, value in vars(action).items():
+            values = self.valid.get(name)
+            if values is not None and value not in values:
+                return False
+        return True
 
     def get_name(self, action: int) -> str:
         pass
@@ -81,6 +143,7 @@ class ActionSpace(CybORGLogger):
         self.process = {}
         self.port = {}
         self.agent = {agent: True}
+        self._build_index()
 
     def get_max_actions(self, action):
         params = self.action_params[action]
@@ -123,31 +186,31 @@ class ActionSpace(CybORGLogger):
                 continue
             if "System info" in info:
                 if "Hostname" in info["System info"]:
-                    self.hostname[info["System info"]["Hostname"]] = known
+                    self._set('hostname', info["System info"]["Hostname"], known)
             if "Interface" in info:
                 for interface in info["Interface"]:
                     if "Subnet" in interface:
-                        self.subnet[interface["Subnet"]] = known
+                        self._set('subnet', interface["Subnet"], known)
                     if "IP Address" in interface:
-                        self.ip_address[interface["IP Address"]] = known
+                        self._set('ip_address', interface["IP Address"], known)
 
             if "Processes" in info:
                 for process in info["Processes"]:
                     if "PID" in process:
-                        self.process[process["PID"]] = known
+                        self._set('process', process["PID"], known)
                     if "Connections" in process:
                         for connection in process["Connections"]:
                             if "local_port" in connection:
-                                self.port[connection["local_port"]] = known
+                                self._set('port', connection["local_port"], known)
                             if "remote_port" in connection:
-                                self.port[connection["remote_port"]] = known
+                                self._set('port', connection["remote_port"], known)
 
             if "User Info" in info:
                 for user in info["User Info"]:
                     if "Username" in user:
-                        self.username[user["Username"]] = known
+                        self._set('username', user["Username"], known)
                     if "Password" in user:
-                        self.password[user["Password"]] = known
+                        self._set('password', user["Password"], known)
 
             if "Sessions" in info:
                 for session in info["Sessions"]:
@@ -158,6 +221,6 @@ class ActionSpace(CybORGLogger):
                                                                       SessionType.GREY_SESSION,
                                                                       SessionType.BLUE_DRONE_SESSION,
                                                                       SessionType.RED_DRONE_SESSION)):
-                            self.server_session[session["ID"]] = known
+                            self._set('session', session["ID"], known)
 
-                        self.client_session[session["ID"]] = known
+                        self._set('target_session', session["ID"], known)
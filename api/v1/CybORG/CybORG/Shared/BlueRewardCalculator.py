@@ -25,6 +25,12 @@ class ConfidentialityRewardCalculator(RewardCalculator):
         self._calculate_compromised_hosts()
         return reward
 
+    def calculate_simulation_reward(self, env_controller):
+        self.compromised_hosts = {}
+        reward = -self.infiltrate_rc.calculate_simulation_reward(env_controller)
+        self._calculate_compromised_hosts()
+        return reward
+
     def _calculate_compromised_hosts(self):
         for host, value in self.infiltrate_rc.compromised_hosts.items():
             self.compromised_hosts[host] = -1 * value
@@ -47,6 +53,12 @@ class AvailabilityRewardCalculator(RewardCalculator):
         self._calculate_impacted_hosts()
         return reward
 
+    def calculate_simulation_reward(self, env_controller):
+        self.impacted_hosts = {}
+        reward = -self.disrupt_rc.calculate_simulation_reward(env_controller)
+        self._calculate_impacted_hosts()
+        return reward
+
     def _calculate_impacted_hosts(self):
         for host, value in self.disrupt_rc.impacted_hosts.items():
             self.impacted_hosts[host] = -1 * value
@@ -68,6 +80,12 @@ class HybridAvailabilityConfidentialityRewardCalculator(RewardCalculator):
         self._compute_host_scores(current_state.keys())
         return reward
 
+    def calculate_simulation_reward(self, env_controller):
+        reward = self.availability_calculator.calculate_simulation_reward(env_controller) \
+                 + self.confidentiality_calculator.calculate_simulation_reward(env_controller)
+        self._compute_host_scores(env_controller.INFO_DICT['True'].keys())
+        return reward
+
     def _compute_host_scores(self, hostnames):
         self.host_scores = {}
         compromised_hosts = self.confidentiality_calculator.compromised_hosts
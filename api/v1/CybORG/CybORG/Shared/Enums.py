@@ -2,6 +2,40 @@
 import enum
 
 
+def lookup_table(strings: dict):
+    """Class decorator building the table that parse_string of a LookupEnum looks strings up in.
+
+    strings maps the name of each member to the lower case strings parsed as that member. The
+    table is built once, when the class is created, so parsing a string is a dict lookup rather
+    than a comparison against every known string.
+    """
+    def build(cls):
+        cls._table = {string: cls[name] for name, names in strings.items() for string in names}
+        return cls
+    return build
+
+
+class LookupEnum(enum.Enum):
+    """Enum parsed from strings, case insensitively, through the table given by lookup_table"""
+
+    @classmethod
+    def parse_string(cls, string):
+        if isinstance(string, cls):
+            return string
+        member = cls._table.get(string)
+        if member is None:
+            string = string.lower()
+            member = cls._table.get(string)
+            if member is None:
+                member = cls.parse_unlisted(string)
+        return member
+
+    @classmethod
+    def parse_unlisted(cls, string: str):
+        """Parses a lower case string that is not in the table"""
+        return cls.UNKNOWN
+
+
 class TrinaryEnum(enum.Enum):
     TRUE = enum.auto()
     UNKNOWN = enum.auto()
@@ -31,7 +65,18 @@ class TrinaryEnum(enum.Enum):
             return False
 
 
-class OperatingSystemPatch(enum.Enum):
+@lookup_table({
+    'FILE_1': ('file 1',),
+    'Q147222': ('q147222',),
+    'KB911164': ('kb911164',),
+    'MS17_010': ('ms17-010',),
+    'KB4500331': ('kb4500331',),
+    'KB4499149': ('kb4499149',),
+    'KB4499180': ('kb4499180',),
+    'KB4499164': ('kb4499164',),
+    'KB4499175': ('kb4499175',),
+})
+class OperatingSystemPatch(LookupEnum):
     UNKNOWN = enum.auto()
     FILE_1 = enum.auto()
     Q147222 = enum.auto()
@@ -43,61 +88,33 @@ class OperatingSystemPatch(enum.Enum):
     KB4499164 = enum.auto()
     KB4499175 = enum.auto()
 
-
-    @classmethod
-    def parse_string(cls, patch_string):
-        if patch_string.lower() == "file 1":
-            return cls.FILE_1
-        elif patch_string.lower() == "q147222":
-            return cls.Q147222
-        elif patch_string.lower() == "kb911164":
-            return cls.KB911164
-        elif patch_string.lower() == "ms17-010":
-            return cls.MS17_010
-        elif patch_string.lower() == "kb4500331":
-            return cls.KB4500331
-        elif patch_string.lower() == "kb4499149":
-            return cls.KB4499149
-            return cls.KB4499149
-        elif patch_string.lower() == "kb4499180":
-            return cls.KB4499180
-        elif patch_string.lower() == "kb4499164":
-            return cls.KB4499164
-        elif patch_string.lower() == "kb4499175":
-            return cls.KB4499175
-
-        return cls.UNKNOWN
-
     def __str__(self):
         return str(self.value)
 
 
-class Architecture(enum.Enum):
+@lookup_table({
+    'x86': ('x86',),
+    'x64': ('x64', 'x86_64'),
+})
+class Architecture(LookupEnum):
     x86 = enum.auto()
     x64 = enum.auto()
     UNKNOWN = enum.auto()
 
-    @classmethod
-    def parse_string(cls, arch_string):
-        if arch_string.lower() == "x86":
-            return cls.x86
-        if arch_string.lower() == "x64" or arch_string.lower() == "x86_64":
-            return cls.x64
-        else:
-            return cls.UNKNOWN
-
 
-class OperatingSystemType(enum.Enum):
+@lookup_table({
+    'LINUX': ('linux',),
+    'WINDOWS': ('windows',),
+})
+class OperatingSystemType(LookupEnum):
     """An enum for representing the different possible Operating systems. """
     UNKNOWN = enum.auto()
     WINDOWS = enum.auto()
     LINUX = enum.auto()
 
     @classmethod
-    def parse_string(cls, os_string):
-        if os_string.lower() == "linux":
-            return cls.LINUX
-        elif "windows" in os_string.lower():
+    def parse_unlisted(cls, os_string):
+        if "windows" in os_string:
             return cls.WINDOWS
         else:
             return cls.UNKNOWN
@@ -106,7 +123,17 @@ class OperatingSystemType(enum.Enum):
         return self.name
 
 
-class OperatingSystemDistribution(enum.Enum):
+@lookup_table({
+    'WINDOWS_XP': ('windows xp',),
+    'WINDOWS_SVR_2003': ('windows server 2003',),
+    'WINDOWS_SVR_2008': ('windows server 2008', 'windows_svr_2008'),
+    'WINDOWS_7': ('windows 7',),
+    'WINDOWS_8': ('windows 8',),
+    'WINDOWS_10': ('windows 10',),
+    'UBUNTU': ('ubuntu',),
+    'KALI': ('kali',),
+})
+class OperatingSystemDistribution(LookupEnum):
     """An enum for representing the different possible Operating systems. """
     UNKNOWN = enum.auto()
     WINDOWS_XP = enum.auto()
@@ -125,20 +152,9 @@ class OperatingSystemDistribution(enum.Enum):
     DRONE_LINUX = enum.auto()  # TODO find correct distro
 
     @classmethod
-    def parse_string(cls, os_string):
-        os_string = os_string.lower()
-        if os_string == "windows xp":
-            return cls.WINDOWS_XP
-        elif os_string == "windows server 2003":
-            return cls.WINDOWS_SVR_2003
-        elif "windows server 2008" in os_string or os_string == 'windows_svr_2008':
+    def parse_unlisted(cls, os_string):
+        if "windows server 2008" in os_string:
             return cls.WINDOWS_SVR_2008
-        elif os_string == "windows 7":
-            return cls.WINDOWS_7
-        elif os_string == "windows 8":
-            return cls.WINDOWS_8
-        elif os_string == "windows 10":
-            return cls.WINDOWS_10
         elif "ubuntu" in os_string:
             return cls.UBUNTU
         elif "kali" in os_string:
@@ -162,7 +178,22 @@ class OperatingSystemDistribution(enum.Enum):
         return self.name
 
 
-class OperatingSystemVersion(enum.Enum):
+@lookup_table({
+    'SP0': ('sp0',),
+    'SP1': ('sp1',),
+    'SP2': ('sp2',),
+    'SP3': ('sp3',),
+    'W6_2_9200_16384': ('6.2.9200.16384',),
+    'W6_1_7601': ('6.1.7601', 'w6_1_7601'),
+    'U18_04_3': ('18.04.3', 'u18_04_3'),
+    'U18_04': ('18.04',),
+    'U8_04': ('8.04',),
+    'K2019_1': ('2019.1', 'k2019_1'),
+    'K2019_2': ('2019.2', 'k2019_2'),
+    'K2019_4': ('4.19.0-kali4', 'k2019_4'),
+    'NT6_1': ('nt6.1',),
+})
+class OperatingSystemVersion(LookupEnum):
     """An enum for representing the different possible Operating systems. """
     UNKNOWN = enum.auto()
     SP0 = enum.auto()
@@ -180,34 +211,11 @@ class OperatingSystemVersion(enum.Enum):
     NT6_1 = enum.auto()
 
     @classmethod
-    def parse_string(cls, os_string):
-        os_string = os_string.lower()
-        if os_string == "sp0":
-            return cls.SP0
-        elif os_string == "sp1":
-            return cls.SP1
-        elif os_string == "sp2":
-            return cls.SP2
-        elif os_string == "sp3":
-            return cls.SP3
-        elif os_string == "6.2.9200.16384":
-            return cls.W6_2_9200_16384
-        elif "6.1.7601" in os_string or os_string == 'w6_1_7601':
+    def parse_unlisted(cls, os_string):
+        if "6.1.7601" in os_string:
             return cls.W6_1_7601
-        elif os_string == "18.04.3" or os_string == 'u18_04_3':
-            return cls.U18_04_3
-        elif os_string == "18.04":
-            return cls.U18_04
-        elif os_string == "8.04":
-            return cls.U8_04
-        elif os_string == "2019.1" or os_string == "k2019_1":
-            return cls.K2019_1
-        elif os_string == "2019.2" or os_string == "k2019_2":
-            return cls.K2019_2
-        elif "4.19.0-kali4" in os_string or os_string == "k2019_4":
+        elif "4.19.0-kali4" in os_string:
             return cls.K2019_4
-        elif os_string == "nt6.1":
-            return cls.NT6_1
         else:
             return cls.UNKNOWN
 
@@ -215,7 +223,13 @@ class OperatingSystemVersion(enum.Enum):
         return self.name
 
 
-class OperatingSystemKernelVersion(enum.Enum):
+@lookup_table({
+    'L2_6_24': ('linux 2.6.24',),
+    'L4_15_0_1057_AWS': ('4.15.0-1057-aws',),
+    'L5_2_0': ('linux 5.2.0',),
+    'L5_3_0': ('linux 5.3.0',),
+})
+class OperatingSystemKernelVersion(LookupEnum):
     """An enum for representing the different possible Operating systems. """
     UNKNOWN = enum.auto()
     L2_6_24 = enum.auto()
@@ -223,25 +237,40 @@ class OperatingSystemKernelVersion(enum.Enum):
     L5_2_0 = enum.auto()
     L5_3_0 = enum.auto()
 
-    @classmethod
-    def parse_string(cls, os_string):
-        os_string = os_string.lower()
-        if os_string == "linux 2.6.24":
-            return cls.L2_6_24
-        elif os_string == "4.15.0-1057-aws":
-            return cls.L4_15_0_1057_AWS
-        elif os_string == "linux 5.2.0":
-            return cls.L5_2_0
-        elif os_string == "linux 5.3.0":
-            return cls.L5_3_0
-        else:
-            return cls.UNKNOWN
-
     def __str__(self):
         return self.name
 
 
-class ProcessName(enum.Enum):
+@lookup_table({
+    'SVCHOST': ('svchost', 'svchost.exe'),
+    'INIT': ('init',),
+    'CRON': ('cron',),
+    'UDEVD': ('udevd',),
+    'JSVC': ('jsvc',),
+    'SSHD': ('sshd', 'sshd.exe'),
+    'MYSQLD_SAFE': ('mysqld_safe',),
+    'MYSQLD': ('mysqld',),
+    'SMBD': ('smbd',),
+    'SMTP': ('smtp',),
+    'FEMITTER': ('femitter.exe',),
+    'APACHE2': ('apache2',),
+    'EXPLORER': ('explorer', 'explorer.exe'),
+    'LSASS': ('lsass', 'lsass.exe'),
+    'WINLOGON': ('winlogon', 'winlogon.exe'),
+    'SMSS': ('smss', 'smss.exe'),
+    'SYSTEM': ('system',),
+    'SYSTEM_IDLE_PROCESS': ('system idle process', 'system process'),
+    'SERVICES': ('services', 'services.exe'),
+    'SHELL': ('bash', 'sh', 'sh.exe'),
+    'TELNET': ('telnet',),
+    'SLEEP': ('sleep',),
+    'JAVA': ('java',),
+    'PS': ('ps',),
+    'VELOCLIENT': ('velociraptorclient',),
+    'POWERSHELL': ('powershell', 'powershell.exe'),
+    'CMD': ('cmd', 'cmd.exe'),
+})
+class ProcessName(LookupEnum):
     UNKNOWN = enum.auto()
     SVCHOST = enum.auto()
     INIT = enum.auto()
@@ -271,68 +300,21 @@ class ProcessName(enum.Enum):
     POWERSHELL = enum.auto()
     CMD = enum.auto()
 
-    @classmethod
-    def parse_string(cls, name):
-        name = name.lower()
-        if name == "svchost" or name == "svchost.exe":
-            return cls.SVCHOST
-        elif name == "init":
-            return cls.INIT
-        elif name == "cron":
-            return cls.CRON
-        elif name == "udevd":
-            return cls.UDEVD
-        elif name == "jsvc":
-            return cls.JSVC
-        elif name == "sshd" or name == "sshd.exe":
-            return cls.SSHD
-        elif name == "mysqld_safe":
-            return cls.MYSQLD_SAFE
-        elif name == "mysqld":
-            return cls.MYSQLD
-        elif name == "smbd":
-            return cls.SMBD
-        elif name == "smtp":
-            return cls.SMTP
-        elif name == "femitter.exe":
-            return cls.FEMITTER
-        elif name == "apache2":
-            return cls.APACHE2
-        elif name == "explorer" or name == "explorer.exe":
-            return cls.EXPLORER
-        elif name == "lsass" or name == "lsass.exe":
-            return cls.LSASS
-        elif name == "winlogon" or name == "winlogon.exe":
-            return cls.WINLOGON
-        elif name == "smss" or name == "smss.exe":
-            return cls.SMSS
-        elif name == "system":
-            return cls.SYSTEM
-        elif name == "system idle process" or name == "system process":
-            return cls.SYSTEM_IDLE_PROCESS
-        elif name == "services" or name == "services.exe":
-            return cls.SERVICES
-        elif name == "bash" or name == "sh" or name == "sh.exe":
-            return cls.SHELL
-        elif name == "telnet":
-            return cls.TELNET
-        elif name == "sleep":
-            return cls.SLEEP
-        elif name == "java":
-            return cls.JAVA
-        elif name == "ps":
-            return cls.PS
-        elif name == "velociraptorclient":
-            return cls.VELOCLIENT
-        elif name == "powershell.exe" or name == "powershell":
-            return cls.POWERSHELL
-        elif name == "cmd.exe" or name == "cmd":
-            return cls.CMD
-        else:
-            return cls.UNKNOWN
-
 
-class ProcessType(enum.Enum):
+@lookup_table({
+    'SSH': ('ssh', 'sshd', 'sshd.exe'),
+    'SVCHOST': ('svchost',),
+    'SMTP': ('smtp',),
+    'FEMITTER': ('femitter',),
+    'MYSQL': ('mysql',),
+    'SMB': ('smb',),
+    'WEBSERVER': ('webserver', 'web server', 'http', 'https'),
+    'NETCAT': ('netcat',),
+    'RDP': ('rdp',),
+    'REVERSE_SESSION_HANDLER': ('reverse_session_handler',),
+    'REVERSE_SESSION': ('reverse_session',),
+})
+class ProcessType(LookupEnum):
     """An enum for representing the different types of services. """
     UNKNOWN = enum.auto()
     SSH = enum.auto()
@@ -348,33 +330,8 @@ class ProcessType(enum.Enum):
     MYSQL = enum.auto()
 
     @classmethod
-    def parse_string(cls, service_string):
-        service_string = service_string.lower()
-        if service_string == "ssh" or service_string == "sshd" or service_string == "sshd.exe":
-            return cls.SSH
-        elif service_string == "svchost":
-            return cls.SVCHOST
-        elif service_string == "smtp":
-            return cls.SMTP
-        elif service_string == "femitter":
-            return cls.FEMITTER
-        elif service_string == "mysql":
-            return cls.MYSQL
-        elif service_string == "smb":
-            return cls.SMB
-        elif service_string.replace(" ", "") == "webserver":
-            return cls.WEBSERVER
-        elif service_string == "netcat":
-            return cls.NETCAT
-        elif service_string == "rdp":
-            return cls.RDP
-        elif service_string == "reverse_session_handler":
-            return cls.REVERSE_SESSION_HANDLER
-        elif service_string == "reverse_session":
-            return cls.REVERSE_SESSION
-        elif service_string == "http":
-            return cls.WEBSERVER
-        elif service_string == "https":
+    def parse_unlisted(cls, service_string):
+        if service_string.replace(" ", "") == "webserver":
             return cls.WEBSERVER
         else:
             return cls.UNKNOWN
@@ -384,7 +341,16 @@ class ProcessType(enum.Enum):
 
 
 # Potentially split this into separate Enums for each ProcessType at later date
-class ProcessVersion(enum.Enum):
+@lookup_table({
+    'OPENSSH_1_3': ('openssh 1.3',),
+    'SVC10_0_17763_1': ('10.0.17763.1',),
+    'SAMBA_3_0_20_DEB': ('samba 3.0.20-debian',),
+    'APACHE_TOMCAT': ('apache tomcat',),
+    'PYTHON_SERVER': ('python simplehttpserver',),
+    'SMBv1': ('smbv1',),
+    'HARAKA_2_7_0': ('haraka 2.7.0',),
+})
+class ProcessVersion(LookupEnum):
     OPENSSH_1_3 = enum.auto()
     SVC10_0_17763_1 = enum.auto()
     SAMBA_3_0_20_DEB = enum.auto()
@@ -397,50 +363,40 @@ class ProcessVersion(enum.Enum):
 
     @classmethod
     def parse_string(cls, version_string):
-        if version_string is not None and isinstance(version_string, str):
-            version_string = version_string.lower()
-
-        if version_string == "openssh 1.3":
-            return cls.OPENSSH_1_3
-        elif version_string == "10.0.17763.1":
-            return cls.SVC10_0_17763_1
-        elif version_string == "samba 3.0.20-debian":
-            return cls.SAMBA_3_0_20_DEB
-        elif version_string == "apache tomcat":
-            return cls.APACHE_TOMCAT
-        elif version_string == "python simplehttpserver":
-            return cls.PYTHON_SERVER
-        elif version_string == "smbv1":
-            return cls.SMBv1
-        elif version_string == "haraka 2.7.0":
-            return cls.HARAKA_2_7_0
-        elif version_string is not None:
-            return version_string
-        else:
+        if version_string is None:
             return cls.UNKNOWN
+        if not isinstance(version_string, str):
+            return version_string
+        return super().parse_string(version_string)
+
+    @classmethod
+    def parse_unlisted(cls, version_string):
+        # versions without a member are kept as their string
+        return version_string
 
 
-class TransportProtocol(enum.Enum):
+@lookup_table({
+    'TCP': ('tcp',),
+    'UDP': ('udp',),
+})
+class TransportProtocol(LookupEnum):
     """An enum for representing the different types of services. """
     UNKNOWN = enum.auto()
     TCP = enum.auto()
     UDP = enum.auto()
 
-    @classmethod
-    def parse_string(cls, service_string):
-        service_string = service_string.lower()
-        if service_string == "tcp":
-            return cls.TCP
-        elif service_string == "udp":
-            return cls.UDP
-        else:
-            return cls.UNKNOWN
-
     def __str__(self):
         return self.name
 
 
-class BuiltInGroups(enum.Enum):
+@lookup_table({
+    'USERS': ('users',),
+    'WEBSERVER': ('web server users',),
+    'ROOT': ('root',),
+    'SHADOW': ('shadow',),
+    'ADMINISTRATORS': ('administrators',),
+})
+class BuiltInGroups(LookupEnum):
     UNKNOWN = enum.auto()
     USERS = enum.auto()
     WEBSERVER = enum.auto()
@@ -448,24 +404,23 @@ class BuiltInGroups(enum.Enum):
     SHADOW = enum.auto()
     ADMINISTRATORS = enum.auto()
 
-    @classmethod
-    def parse_string(cls, group_string):
-        group_string = group_string.lower()
-        if group_string == "users":
-            return cls.USERS
-        elif group_string == "web server users":
-            return cls.WEBSERVER
-        elif group_string == "root":
-            return cls.ROOT
-        elif group_string == "shadow":
-            return cls.SHADOW
-        elif group_string == "administrators":
-            return cls.ADMINISTRATORS
-        else:
-            return cls.UNKNOWN
-
 
-class SessionType(enum.Enum):
+@lookup_table({
+    'SSH': ('ssh',),
+    'SHELL': ('shell',),
+    'METERPRETER': ('meterpreter',),
+    'MSF_SHELL': ('msf shell', 'msf_shell'),
+    'MSF_SERVER': ('metasploitserver',),
+    'VELOCIRAPTOR_CLIENT': ('velociraptorclient',),
+    'VELOCIRAPTOR_SERVER': ('velociraptorserver',),
+    'RED_ABSTRACT_SESSION': ('redabstractsession',),
+    'RED_REVERSE_SHELL': ('red_reverse_shell',),
+    'LOCAL_SHELL': ('localshell', 'local shell', 'local_shell'),
+    'GREY_SESSION': ('green_session',),
+    'BLUE_DRONE_SESSION': ('blue_drone_session',),
+    'RED_DRONE_SESSION': ('red_drone_session',),
+})
+class SessionType(LookupEnum):
     """An enum for representing the different types of sessions. """
     UNKNOWN = enum.auto()
     SSH = enum.auto()
@@ -483,34 +438,9 @@ class SessionType(enum.Enum):
     RED_DRONE_SESSION = enum.auto()
 
     @classmethod
-    def parse_string(cls, service_string):
-        service_string = service_string.lower()
-        if service_string == "ssh":
-            return cls.SSH
-        elif service_string == "shell":
-            return cls.SHELL
-        elif service_string == "meterpreter":
-            return cls.METERPRETER
-        elif service_string == "msf shell" or service_string == "msf_shell":
-            return cls.MSF_SHELL
-        elif service_string == "metasploitserver":
-            return cls.MSF_SERVER
-        elif service_string == "velociraptorclient":
-            return cls.VELOCIRAPTOR_CLIENT
-        elif service_string == "velociraptorserver":
-            return cls.VELOCIRAPTOR_SERVER
-        elif service_string == "redabstractsession":
-            return cls.RED_ABSTRACT_SESSION
-        elif service_string == "red_reverse_shell":
-            return cls.RED_REVERSE_SHELL
-        elif service_string.replace(" ", "").replace("_", "") == "localshell":
+    def parse_unlisted(cls, service_string):
+        if service_string.replace(" ", "").replace("_", "") == "localshell":
             return cls.LOCAL_SHELL
-        elif service_string == "green_session":
-            return cls.GREY_SESSION
-        elif service_string == "blue_drone_session":
-            return cls.BLUE_DRONE_SESSION
-        elif service_string == "red_drone_session":
-            return cls.RED_DRONE_SESSION
         else:
             return cls.UNKNOWN
 
@@ -518,7 +448,21 @@ class SessionType(enum.Enum):
         return self.name
 
 
-class Path(enum.Enum):
+@lookup_table({
+    'SYSTEM': ('system',),
+    'WINDOWS_SYSTEM': ('c:/windows/system32/', 'c:\\windows\\system32\\'),
+    'WINDOWS': ('c:/windows/', 'c:\\windows\\'),
+    'TEMP': ('/tmp/', 'c:\\temp\\'),
+    'SBIN': ('/sbin/', '/sbin'),
+    'BIN': ('/bin/', '/bin'),
+    'USR_SBIN': ('/usr/sbin/', '/usr/sbin'),
+    'USR_BIN': ('/usr/bin/', '/usr/bin'),
+    'ETC': ('/etc/', '/etc'),
+    'ADMINISTRATOR_DESKTOP': ('c:\\users\\administrator\\desktop\\',),
+    'WEBSERVER': ('/tmp/webserver/',),
+    'EXPLOIT': ('/usr/share/exploitdb/exploits/linux/local/',),
+})
+class Path(LookupEnum):
     UNKNOWN = enum.auto()
     WINDOWS = enum.auto()
     WINDOWS_SYSTEM = enum.auto()
@@ -533,63 +477,38 @@ class Path(enum.Enum):
     WEBSERVER = enum.auto()
     EXPLOIT = enum.auto()
 
-    @classmethod
-    def parse_string(cls, path_string):
-        path_string = path_string.lower()
-        if path_string == "system":
-            return cls.SYSTEM
-        elif path_string == "c:/windows/system32/":
-            return cls.WINDOWS_SYSTEM
-        elif path_string == "c:\\windows\\system32\\":
-            return cls.WINDOWS_SYSTEM
-        elif path_string == "c:/windows/" or path_string == "c:\\windows\\":
-            return cls.WINDOWS
-        elif path_string == "/tmp/" or path_string == "c:\\temp\\":
-            return cls.TEMP
-        elif path_string == "/sbin/" or path_string == "/sbin":
-            return cls.SBIN
-        elif path_string == "/bin/" or path_string == "/bin":
-            return cls.BIN
-        elif path_string == "/usr/sbin/" or path_string == "/usr/sbin":
-            return cls.USR_SBIN
-        elif path_string == "/usr/bin/" or path_string == "/usr/bin":
-            return cls.USR_BIN
-        elif path_string == "/etc/" or path_string == "/etc":
-            return cls.ETC
-        elif path_string == "c:\\users\\administrator\\desktop\\":
-            return cls.ADMINISTRATOR_DESKTOP
-        elif path_string == "/tmp/webserver/":
-            return cls.WEBSERVER
-        elif path_string == "/usr/share/exploitdb/exploits/linux/local/":
-            return cls.EXPLOIT
-        else:
-            return cls.UNKNOWN
-
 
-class ProcessState(enum.Enum):
+@lookup_table({
+    'OPEN': ('open',),
+    'CLOSED': ('closed',),
+    'FILTERED': ('filtered',),
+})
+class ProcessState(LookupEnum):
     """An enum for representing the different types of services. """
     UNKNOWN = enum.auto()
     OPEN = enum.auto()
     CLOSED = enum.auto()
     FILTERED = enum.auto()
 
-    @classmethod
-    def parse_string(cls, service_string):
-        service_string = service_string.lower()
-        if service_string == "open":
-            return cls.OPEN
-        elif service_string == "closed":
-            return cls.CLOSED
-        elif service_string == "filtered":
-            return cls.FILTERED
-        else:
-            return cls.UNKNOWN
-
     def __str__(self):
         return self.name
 
 
-class FileType(enum.Enum):
+@lookup_table({
+    'SVCHOST': ('svchost',),
+    'PASSWD': ('passwd',),
+    'SHADOW': ('shadow',),
+    'FLAG': ('flag',),
+    'SMBCLIENT': ('smbclient',),
+    'NMAP': ('nmap',),
+    'DirtyCowCode': ('dirty_cow_c_file',),
+    'PYTHON': ('python',),
+    'GCC': ('gcc',),
+    'UDEV141CODE': ('udev < 1.4.1',),
+    'NC_REVERSE_SHELL': ('nc_reverse_shell',),
+    'NC': ('nc',),
+})
+class FileType(LookupEnum):
     UNKNOWN = enum.auto()
     SVCHOST = enum.auto()
     PASSWD = enum.auto()
@@ -606,64 +525,26 @@ class FileType(enum.Enum):
     NC_REVERSE_SHELL = enum.auto()
     NC = enum.auto()
 
-    @classmethod
-    def parse_string(cls, name_string):
-        name_string = name_string.lower()
-        if name_string == "svchost":
-            return cls.SVCHOST
-        elif name_string == "passwd":
-            return cls.PASSWD
-        elif name_string == "shadow":
-            return cls.SHADOW
-        elif name_string == "flag":
-            return cls.FLAG
-        elif name_string == "smbclient":
-            return cls.SMBCLIENT
-        elif name_string == "nmap":
-            return cls.NMAP
-        elif name_string == "dirty_cow_c_file":
-            return cls.DirtyCowCode
-        elif name_string == "python":
-            return cls.PYTHON
-        elif name_string == "gcc":
-            return cls.GCC
-        elif name_string == "udev < 1.4.1":
-            return cls.UDEV141CODE
-        elif name_string == "nc_reverse_shell":
-            return cls.NC_REVERSE_SHELL
-        elif name_string == "nc":
-            return cls.NC
-        return cls.UNKNOWN
-
 
-class FileVersion(enum.Enum):
+@lookup_table({
+    'U4_2_4_1': ('ubuntu 4.2.4-1',),
+    'D9_2_1_21': ('debian 9.2.1-21',),
+    'OPENBSD': ('openbsd',),
+})
+class FileVersion(LookupEnum):
     UNKNOWN = enum.auto()
     U4_2_4_1 = enum.auto()
     D9_2_1_21 = enum.auto()
     OPENBSD = enum.auto()
 
-    @classmethod
-    def parse_string(cls, name_string):
-        name_string = name_string.lower()
-        if name_string == "ubuntu 4.2.4-1":
-            return cls.U4_2_4_1
-        elif name_string == "debian 9.2.1-21":
-            return cls.D9_2_1_21
-        elif name_string == "openbsd":
-            return cls.OPENBSD
-        return cls.UNKNOWN
-
 
-class FileExt(enum.Enum):
+@lookup_table({
+    'ELF': ('elf',),
+})
+class FileExt(LookupEnum):
     ELF = enum.auto()
     UNKNOWN = enum.auto()
 
-    @classmethod
-    def parse_string(cls, name_string):
-        if name_string.lower() == "elf":
-            return cls.ELF
-        return cls.UNKNOWN
-
 
 class Vulnerability(enum.Enum):
     UNKNOWN = enum.auto()
@@ -681,39 +562,40 @@ class Vendor(enum.Enum):
         return cls.UNKNOWN
 
 
-class PasswordHashType(enum.Enum):
+@lookup_table({
+    'MD5': ('md5',),
+    'SHA512': ('sha512',),
+    'NTLM': ('ntlm',),
+})
+class PasswordHashType(LookupEnum):
     UNKNOWN = enum.auto()
     MD5 = enum.auto()
     SHA512 = enum.auto()
     NTLM = enum.auto()
 
-    @classmethod
-    def parse_string(cls, hash_string):
-        hash_string = hash_string.lower()
-        if hash_string == "md5":
-            return cls.MD5
-        elif hash_string == 'sha512':
-            return cls.SHA512
-        elif hash_string == 'ntlm':
-            return cls.NTLM
-        return cls.UNKNOWN
-
 
-class InterfaceType(enum.Enum):
+@lookup_table({
+    'BROADCAST': ('broadcast',),
+    'LOCAL': ('local',),
+})
+class InterfaceType(LookupEnum):
     UNKNOWN = enum.auto()
     BROADCAST = enum.auto()
     LOCAL = enum.auto()
 
-    @classmethod
-    def parse_string(cls, interface_string):
-        if interface_string.lower() == "broadcast":
-            return cls.BROADCAST
-        elif interface_string.lower() == "local":
-            return cls.LOCAL
-        return cls.UNKNOWN
-
 
-class AppProtocol(enum.Enum):
+@lookup_table({
+    'HTTP': ('http',),
+    'HTTPS': ('https',),
+    'SSH': ('ssh',),
+    'JPV13': ('jpv13',),
+    'TCP': ('tcp',),
+    'MYSQL': ('mysql',),
+    'NETBIOS_SSN': ('netbios-ssn',),
+    'MICROSOFT_DS': ('microsoft-ds',),
+    'RPC': ('rpc',),
+})
+class AppProtocol(LookupEnum):
     UNKNOWN = enum.auto()
     HTTP = enum.auto()
     HTTPS = enum.auto()
@@ -725,40 +607,18 @@ class AppProtocol(enum.Enum):
     MICROSOFT_DS = enum.auto()
     RPC = enum.auto()
 
-    @classmethod
-    def parse_string(cls, protocol_string):
-        protocol_string = protocol_string.lower()
-        if protocol_string == "http":
-            return cls.HTTP
-        elif protocol_string == "https":
-            return cls.HTTPS
-        elif protocol_string == "ssh":
-            return cls.SSH
-        elif protocol_string == "jpv13":
-            return cls.JPV13
-        elif protocol_string == "tcp":
-            return cls.TCP
-        elif protocol_string == "mysql":
-            return cls.MYSQL
-        elif protocol_string == "netbios-ssn":
-            return cls.NETBIOS_SSN
-        elif protocol_string == "microsoft-ds":
-            return cls.MICROSOFT_DS
-        elif protocol_string == "rpc":
-            return cls.RPC
-        return cls.UNKNOWN
-
 
-class QueryType(enum.Enum):
+@lookup_table({
+    'SYNC': ('sync',),
+    'ASYNC': ('async',),
+})
+class QueryType(LookupEnum):
     SYNC = enum.auto()
     ASYNC = enum.auto()
 
     @classmethod
-    def parse_string(cls, query_string):
-        if query_string.lower() == "sync":
-            return cls.SYNC
-        elif query_string.lower() == "async":
-            return cls.ASYNC
+    def parse_unlisted(cls, query_string):
+        return None
 
 ## The following code contains work of the United States Government and is not subject to domestic copyright protection under 17 USC § 105.
 ## Additionally, we waive copyright and related rights in the utilized code worldwide through the CC0 1.0 Universal public domain dedication.
@@ -4,7 +4,7 @@
 import gym
 from pprint import pprint
 
-from CybORG.Shared import Scenario, CybORGLogger
+from CybORG.Shared import Scenario, CybORGLogger, CybORGTrace, CybORGProfiler
 from CybORG.Simulator.Actions import Action
 from CybORG.Simulator.Actions.Action import InvalidAction, Sleep
 from CybORG.Shared.AgentInterface import AgentInterface
@@ -13,6 +13,8 @@ from CybORG.Shared.Results import Results
 from CybORG.Shared.RewardCalculator import RewardCalculator
 from CybORG.Shared.Scenarios.ScenarioGenerator import ScenarioGenerator
 
+_trace = CybORGTrace.get('controller')
+
 
 class EnvironmentController(CybORGLogger):
     """The Abstract base controller for CybORG environment controllers
@@ -103,9 +105,9 @@ class EnvironmentController(CybORGLogger):
             self.np_random = np_random
         scenario = self.scenario_generator.create_scenario(self.np_random)
         self._create_environment(scenario)
-        #print('Scenario is:',scenario)
         self.agent_interfaces = self._create_agents(scenario, self.agents)
-        print('Agent Interfaces are:',self.agent_interfaces)
+        if _trace.enabled:
+            _trace.event('reset', agents=list(self.agent_interfaces))
         self.team = scenario.team_agents
         self.team_assignment = {agent_name: team_name for team_name, agent_names in scenario.team_agents.items() for agent_name in agent_names}
         self.max_bandwidth = scenario.max_bandwidth
@@ -141,44 +143,56 @@ class EnvironmentController(CybORGLogger):
         -------
         None
         """
-        print('In shared EnvironmentController script')
+        timer = CybORGProfiler.timer()
         self.step_count += 1
         if actions is None:
             actions = {}
-        print('Agent interface:',self.agent_interfaces)
-        # fill in missing actions based on default agents and check validity of actions
+        # fill in missing actions based on default agents
         for agent_name, agent_object in self.agent_interfaces.items():
             agent_object.messages = []
             if agent_name not in actions:
                 actions[agent_name] = agent_object.get_action(self.get_last_observation(agent_name))
-            if not skip_valid_action_check:
-                actions[agent_name] = self.replace_action_if_invalid(actions[agent_name], agent_object)
+        timer.lap('get_action')
+        # check validity of actions
+        if not skip_valid_action_check:
+            actions = self.replace_invalid_actions(actions)
+            timer.lap('validate_actions')
 
         self.action = actions
-        print('action is:',actions)
+        if _trace.enabled:
+            _trace.event('actions', step=self.step_count, actions=actions)
+        timer.skip()
         actions = self.sort_action_order(actions)
+        timer.lap('sort_action_order')
 
         # clear old observations
         self.observation = {}
 
         # execute actions in order of priority
         for agent_name, agent_action in actions.items():
-            print('--> in actions')
+            if _trace.enabled:
+                _trace.event('execute_action', step=self.step_count, agent=agent_name, action=agent_action)
             self.observation[agent_name] = self._filter_obs(self.execute_action(agent_action), agent_name)
+        timer.lap('execute_actions')
 
         # execute additional default end turn actions
         for agent_name, agent_action in self.end_turn_actions.items():
             if self.is_active(agent_name):
-                print('--> in end turn actions')
+                if _trace.enabled:
+                    _trace.event('end_turn_action', step=self.step_count, agent=agent_name, action=agent_action[0])
                 self.observation[agent_name] = self._filter_obs(self.execute_action(agent_action[0](**agent_action[1])), agent_name).combine_obs(self.get_last_observation(agent_name))
+        timer.lap('end_turn_actions')
 
         for agent_name, observation in self.observation.items():
             if self.scenario_generator.update_each_step or len(self.get_action_space(agent_name)['session']) == 0:
-                print('--> in observations')
+                if _trace.enabled:
+                    _trace.event('update_agent', step=self.step_count, agent=agent_name)
                 self.agent_interfaces[agent_name].update(observation)
+        timer.lap('update_agents')
 
         # calculate done signal
         self.done = self.scenario_generator.determine_done(self)
+        timer.lap('determine_done')
 
         # reset previous reward
         self.reward = {}
@@ -189,6 +203,10 @@ class EnvironmentController(CybORGLogger):
             for reward_name, r_calc in team_calcs.items():
                 self.reward[team_name][reward_name] = self.calculate_reward(r_calc)
             self.reward[team_name]['action_cost'] = sum([actions.get(agent, Action()).cost for agent in self.team[team_name]])
+        timer.lap('rewards')
+        timer.finish()
+        if _trace.enabled:
+            _trace.event('rewards', step=self.step_count, done=self.done, rewards=self.reward)
 
     def send_messages(self, messages: dict = None):
         """Sends messages between agents"""
@@ -222,7 +240,6 @@ class EnvironmentController(CybORGLogger):
 
     def execute_action(self, action: Action) -> Observation:
         """Execute an action in the environment"""
-        print('In env controller execute')
         raise NotImplementedError
 
     def determine_done(self) -> bool:
@@ -307,6 +324,26 @@ class EnvironmentController(CybORGLogger):
     def get_agent_state(self, agent_name: str) -> Observation:
         return self.get_true_state(self.INFO_DICT[agent_name])
 
+    def get_cached_agent_state(self, agent_name: str, filtered: bool = True) -> Observation:
+        """Get the state described by INFO_DICT[agent_name], shared by every caller until the state changes
+
+        Unlike get_agent_state the returned Observation is not a fresh copy and must not be modified.
+
+        Parameters
+        ----------
+        agent_name : str
+            key of INFO_DICT, 'True' for the true state
+        filtered : bool
+            if True the observation is passed through _filter_obs
+
+        Returns
+        -------
+        Observation
+            current state
+        """
+        observation = self.get_agent_state(agent_name)
+        return self._filter_obs(observation) if filtered else observation
+
     def get_last_observation(self, agent: str) -> Observation:
         """Get the last observation for an agent
 
@@ -370,6 +407,30 @@ class EnvironmentController(CybORGLogger):
         """
         raise NotImplementedError
 
+    def snapshot(self) -> bytes:
+        """Captures the current state of the environment in memory
+
+        Returns
+        -------
+        bytes
+            snapshot that can be passed to restore_snapshot
+        """
+        raise NotImplementedError
+
+    def restore_snapshot(self, snapshot: bytes):
+        """Returns the environment to a previously captured snapshot
+
+        Parameters
+        ----------
+        snapshot : bytes
+            snapshot returned by snapshot
+        """
+        raise NotImplementedError
+
+    def fork(self) -> 'EnvironmentController':
+        """Creates an independent copy of the environment at its current state"""
+        raise NotImplementedError
+
     def pause(self):
         """Pauses the environment"""
         pass
@@ -432,8 +493,29 @@ class EnvironmentController(CybORGLogger):
             )
         return obs
 
+    def replace_invalid_actions(self, actions: dict) -> dict:
+        """Checks the actions of all agents in one pass, see replace_action_if_invalid
+
+        Parameters
+        ----------
+        actions : dict{str: Action}
+            name of the agent and the action they perform
+
+        Returns
+        -------
+        dict{str: Action}
+            the same dict, with every invalid action replaced by an InvalidAction
+        """
+        for agent_name, action in actions.items():
+            agent = self.agent_interfaces.get(agent_name)
+            if agent is not None and not agent.action_space.is_valid(action):
+                actions[agent_name] = self.replace_action_if_invalid(action, agent)
+        return actions
+
     def replace_action_if_invalid(self, action: Action, agent: AgentInterface):
         # returns action if the parameters in the action are in and true in the action set else return InvalidAction imbued with bug report.
+        if agent.action_space.is_valid(action):
+            return action
         action_space = agent.action_space.get_action_space()
 
         if type(action) not in action_space['action']:
@@ -1,6 +1,8 @@
 # Copyright DST Group. Licensed under the MIT license.
 import sys
+import json
 import logging
+import os
 import paramiko
 import os.path as osp
 
@@ -194,6 +196,122 @@ class CybORGLogger:
         return f"{self.__class__.__name__}: {msg}"
 
 
+class Tracer:
+    """The trace points of one subsystem of the step path.
+
+    Tracing is off by default. Call sites check `enabled` before building the event, so a
+    disabled trace point costs one attribute lookup and does no formatting:
+
+        if _trace.enabled:
+            _trace.event('execute_action', agent=agent_name, action=action)
+
+    Events are logged to the `<CybORG logger>.trace.<subsystem>` logger, see CybORGTrace.configure.
+    """
+
+    def __init__(self, subsystem: str):
+        self.subsystem = subsystem
+        self.enabled = False
+
+    def get_logger(self):
+        return logging.getLogger(f"{CybORGLogger.logger_name}.trace.{self.subsystem}")
+
+    def event(self, name: str, level: int = logging.DEBUG, **fields):
+        logger = self.get_logger()
+        if logger.isEnabledFor(level):
+            logger.log(level, "%s %s", name, fields,
+                       extra={'trace': {'subsystem': self.subsystem, 'event': name, **fields}})
+
+
+class JsonTraceFormatter(logging.Formatter):
+    """Formats a trace event as a single line JSON object"""
+
+    def format(self, record):
+        trace = getattr(record, 'trace', {'event': record.getMessage()})
+        return json.dumps({'time': record.created, 'level': record.levelname, **trace}, default=str)
+
+
+class CybORGTrace:
+    """Per subsystem toggles for the step path tracers.
+
+    Subsystems: 'env' (CybORG), 'controller' (EnvironmentController), 'simulation'
+    (SimulationController) and 'actions' (Action.execute).
+
+    Can also be configured with the environment variables CYBORG_TRACE (comma separated
+    subsystems or 'all'), CYBORG_TRACE_LEVEL (e.g. DEBUG) and CYBORG_TRACE_JSON (file to write
+    the JSON step trace to), which are read when this module is imported.
+    """
+    SUBSYSTEMS = ('env', 'controller', 'simulation', 'actions')
+    tracers = {subsystem: Tracer(subsystem) for subsystem in SUBSYSTEMS}
+    handlers = []
+
+    @staticmethod
+    def get(subsystem: str) -> Tracer:
+        return CybORGTrace.tracers[subsystem]
+
+    @staticmethod
+    def configure(subsystems='all', level=logging.DEBUG, json_file=None, stream=None):
+        """Enables tracing of the given subsystems.
+
+        Arguments
+        ---------
+        subsystems : str or iterable of str
+            the subsystems to trace, 'all' for every subsystem
+        level : int or str
+            lowest level of the events to keep
+        json_file : str or file, optional
+            opt in structured sink, every event is written to it as a line of JSON
+        stream : file, optional
+            plain text sink. Without any sink the events go to the handlers of the CybORG logger.
+        """
+        CybORGTrace.disable()
+        if subsystems == 'all':
+            subsystems = CybORGTrace.SUBSYSTEMS
+        elif isinstance(subsystems, str):
+            subsystems = [subsystems]
+        parent = logging.getLogger(f"{CybORGLogger.logger_name}.trace")
+        if json_file is not None:
+            if isinstance(json_file, str):
+                handler = logging.FileHandler(json_file)
+            else:
+                handler = logging.StreamHandler(json_file)
+            handler.setFormatter(JsonTraceFormatter())
+            CybORGTrace.handlers.append(handler)
+        if stream is not None:
+            CybORGTrace.handlers.append(logging.StreamHandler(stream))
+        for handler in CybORGTrace.handlers:
+            parent.addHandler(handler)
+        parent.propagate = not CybORGTrace.handlers
+        for subsystem in subsystems:
+            tracer = CybORGTrace.get(subsystem)
+            tracer.get_logger().setLevel(level)
+            tracer.enabled = True
+
+    @staticmethod
+    def disable():
+        """Turns every tracer off and removes the sinks added by configure"""
+        parent = logging.getLogger(f"{CybORGLogger.logger_name}.trace")
+        for handler in CybORGTrace.handlers:
+            parent.removeHandler(handler)
+            handler.close()
+        CybORGTrace.handlers = []
+        parent.propagate = True
+        for tracer in CybORGTrace.tracers.values():
+            tracer.enabled = False
+
+    @staticmethod
+    def configure_from_env():
+        subsystems = os.getenv('CYBORG_TRACE')
+        if subsystems:
+            CybORGTrace.configure(
+                subsystems='all' if subsystems == 'all' else subsystems.split(','),
+                level=os.getenv('CYBORG_TRACE_LEVEL', 'DEBUG'),
+                json_file=os.getenv('CYBORG_TRACE_JSON')
+            )
+
+
+CybORGTrace.configure_from_env()
+
+
 def log_trace(func):
     """Logger decorator for logging function execution.
 
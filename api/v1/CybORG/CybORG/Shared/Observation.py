@@ -2,6 +2,7 @@
 ## Additionally, we waive copyright and related rights in the utilized code worldwide through the CC0 1.0 Universal public domain dedication.
 
 import pprint
+from contextlib import contextmanager
 from copy import deepcopy
 from datetime import datetime
 from typing import List, Union, Optional
@@ -11,13 +12,139 @@ import CybORG.Shared.Enums as CyEnums
 
 BROADCAST_ADDRESS = IPv4Address('0.0.0.0')
 
+# fields each list of a host is indexed by while an observation is built
+INDEXED_FIELDS = {"Processes": ("PID",), "Interface": ("IP Address", "Interface Name")}
+# shorter lists are searched, as building their index costs more than it saves
+INDEX_MIN_ITEMS = 8
+
+
+class _Section:
+    """One list of a host, e.g. its processes, changed in place by searching it"""
+
+    def __init__(self, items: list):
+        self.items = items
+
+    def take_first(self, field: str, value) -> Optional[dict]:
+        """Removes the first item whose field has the value, and returns it"""
+        for i, item in enumerate(self.items):
+            if field in item and item[field] == value:
+                del self.items[i]
+                return item
+        return None
+
+    def take_all(self, field: str, value) -> list:
+        """Removes the items whose field has the value, and returns them"""
+        taken = [item for item in self.items if field in item and item[field] == value]
+        if taken:
+            taken_ids = {id(item) for item in taken}
+            self.items[:] = [item for item in self.items if id(item) not in taken_ids]
+        return taken
+
+    def add(self, item: dict):
+        self.items.append(item)
+
+    def equals(self, items: list) -> bool:
+        return self.items == items
+
+
+class _SectionIndex(_Section):
+    """One list of a host indexed while an Observation is built.
+
+    Holds the items of the list in their order and, for each indexed field, the items with each
+    value of the field. Taking an item out and adding it back moves it to the end of the order,
+    as removing it from the list and appending it again would. The list itself is only written
+    when the index is frozen.
+    """
+
+    def __init__(self, items: list, fields: tuple):
+        super().__init__(items)
+        self.fields = fields
+        self.order = {}
+        self.lookup = {field: {} for field in fields}
+        for item in items:
+            self.add(item)
+
+    def add(self, item: dict):
+        self.order[id(item)] = item
+        for field in self.fields:
+            if field in item:
+                self.lookup[field].setdefault(item[field], []).append(item)
+
+    def discard(self, item: dict):
+        del self.order[id(item)]
+        for field in self.fields:
+            if field in item:
+                bucket = self.lookup[field][item[field]]
+                for i, other in enumerate(bucket):
+                    if other is item:
+                        del bucket[i]
+                        break
+                if not bucket:
+                    del self.lookup[field][item[field]]
+
+    def take_first(self, field: str, value) -> Optional[dict]:
+        bucket = self.lookup[field].get(value)
+        if not bucket:
+            return None
+        item = bucket[0]
+        self.discard(item)
+        return item
+
+    def take_all(self, field: str, value) -> list:
+        taken = list(self.lookup[field].get(value, ()))
+        for item in taken:
+            self.discard(item)
+        return taken
+
+    def equals(self, items: list) -> bool:
+        return len(self.order) == len(items) and list(self.order.values()) == items
+
+    def freeze(self):
+        self.items[:] = self.order.values()
+
 
 class Observation:
+    _indexes = None
 
     def __init__(self, success:bool = None):
         self.data = {"success": CyEnums.TrinaryEnum.UNKNOWN if success == None else CyEnums.TrinaryEnum.parse_bool(success)}
         self.raw = ''
 
+    @contextmanager
+    def building(self):
+        """Indexes the processes and interfaces of each host while the observation is built.
+
+        Within the block add_process and add_interface_info find the process with a PID and the
+        interfaces with an IP address or name through the indexes, rather than searching and
+        removing from the lists of the host, once a list has INDEX_MIN_ITEMS items. Indexed lists
+        are only put back in order when the outermost block exits, so the lists of the hosts
+        should not be read or changed directly within it.
+        """
+        if self._indexes is not None:
+            yield self
+            return
+        self._indexes = {}
+        try:
+            yield self
+        finally:
+            indexes, self._indexes = self._indexes, None
+            for (hostid, section), index in indexes.items():
+                host = self.data.get(hostid)
+                if isinstance(host, dict) and host.get(section) is index.items:
+                    index.freeze()
+
+    def _section(self, hostid: str, section: str) -> _Section:
+        """A list of the host, through its index while the observation is built"""
+        items = self.data[hostid][section]
+        if self._indexes is None:
+            return _Section(items)
+        index = self._indexes.get((hostid, section))
+        if index is None or index.items is not items:
+            if len(items) < INDEX_MIN_ITEMS:
+                return _Section(items)
+            index = self._indexes[(hostid, section)] = _SectionIndex(items, INDEXED_FIELDS[section])
+        return index
+
     def get_dict(self):
         return self.data
 
@@ -54,6 +181,7 @@ class Observation:
         elif "Processes" not in self.data[hostid]:
             self.data[hostid]["Processes"] = []
 
+        processes = self._section(hostid, "Processes")
         new_process = {}
 
         pid = kwargs.get("PID", None) if pid is None else pid
@@ -62,11 +190,9 @@ class Observation:
                 pid = int(pid)
             if pid < 0:
                 raise ValueError
-            for old_process in self.data[hostid]["Processes"]:
-                if "PID" in old_process and old_process["PID"] == pid:
-                    new_process = old_process
-                    self.data[hostid]["Processes"].remove(old_process)
-                    break
+            old_process = processes.take_first("PID", pid)
+            if old_process is not None:
+                new_process = old_process
             new_process["PID"] = pid
 
         if parent_pid is None:
@@ -188,9 +314,9 @@ class Observation:
                 vulnerability = CyEnums.Vulnerability.parse_string(vulnerability)
             new_process["Vulnerability"].append(vulnerability)
 
-        self.data[hostid]["Processes"].append(new_process)
+        processes.add(new_process)
 
-        if self.data[hostid] == {"Processes": [{}]}:
+        if not new_process and len(self.data[hostid]) == 1 and processes.equals([{}]):
             self.data.pop(hostid)
 
     def add_system_info(self,
@@ -286,16 +412,14 @@ class Observation:
         elif "Interface" not in self.data[hostid]:
             self.data[hostid]["Interface"] = []
 
+        interfaces = self._section(hostid, "Interface")
         new_interface = {}
 
         if interface_name is None:
             interface_name = kwargs.get("Interface Name", None)
         if interface_name is not None:
-            for interface in self.data[hostid]["Interface"]:
-                if "Interface Name" in interface:
-                    if interface["Interface Name"] == interface_name:
-                        new_interface = interface
-                        self.data[hostid]["Interface"].remove(interface)
+            for interface in interfaces.take_all("Interface Name", interface_name):
+                new_interface = interface
             new_interface["Interface Name"] = interface_name
 
         if ip_address is None:
@@ -304,21 +428,16 @@ class Observation:
             if type(ip_address) is str:
                 ip_address = IPv4Address(ip_address)
             if ip_address == BROADCAST_ADDRESS:
-                if self.data[hostid]["Interface"] == []:
+                if interfaces.equals([]):
                     self.data[hostid].pop("Interface")
                 return
-            for interface in self.data[hostid]["Interface"]:
-                if "IP Address" not in interface:
-                    continue
-                if interface["IP Address"] != ip_address:
-                    continue
+            for interface in interfaces.take_all("IP Address", ip_address):
                 if len(interface) > len(new_interface):
                     new_interface = interface
                 elif len(interface) == len(new_interface):
                     for k in ["Interface Name", "Subnet"]:
                         if k in interface and k not in new_interface:
                             new_interface[k] = interface[k]
-                self.data[hostid]["Interface"].remove(interface)
             new_interface["IP Address"] = ip_address
 
         if subnet is None:
@@ -331,9 +450,9 @@ class Observation:
         if blocked_ips is not None:
             new_interface["blocked_ips"] = blocked_ips
 
-        self.data[hostid]["Interface"].append(new_interface)
+        interfaces.add(new_interface)
 
-        if self.data[hostid]["Interface"] == [{}]:
+        if not new_interface and interfaces.equals([{}]):
             self.data[hostid].pop("Interface")
 
     def add_file_info(self,
@@ -624,34 +743,35 @@ class Observation:
         """
         if not isinstance(obs, dict):
             obs = obs.data
-        for key, info in obs.items():
-            if key == "success":
-                self.set_success(info)
-                continue
-            if not isinstance(info, dict):
-                self.add_key_value(key, info)
-                continue
-            if "Sessions" in info:
-                for session_info in info["Sessions"]:
-                    self.add_session_info(hostid=key, **session_info)
-            if "Processes" in info:
-                for process in info["Processes"]:
-                    if 'Connections' in process:
-                        for conn in process['Connections']:
-                            self.add_process(hostid=key, **process, **conn)
-                    else:
-                        self.add_process(hostid=key, **process)
-            if "User Info" in info:
-                for user in info["User Info"]:
-                    self.add_user_info(hostid=key, **user)
-            if "Files" in info:
-                for file_info in info["Files"]:
-                    self.add_file_info(hostid=key, **file_info)
-            if "Interface" in info:
-                for interface in info["Interface"]:
-                    self.add_interface_info(hostid=key, **interface)
-            if "System info" in info:
-                self.add_system_info(hostid=key, **info["System info"])
+        with self.building():
+            for key, info in obs.items():
+                if key == "success":
+                    self.set_success(info)
+                    continue
+                if not isinstance(info, dict):
+                    self.add_key_value(key, info)
+                    continue
+                if "Sessions" in info:
+                    for session_info in info["Sessions"]:
+                        self.add_session_info(hostid=key, **session_info)
+                if "Processes" in info:
+                    for process in info["Processes"]:
+                        if 'Connections' in process:
+                            for conn in process['Connections']:
+                                self.add_process(hostid=key, **process, **conn)
+                        else:
+                            self.add_process(hostid=key, **process)
+                if "User Info" in info:
+                    for user in info["User Info"]:
+                        self.add_user_info(hostid=key, **user)
+                if "Files" in info:
+                    for file_info in info["Files"]:
+                        self.add_file_info(hostid=key, **file_info)
+                if "Interface" in info:
+                    for interface in info["Interface"]:
+                        self.add_interface_info(hostid=key, **interface)
+                if "System info" in info:
+                    self.add_system_info(hostid=key, **info["System info"])
         return self
 
     def add_raw_obs(self, raw_obs):
@@ -792,7 +912,7 @@ class Observation:
             addr_observed = False
             valid_addr_observed = False
 
-            filter_procs = []
+            filter_procs = set()
             for i, proc in enumerate(obs_v.get("Processes", [])):
                 if "Connections" not in proc:
                     continue
@@ -802,34 +922,34 @@ class Observation:
                             addr_observed = True
                             if conn[proc_k] in ip_set:
                                 valid_addr_observed = True
-                            elif i not in filter_procs:
-                                filter_procs.append(i)
+                            else:
+                                filter_procs.add(i)
 
-            # Must remove indices in reverse order, else risk incorrect proc
-            # being removed
-            for p_idx in sorted(filter_procs, reverse=True):
-                del obs_v["Processes"][p_idx]
+            # the filtered lists are rebuilt in place in one pass rather than deleting each index
+            if filter_procs:
+                obs_v["Processes"][:] = [proc for i, proc in enumerate(obs_v["Processes"]) if i not in filter_procs]
 
             if "Processes" in obs_v and len(obs_v["Processes"]) == 0:
                 del obs_v["Processes"]
 
-            filter_interfaces = []
+            filter_interfaces = set()
             for i, interface in enumerate(obs_v.get("Interface", [])):
                 if "IP Address" in interface:
                     addr_observed = True
                     if interface["IP Address"] in ip_set:
                         valid_addr_observed = True
                     else:
-                        filter_interfaces.append(i)
+                        filter_interfaces.add(i)
                 if "Subnet" in interface:
                     addr_observed = True
                     if interface["Subnet"] in cidr_set:
                         valid_addr_observed = True
-                    elif i not in filter_interfaces:
-                        filter_interfaces.append(i)
+                    else:
+                        filter_interfaces.add(i)
 
-            for i_idx in sorted(filter_interfaces, reverse=True):
-                del obs_v["Interface"][i_idx]
+            if filter_interfaces:
+                obs_v["Interface"][:] = [interface for i, interface in enumerate(obs_v["Interface"])
+                                         if i not in filter_interfaces]
 
             if "Interface" in obs_v and len(obs_v["Interface"]) == 0:
                 del obs_v["Interface"]
@@ -3,7 +3,7 @@ from collections import namedtuple
 
 from CybORG.Shared import Scenario
 from CybORG.Shared.Enums import OperatingSystemType
-from CybORG.Shared.RewardCalculator import RewardCalculator
+from CybORG.Shared.RewardCalculator import RewardCalculator, IncrementalRewardCalculator
 import pprint
 
 WIN_REWARD = 0
@@ -16,7 +16,7 @@ LOSE_ROOT_SESSION_REWARD = 0
 REWARD_MAX_DECIMAL_PLACES = 1
 HostReward = namedtuple('HostReward','confidentiality availability')
 
-class PwnRewardCalculator(RewardCalculator):
+class PwnRewardCalculator(IncrementalRewardCalculator):
     # this reward calculator provides a reward to Red due to changes in the number of privileged sessions
     def __init__(self, agent_name: str, scenario: Scenario):
         super().__init__(agent_name)
@@ -31,6 +31,7 @@ class PwnRewardCalculator(RewardCalculator):
 
     def reset(self):
         self.old_total = 0
+        self._unbind()
 
     def calculate_reward(self, current_state: dict, action: dict, agent_observations: dict, done: bool):
         root_sessions = 0
@@ -62,8 +63,34 @@ class PwnRewardCalculator(RewardCalculator):
         self.old_total = total
         return round(reward, REWARD_MAX_DECIMAL_PLACES)
 
+    def _clear_totals(self):
+        self.compromised_hosts = {}
+
+    def _update_host(self, state, hostname: str):
+        # same rules as calculate_reward, read from the host instead of the true state
+        self.compromised_hosts.pop(hostname, None)
+        host = state.hosts[hostname]
+        for agent, sessions in host.sessions.items():
+            for ident in sessions:
+                session = state.sessions[agent][ident]
+                if session.agent != self.agent_name:
+                    continue
+                if (session.username == 'root' and host.os_type == OperatingSystemType.LINUX) or \
+                        (session.username == 'SYSTEM' and host.os_type == OperatingSystemType.WINDOWS):
+                    self.compromised_hosts[hostname] = \
+                        self.mapping[self.scenario.get_host(hostname).get_confidentiality_value('Low')]
+                    return
+
+    def _get_reward(self) -> float:
+        total = sum(self.compromised_hosts.values())
+        self.old_total = total
+        return round(total, REWARD_MAX_DECIMAL_PLACES)
+
+    def _get_host_values(self) -> dict:
+        return self.compromised_hosts
 
-class DistruptRewardCalculator(RewardCalculator):
+
+class DistruptRewardCalculator(IncrementalRewardCalculator):
     # calculates the reward for disrupting the network
     def __init__(self, agent_name: str, scenario: Scenario):
         super(DistruptRewardCalculator, self).__init__(agent_name)
@@ -79,9 +106,11 @@ class DistruptRewardCalculator(RewardCalculator):
                         'High': 10.0}
 
         self.impacted_hosts = {}
+        self.disrupted = set()
 
     def reset(self):
         self.ots = None
+        self._unbind()
 
     def calculate_reward(self, current_state: dict, action: dict, agent_observations: dict, done: bool):
         self.impacted_hosts = {}
@@ -121,6 +150,33 @@ class DistruptRewardCalculator(RewardCalculator):
         reward = sum(availability_scores)
         return round(reward, REWARD_MAX_DECIMAL_PLACES)
 
+    def _clear_totals(self):
+        self.disrupted = set()
+        if self.ots is None:
+            self.ots = [hostname for hostname, host in self.state.hosts.items()
+                        if any(proc.name == 'OTService' for proc in host.processes)]
+
+    def _update_host(self, state, hostname: str):
+        # same rules as calculate_reward, read from the host instead of the true state
+        if hostname not in self.ots:
+            return
+        processes = state.hosts[hostname].processes
+        if processes and not any(proc.name == 'OTService' for proc in processes):
+            self.disrupted.add(hostname)
+        else:
+            self.disrupted.discard(hostname)
+
+    def _get_reward(self) -> float:
+        # in the order of self.ots, which only holds the few hosts running an OT service
+        self.impacted_hosts = {
+            hostname: self.mapping[self.scenario.get_host(hostname).get_availability_value(default='Low')]
+            for hostname in self.ots if hostname in self.disrupted
+        }
+        return round(sum(self.impacted_hosts.values()), REWARD_MAX_DECIMAL_PLACES)
+
+    def _get_host_values(self) -> dict:
+        return self.impacted_hosts
+
 
 class HybridImpactPwnRewardCalculator(RewardCalculator):
     # Hybrid of availability and confidentiality reward calculator
@@ -141,6 +197,13 @@ class HybridImpactPwnRewardCalculator(RewardCalculator):
         self._compute_host_scores(current_state.keys())
         return round(reward, REWARD_MAX_DECIMAL_PLACES)
 
+    def calculate_simulation_reward(self, env_controller):
+        # lets both calculators use their running totals rather than the true state
+        reward = self.pwn_calculator.calculate_simulation_reward(env_controller) \
+                 + self.disrupt_calculator.calculate_simulation_reward(env_controller)
+        self._compute_host_scores(env_controller.INFO_DICT['True'].keys())
+        return round(reward, REWARD_MAX_DECIMAL_PLACES)
+
     def _compute_host_scores(self, hostnames):
         self.host_scores = {}
         compromised_hosts = self.pwn_calculator.compromised_hosts
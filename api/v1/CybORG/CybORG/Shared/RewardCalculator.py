@@ -17,7 +17,8 @@ class RewardCalculator(CybORGLogger):
         self.time = 0
 
     def calculate_simulation_reward(self, env_controller):
-        current_state = env_controller._filter_obs(env_controller.get_true_state(env_controller.INFO_DICT['True'])).data
+        # shared with the other reward calculators of this step, read only
+        current_state = env_controller.get_cached_agent_state('True').data
         action = env_controller.action
         agent_observations = env_controller.observation
         done = env_controller.done
@@ -38,3 +39,67 @@ class RewardCalculator(CybORGLogger):
 class EmptyRewardCalculator(RewardCalculator):
     def calculate_reward(self, current_state: dict, action: Action, agent_observations: dict, done: bool):
         return 0.
+
+
+class IncrementalRewardCalculator(RewardCalculator):
+    """A reward calculator that keeps running totals from the events emitted by the simulation State.
+
+    Only the hosts named in an event since the previous call are re-evaluated, so a step costs
+    O(changes) rather than a rescan of every host. calculate_reward remains the full rescan of a
+    true state dict; it is used when there is no simulated State (e.g. emulation) and to check the
+    running totals when verify is set.
+    """
+    # when True every incremental reward is asserted to equal the full rescan of the true state
+    verify = False
+
+    def __init__(self, agent_name: str):
+        super().__init__(agent_name)
+        self.state = None
+        self.changed_hosts = set()
+
+    def calculate_simulation_reward(self, env_controller):
+        state = getattr(env_controller, 'state', None)
+        if state is None:
+            return super().calculate_simulation_reward(env_controller)
+        if state is not self.state:
+            # first call or the environment was reset
+            self._unbind()
+            self.state = state
+            state.subscribe(self._on_event)
+            self.changed_hosts = set(state.hosts)
+            self._clear_totals()
+        changed, self.changed_hosts = self.changed_hosts, set()
+        for hostname in changed:
+            self._update_host(state, hostname)
+        reward = self._get_reward()
+        if self.verify:
+            self._verify(env_controller, reward)
+        return reward
+
+    def _on_event(self, event: str, hostname: str):
+        self.changed_hosts.add(hostname)
+
+    def _unbind(self):
+        if self.state is not None:
+            self.state.unsubscribe(self._on_event)
+            self.state = None
+
+    def _verify(self, env_controller, reward: float):
+        host_values = dict(self._get_host_values())
+        expected = super().calculate_simulation_reward(env_controller)
+        assert reward == expected and host_values == self._get_host_values(), \
+            f'{self.__class__.__name__} for {self.agent_name}: incremental reward {reward} {host_values} ' \
+            f'does not match the full rescan {expected} {self._get_host_values()}'
+
+    def _clear_totals(self):
+        raise NotImplementedError
+
+    def _update_host(self, state, hostname: str):
+        raise NotImplementedError
+
+    def _get_reward(self) -> float:
+        raise NotImplementedError
+
+    def _get_host_values(self) -> dict:
+        """The per host values the reward is made of, compared by the verification"""
+        raise NotImplementedError
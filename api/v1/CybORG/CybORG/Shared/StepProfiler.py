@@ -0,0 +1,238 @@
+import json
+import os
+from bisect import bisect_left
+from time import perf_counter
+
+# upper bounds of the histogram buckets in seconds, from 1 microsecond to 10 seconds
+BUCKETS = tuple(round(factor * 10 ** exponent, 9) for exponent in range(-6, 1) for factor in (1, 2.5, 5)) + (10.0,)
+
+STEP_SECONDS = 'cyborg_step_seconds'
+PHASE_SECONDS = 'cyborg_step_phase_seconds'
+ACTION_SECONDS = 'cyborg_action_seconds'
+HELP = {
+    STEP_SECONDS: 'Time taken by a whole step of the simulation',
+    PHASE_SECONDS: 'Time taken by each phase of a step',
+    ACTION_SECONDS: 'Time taken to execute an action, by action class',
+}
+
+
+class Histogram:
+    """Counts of observed values in the fixed BUCKETS, along with their count, sum and maximum"""
+
+    def __init__(self):
+        # one count per bucket and a final one for values above the last bucket
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'Histogram'):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Estimate of the q quantile, interpolated within the bucket that holds it"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = BUCKETS[i - 1] if i > 0 else 0.0
+                upper = BUCKETS[i] if i < len(BUCKETS) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {'counts': list(self.counts), 'count': self.count, 'sum': self.sum, 'max': self.max}
+
+    @staticmethod
+    def from_dict(data: dict) -> 'Histogram':
+        histogram = Histogram()
+        histogram.counts = list(data['counts'])
+        histogram.count = data['count']
+        histogram.sum = data['sum']
+        histogram.max = data['max']
+        return histogram
+
+
+class PhaseTimer:
+    """Times consecutive phases of a step.
+
+    lap(phase) adds the time since the previous lap to the phase, so a phase may be timed in
+    several pieces. skip() starts the next lap without recording. finish() records the total of
+    each phase once in the phase histogram, and the whole time since the timer was created as a
+    step when step=True.
+    """
+
+    def __init__(self):
+        self.start = self.last = perf_counter()
+        self.phases = {}
+
+    def lap(self, phase: str):
+        now = perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self.last
+        self.last = now
+
+    def skip(self):
+        self.last = perf_counter()
+
+    def record(self, name: str, **labels):
+        """Records the time since the previous lap directly in the histogram `name`"""
+        now = perf_counter()
+        CybORGProfiler.observe(name, now - self.last, **labels)
+        self.last = now
+
+    def finish(self, step: bool = False):
+        for phase, seconds in self.phases.items():
+            CybORGProfiler.observe(PHASE_SECONDS, seconds, phase=phase)
+        if step:
+            CybORGProfiler.observe(STEP_SECONDS, perf_counter() - self.start)
+
+
+class _DisabledTimer:
+    """Stands in for PhaseTimer while profiling is off"""
+
+    def lap(self, phase: str):
+        pass
+
+    def skip(self):
+        pass
+
+    def record(self, name: str, **labels):
+        pass
+
+    def finish(self, step: bool = False):
+        pass
+
+
+_disabled_timer = _DisabledTimer()
+
+
+class CybORGProfiler:
+    """Registry of the step timing histograms of this process.
+
+    Off by default, the step path then only pays for a call to a no-op timer per phase. Enabled
+    with enable() or by setting the environment variable CYBORG_PROFILE (to anything but '0')
+    before CybORG is imported.
+
+    Histograms are keyed by name and labels: cyborg_step_phase_seconds{phase} for the phases of
+    EnvironmentController.step and SimulationController.step, cyborg_action_seconds{action} for
+    the execution of each action class and cyborg_step_seconds for the whole simulation step.
+    """
+    enabled = False
+    histograms = {}
+
+    @staticmethod
+    def enable():
+        CybORGProfiler.enabled = True
+
+    @staticmethod
+    def disable():
+        CybORGProfiler.enabled = False
+
+    @staticmethod
+    def reset():
+        CybORGProfiler.histograms = {}
+
+    @staticmethod
+    def timer():
+        return PhaseTimer() if CybORGProfiler.enabled else _disabled_timer
+
+    @staticmethod
+    def observe(name: str, seconds: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        histogram = CybORGProfiler.histograms.get(key)
+        if histogram is None:
+            histogram = CybORGProfiler.histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+    @staticmethod
+    def collect() -> list:
+        """The histograms as JSON serialisable dicts, which can be sent between processes and merged"""
+        return [dict(name=name, labels=dict(labels), **histogram.to_dict())
+                for (name, labels), histogram in sorted(CybORGProfiler.histograms.items())]
+
+    @staticmethod
+    def merge(collections: list) -> list:
+        """Adds up several results of collect(), e.g. from every worker process"""
+        merged = {}
+        for collection in collections:
+            for data in collection:
+                key = (data['name'], tuple(sorted(data['labels'].items())))
+                if key in merged:
+                    merged[key].merge(Histogram.from_dict(data))
+                else:
+                    merged[key] = Histogram.from_dict(data)
+        return [dict(name=name, labels=dict(labels), **histogram.to_dict())
+                for (name, labels), histogram in sorted(merged.items())]
+
+    @staticmethod
+    def summary(collection: list = None) -> list:
+        """Count, mean, p50, p99 and max in milliseconds of each histogram"""
+        collection = CybORGProfiler.collect() if collection is None else collection
+        rows = []
+        for data in collection:
+            histogram = Histogram.from_dict(data)
+            rows.append({
+                'name': data['name'],
+                'labels': data['labels'],
+                'count': histogram.count,
+                'mean_ms': histogram.sum / histogram.count * 1000 if histogram.count else 0.0,
+                'p50_ms': histogram.quantile(0.5) * 1000,
+                'p99_ms': histogram.quantile(0.99) * 1000,
+                'max_ms': histogram.max * 1000,
+            })
+        return rows
+
+    @staticmethod
+    def to_prometheus(collection: list = None) -> str:
+        """Renders the histograms in the Prometheus text exposition format"""
+        collection = CybORGProfiler.collect() if collection is None else collection
+        lines = []
+        described = set()
+        for data in collection:
+            name = data['name']
+            if name not in described:
+                described.add(name)
+                lines.append(f'# HELP {name} {HELP.get(name, name)}')
+                lines.append(f'# TYPE {name} histogram')
+            labels = [f'{key}="{value}"' for key, value in sorted(data['labels'].items())]
+            cumulative = 0
+            for bound, count in zip(BUCKETS + ('+Inf',), data['counts']):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f'{name}_bucket{{{",".join(labels + [le])}}} {cumulative}')
+            label_text = f'{{{",".join(labels)}}}' if labels else ''
+            lines.append(f'{name}_sum{label_text} {data["sum"]}')
+            lines.append(f'{name}_count{label_text} {data["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def dump(file, collection: list = None):
+        """Writes the summary and the histograms as JSON to a path or an open file"""
+        collection = CybORGProfiler.collect() if collection is None else collection
+        data = {'summary': CybORGProfiler.summary(collection), 'histograms': collection}
+        if isinstance(file, str):
+            with open(file, 'w') as f:
+                json.dump(data, f, indent=2)
+        else:
+            json.dump(data, file, indent=2)
+
+    @staticmethod
+    def configure_from_env():
+        if os.getenv('CYBORG_PROFILE', '0') != '0':
+            CybORGProfiler.enable()
+
+
+CybORGProfiler.configure_from_env()
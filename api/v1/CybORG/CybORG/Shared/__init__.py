@@ -1,4 +1,5 @@
-from .Logger import CybORGLogger
+from .Logger import CybORGLogger, CybORGTrace
+from .StepProfiler import CybORGProfiler
 from .Observation import Observation
 from .Scenario import Scenario
 from .Results import Results
@@ -2,8 +2,6 @@
 from ipaddress import IPv4Address, IPv4Network
 from typing import Union, Optional
 
-from networkx import shortest_path, has_path, NetworkXNoPath
-
 from CybORG.Shared import Observation, CybORGLogger
 from CybORG.Simulator.Host import Host
 from CybORG.Simulator.State import State
@@ -69,11 +67,7 @@ class RemoteAction(Action):
     @staticmethod
     def get_route(state: State, target: str, source: str) -> list:
         """finds the route from one ip_address to another and returns the hostname list along that route"""
-        try:
-            path = shortest_path(state.link_diagram, source=source, target=target)
-        except NetworkXNoPath:
-            path = None
-        return path
+        return state.get_route(source, target)
 
     def get_used_route(self, state: State) -> list:
         """finds the route used by the action and returns the hostnames along that route"""
@@ -84,9 +78,7 @@ class RemoteAction(Action):
         """
         Checks if data can be send from one address to another
         """
-        for connected_components in state.connected_components:
-            if source in connected_components:
-                return target in connected_components
+        return state.is_routable(source, target)
 
     def _get_originating_ip(self, state: State, from_host: Host, target_ip_address) -> Optional[IPv4Address]:
         """
@@ -15,7 +15,7 @@ from CybORG.Shared.Enums import OperatingSystemType, DecoyType
 from CybORG.Simulator.Host import Host
 from CybORG.Simulator.Process import Process
 from CybORG.Simulator.Session import Session
-from CybORG.Simulator.State import State
+from CybORG.Simulator.State import State, SESSION_CHANGED
 
 class EscalateAction(LocalAction):
     """
@@ -56,6 +56,7 @@ class EscalateAction(LocalAction):
                 return obs
 
         obs = self.__upgrade_session(user, target_host, target_session)
+        state.emit(SESSION_CHANGED, target_host.hostname)
         return obs
 
     @abstractmethod
@@ -10,7 +10,7 @@ from CybORG.Simulator.Actions.ConcreteActions.RemoveOtherSessions import RemoveO
 from CybORG.Shared.Enums import TrinaryEnum, DecoyType, OperatingSystemType, SessionType
 from CybORG.Simulator.Host import Host
 from CybORG.Simulator.Process import Process
-from CybORG.Simulator.State import State
+from CybORG.Simulator.State import State, SESSION_CHANGED
 from CybORG.Simulator.Session import Session
 
 
@@ -71,7 +71,11 @@ class SeizeControl(LocalAction):
             # upgrade session to new username
             target_session.username = "root"
             # determine new agent name from hostname and acting agent
+            state.unindex_session(self.agent, target_session)
             target_session.agent = '_'.join(self.agent.split('_')[:-1]) + '_' + hostname.split('_')[-1]
+            replaced = state.sessions[target_session.agent].get(0)
+            if replaced is not None:
+                state.unindex_session(target_session.agent, replaced)
             state.sessions[target_session.agent][0] = state.sessions[self.agent].pop(target_session.ident)
             # if target_session.ident in state.sessions[self.agent][0].children:
             #     state.sessions[self.agent][0].children.pop(target_session.ident)
@@ -80,6 +84,7 @@ class SeizeControl(LocalAction):
             target_session.parent = None
             target_host.sessions[self.agent].remove(target_session.ident)
             target_session.ident = 0
+            state.index_session(target_session.agent, target_session)
             if 0 not in target_host.sessions[target_session.agent]:
                 state.sessions_count[target_session.agent] += 1
                 target_host.sessions[target_session.agent].append(target_session.ident)
@@ -93,6 +98,7 @@ class SeizeControl(LocalAction):
                 target_session.session_type = session_type
                 target_host.add_file(f'escalate.{ext}', path, "root", 7,
                         density=0.9, signed=False)
+            state.emit(SESSION_CHANGED, target_host.hostname)
             obs.set_success(True)
         if obs.data['success'] is not TrinaryEnum.TRUE:
             return obs
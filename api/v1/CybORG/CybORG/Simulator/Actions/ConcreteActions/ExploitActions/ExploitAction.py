@@ -544,22 +544,17 @@ class ExploitAction(RemoteAction):
         Searches the state for the appropriate vulnerable process. Returns None if this \
                 can\'t be found.
         '''
-        vuln_proc = None
-        for proc in target_host.processes:
-            if proc.process_type == ProcessType.parse_string(process_type):
-                for conn in proc.connections:
-                    if 'local_port' in conn and conn['local_port'] == port:
-                        vuln_proc = proc
-                        target_host.events['NetworkConnections'].append(
-                            {'local_address': self.ip_address,
-                             'local_port': conn["local_port"],
-                             'remote_address': from_ip,
-                             'remote_port': target_host.get_ephemeral_port()})
-                        break
-                if vuln_proc is not None:
-                    break
-
-        return vuln_proc
+        process_type = ProcessType.parse_string(process_type)
+        for proc in target_host.get_listening_processes(port):
+            if proc.process_type == process_type:
+                target_host.events['NetworkConnections'].append(
+                    {'local_address': self.ip_address,
+                     'local_port': port,
+                     'remote_address': from_ip,
+                     'remote_port': target_host.get_ephemeral_port()})
+                return proc
+
+        return None
 
     def _get_target_process(self, port, process_type):
         target_process = {
@@ -5,7 +5,7 @@ from CybORG.Shared import Observation
 from .LocalAction import LocalAction
 from CybORG.Simulator.Actions.ConcreteActions.StopProcess import StopProcess
 from CybORG.Simulator.Session import VelociraptorServer
-from CybORG.Simulator.State import State
+from CybORG.Simulator.State import State, PROCESS_KILLED, SESSION_REMOVED
 
 
 class RemoveOtherSessions(LocalAction):
@@ -34,11 +34,12 @@ class RemoveOtherSessions(LocalAction):
                                     obs.set_success(True)
             host = state.hosts[hostname]
             for sus_pid in sus_pids:
-                process = [proc for proc in host.processes if proc.pid == sus_pid][0]
+                process = host.get_process(sus_pid)
                 agent, session = state.get_session_from_pid(hostname, pid=sus_pid)
                 host.processes.remove(process)
-                host.sessions[agent].remove(session)
-                state.sessions[agent].pop(session)
+                state.remove_session(agent, session)
+                state.emit(PROCESS_KILLED, hostname)
+                state.emit(SESSION_REMOVED, hostname)
         return obs
 
     def __str__(self):
@@ -69,11 +70,12 @@ class RemoveOtherSessions_AlwaysSuccessful(LocalAction):
                                 obs.set_success(True)
             host = state.hosts[hostname]
             for sus_pid in sus_pids:
-                process = [proc for proc in host.processes if proc.pid == sus_pid][0]
+                process = host.get_process(sus_pid)
                 agent, session = state.get_session_from_pid(hostname, pid=sus_pid)
                 host.processes.remove(process)
-                host.sessions[agent].remove(session)
-                state.sessions[agent].pop(session)
+                state.remove_session(agent, session)
+                state.emit(PROCESS_KILLED, hostname)
+                state.emit(SESSION_REMOVED, hostname)
         return obs
 
     def __str__(self):
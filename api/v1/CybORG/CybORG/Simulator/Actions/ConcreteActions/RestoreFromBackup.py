@@ -2,7 +2,7 @@ from CybORG.Shared import Observation
 from CybORG.Simulator.Actions.ConcreteActions.LocalAction import LocalAction
 from CybORG.Simulator.Host import Host
 from CybORG.Simulator.Process import Process
-from CybORG.Simulator.State import State
+from CybORG.Simulator.State import State, SESSION_REMOVED, PROCESS_KILLED, PROCESS_STARTED
 
 
 class RestoreFromBackup(LocalAction):
@@ -28,8 +28,12 @@ class RestoreFromBackup(LocalAction):
             old_sessions[agent] = {}
             for session in sessions:
                 old_sessions[agent][session] = state.sessions[agent].pop(session)
+                state.unindex_session(agent, old_sessions[agent][session])
         target_host.restore()
         for agent, sessions in target_host.sessions.items():
             for session in sessions:
                 state.sessions[agent][session] = old_sessions[agent][session]
+                state.index_session(agent, old_sessions[agent][session])
+        for event in (SESSION_REMOVED, PROCESS_KILLED, PROCESS_STARTED):
+            state.emit(event, target_host.hostname)
         return obs
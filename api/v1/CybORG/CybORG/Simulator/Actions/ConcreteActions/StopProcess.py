@@ -2,7 +2,7 @@ from CybORG.Shared import Observation
 from CybORG.Simulator.Actions.ConcreteActions.LocalAction import LocalAction
 from CybORG.Simulator.Host import Host
 from CybORG.Simulator.Process import Process
-from CybORG.Simulator.State import State
+from CybORG.Simulator.State import State, PROCESS_KILLED, SESSION_REMOVED
 
 
 class StopProcess(LocalAction):
@@ -39,13 +39,14 @@ class StopProcess(LocalAction):
         host.processes.remove(process)
         if process.pid in [i['process'] for i in host.services.values()]:
             process.pid = None
-            host.add_process(**process.__dict__)
+            host.add_process(**process.serialize())
             service = True
         else:
             service = False
+        state.emit(PROCESS_KILLED, host.hostname)
         if session is not None:
-            host.sessions[agent].remove(session)
-            state.sessions[agent].pop(session)
+            state.remove_session(agent, session)
+            state.emit(SESSION_REMOVED, host.hostname)
             if service:
                 session_reloaded = state.add_session(host=host.hostname, user=session.user,
                                                     session_type=session.session_type, agent=session.agent,
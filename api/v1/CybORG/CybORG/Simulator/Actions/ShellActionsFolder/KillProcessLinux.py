@@ -2,6 +2,7 @@
 from CybORG.Simulator.Actions.ShellActionsFolder.ShellAction import ShellAction
 from CybORG.Shared.Enums import OperatingSystemType
 from CybORG.Shared.Observation import Observation
+from CybORG.Simulator.State import PROCESS_KILLED, SESSION_REMOVED
 
 
 class KillProcessLinux(ShellAction):
@@ -25,10 +26,11 @@ class KillProcessLinux(ShellAction):
             if process is not None:
                 obs.set_success(True)
                 host.processes.remove(process)
+                state.emit(PROCESS_KILLED, host.hostname)
                 agent, session = state.get_session_from_pid(pid=self.process, hostname=host.hostname)
                 if session is not None:
-                    host.sessions[agent].remove(session)
-                    session_obj = state.sessions[agent].pop(session)
+                    session_obj = state.remove_session(agent, session)
+                    state.emit(SESSION_REMOVED, host.hostname)
                     for child in session_obj.children.values():
                         child.set_orphan()
                     if session_obj.parent is not None:
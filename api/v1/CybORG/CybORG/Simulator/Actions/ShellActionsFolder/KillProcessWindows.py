@@ -2,6 +2,7 @@
 from CybORG.Simulator.Actions.ShellActionsFolder.ShellAction import ShellAction
 from CybORG.Shared.Enums import OperatingSystemType
 from CybORG.Shared.Observation import Observation
+from CybORG.Simulator.State import PROCESS_KILLED, SESSION_REMOVED
 
 
 class KillProcessWindows(ShellAction):
@@ -18,17 +19,18 @@ class KillProcessWindows(ShellAction):
         if not state.sessions[self.agent][self.session].active:
             return obs
 
-        host = state.sessions[self.agent][self.session].hostname
+        host = state.hosts[state.sessions[self.agent][self.session].hostname]
         obs.add_system_info(hostid="hostid0", os_type=host.os_type)
         if host.os_type == OperatingSystemType.WINDOWS:
             process = host.get_process(self.process)
             if process is not None:
                 obs.set_success(True)
                 host.processes.remove(process)
-                session, agent = host.get_session(pid=self.process)
+                state.emit(PROCESS_KILLED, host.hostname)
+                agent, session = state.get_session_from_pid(pid=self.process, hostname=host.hostname)
                 if session is not None:
-                    host.sessions[agent].remove(session)
-                    state.sessions[agent].pop(session.ident)
+                    state.remove_session(agent, session)
+                    state.emit(SESSION_REMOVED, host.hostname)
             else:
                 obs.set_success(False)
         else:
@@ -120,6 +120,7 @@ class DirtyCowPrivilegeEscalation(ShellPrivilegeEscalation):
                     user.username = "firefart"
                     user.password = "password"
                     user.password_hash = "ro46DZg1ViGBs"
+                    session.hostname.users.reindex()
                     self.obs.add_user_info(hostid="hostid1", group_name="root", gid=0, username="firefart", uid=0, password="password", password_hash="ro46DZg1ViGBs")
                     return True
         return False
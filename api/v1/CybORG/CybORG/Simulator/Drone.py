@@ -113,3 +113,4 @@ class Drone(Host):
             self.fixed_heading = None
             self.update_drone_velocity([state.hosts[host] for host in drone_neighbourhood if type(state.hosts[host]) == Drone and host != self.hostname])
         self.update_drone_position()
+        state.bump_version()
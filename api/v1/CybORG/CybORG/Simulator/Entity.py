@@ -1,9 +1,49 @@
 # Copyright DST Group. Licensed under the MIT license.
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def slot_names(cls) -> tuple:
+    """Attributes declared in the __slots__ of the class and its bases"""
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get('__slots__', ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name not in ('__dict__', '__weakref__') and name not in names:
+                names.append(name)
+    return tuple(names)
 
 
 class Entity:
+    """Base class of the objects making up the simulated state.
+
+    Subclasses declare their attributes in __slots__, so their instances carry no __dict__.
+    serialize returns the attributes that are set as a dict, which is also what is pickled.
+    """
+    __slots__ = ()
+
     def __init__(self):
         pass
 
     def get_state(self):
         pass
+
+    def serialize(self) -> dict:
+        state = {name: getattr(self, name) for name in slot_names(type(self)) if hasattr(self, name)}
+        # subclasses without __slots__, e.g. Host, keep their attributes in a __dict__
+        state.update(getattr(self, '__dict__', {}))
+        return state
+
+    def __getstate__(self) -> dict:
+        return self.serialize()
+
+    def __setstate__(self, state: dict):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def copy(self):
+        """Copy with new list, dict and set attributes holding the same items, other values are shared"""
+        clone = object.__new__(type(self))
+        clone.__setstate__({name: type(value)(value) if type(value) in (list, dict, set) else value
+                            for name, value in self.serialize().items()})
+        return clone
@@ -9,6 +9,10 @@ import enum
 
 
 class File(Entity):
+    __slots__ = ('name', 'path', 'user', 'user_permissions', 'group', 'group_permissions', 'default_permissions',
+                 'create_time', 'last_modified_time', 'last_access_time', 'file_type', 'vendor', 'version',
+                 'density', 'signed', 'yaml_file_path')
+
     def __init__(self, name: str, path: str, user: User, user_permissions: int = None,
                  group: str = None, group_permissions: int = None, default_permissions: int = None,
                  create_time: str = None, last_modified_time: str = None,
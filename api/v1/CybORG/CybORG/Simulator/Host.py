@@ -13,6 +13,7 @@ from CybORG.Shared.Enums import (OperatingSystemPatch, OperatingSystemKernelVers
 
 from CybORG.Simulator.Entity import Entity
 from CybORG.Simulator.File import File
+from CybORG.Simulator.IndexedList import Attribute, IndexedList
 from CybORG.Simulator.Interface import Interface
 from CybORG.Simulator.MSFServerSession import MSFServerSession
 from CybORG.Simulator.Process import Process
@@ -21,11 +22,45 @@ from CybORG.Simulator.Session import VelociraptorServer, RedAbstractSession, Ses
 from CybORG.Simulator.User import User
 
 
+def listening_ports(process: Process) -> list:
+    """Local ports of the connections of a process that have no remote end"""
+    return list(dict.fromkeys(conn['local_port'] for conn in process.connections
+                              if 'local_port' in conn and 'remote_port' not in conn and 'remote_address' not in conn))
+
+
+def file_location(file: File) -> tuple:
+    return (file.name, file.path),
+
+
+class ProcessList(IndexedList):
+    """Processes of a host indexed by pid and by listening port.
+
+    Keeps the highest pid ever added in last_pid, so pids allocated above it are never reused,
+    even when the process holding the highest pid is removed.
+    """
+
+    def __init__(self, items=(), last_pid: int = 0):
+        self.last_pid = last_pid
+        super().__init__({'pid': Attribute('pid'), 'port': listening_ports}, items)
+
+    def __reduce__(self):
+        return self.__class__, (list(self), self.last_pid)
+
+    def _add(self, item):
+        super()._add(item)
+        if item.pid is not None and item.pid > self.last_pid:
+            self.last_pid = item.pid
+
+
 class Host(Entity):
     """Simulates a host.
 
     This class simulates the internals of a host, including files, processes and interfaces.
     The methods are used to change the state of the host.
+
+    processes, users and files are lists that keep dict indexes of their items, so they can be
+    changed as lists while get_process, get_user, get_file and get_listening_processes are dict
+    lookups. Assigning a plain list to them builds its indexes.
     """
 
     def __init__(self, np_random, system_info: dict, hostname: str = None, users: dict = None,
@@ -99,6 +134,31 @@ class Host(Entity):
         self.np_random = np_random
 
 
+    @property
+    def processes(self) -> ProcessList:
+        return self._processes
+
+    @processes.setter
+    def processes(self, processes: list):
+        last_pid = self._processes.last_pid if hasattr(self, '_processes') else 0
+        self._processes = ProcessList(processes, last_pid)
+
+    @property
+    def users(self) -> IndexedList:
+        return self._users
+
+    @users.setter
+    def users(self, users: list):
+        self._users = IndexedList({'username': Attribute('username')}, users)
+
+    @property
+    def files(self) -> IndexedList:
+        return self._files
+
+    @files.setter
+    def files(self, files: list):
+        self._files = IndexedList({'name': Attribute('name'), 'location': file_location}, files)
+
     def get_state(self):
         observation = {"os_type": self.os_type, "os_distribution": self.distribution, "os_version": self.version,
                        "os_patches": self.patches, "os_kernel": self.kernel, "hostname": self.hostname,
@@ -141,10 +201,7 @@ class Host(Entity):
                     program: str = None, process_type: str = None, version: str = None, open_ports: list = None,
                     decoy_type: DecoyType = DecoyType.NONE, connections=None, properties: Optional[List[str]] = None):
         if pid is None:
-            pids = []
-            for process in self.processes:
-                pids.append(process.pid)
-            pid = max(pids) + self.np_random.randint(1, 10)
+            pid = self.processes.last_pid + self.np_random.randint(1, 10)
         if type(open_ports) is dict:
             open_ports = [open_ports]
 
@@ -199,10 +256,7 @@ class Host(Entity):
         return new_user
 
     def get_user(self, username):
-        for user in self.users:
-            if username == user.username:
-                return user
-        return None
+        return self.users.get('username', username)
 
     def get_interface(self, name=None, cidr=None, ip_address=None, subnet_name=None):
         """A method to get an interface with a selected name, subnet, or IP Address"""
@@ -218,14 +272,16 @@ class Host(Entity):
                     return interface
 
     def get_process(self, pid):
-        for process in self.processes:
-            if process.pid == pid:
-                return process
+        return self.processes.get('pid', pid)
+
+    def get_listening_processes(self, port) -> list:
+        """Processes with a connection listening on the local port, in the order they were started"""
+        return self.processes.get_all('port', port)
 
     def get_file(self, name, path=None):
-        for file in self.files:
-            if file.name == name and (not path or file.path == path):
-                return file
+        if path:
+            return self.files.get('location', (name, path))
+        return self.files.get('name', name)
 
     def disable_user(self, username):
         user = self.get_user(username)
@@ -247,7 +303,7 @@ class Host(Entity):
                 self.services[service_name]['active'] = True
                 p = self.services[service_name]['process']
                 p.pid = None
-                process = self.add_process(**p.__dict__)
+                process = self.add_process(**p.serialize())
                 self.services[service_name]['process'] = process
                 return process, self.services[service_name]['session']
             else:
@@ -0,0 +1,118 @@
+class Attribute:
+    """Keys function of IndexedList that indexes an item by one of its attributes"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __call__(self, item) -> tuple:
+        return getattr(item, self.name),
+
+
+class IndexedList(list):
+    """List that keeps dict indexes from keys of its items to the items with that key, in list order.
+
+    Every change made through the list methods updates the indexes, so the list can still be used
+    and modified as a plain list. Each index is given as a keys function returning the keys of an
+    item, so an item may be indexed under several keys or none. Keys are read when an item is
+    added, so changing the keys of an item in the list requires a call to reindex.
+    Keys functions must be picklable, e.g. Attribute or a module level function.
+    """
+
+    def __init__(self, indexes: dict, items=()):
+        super().__init__(items)
+        self.indexes = indexes
+        self._rebuild()
+
+    def __reduce__(self):
+        return self.__class__, (self.indexes, list(self))
+
+    def _rebuild(self):
+        self._lookup = {name: {} for name in self.indexes}
+        for item in self:
+            self._add(item)
+
+    def _add(self, item):
+        for name, keys in self.indexes.items():
+            lookup = self._lookup[name]
+            for key in keys(item):
+                lookup.setdefault(key, []).append(item)
+
+    def _discard(self, item):
+        for name, keys in self.indexes.items():
+            lookup = self._lookup[name]
+            for key in keys(item):
+                bucket = lookup.get(key, ())
+                for i, other in enumerate(bucket):
+                    if other is item:
+                        del bucket[i]
+                        if not bucket:
+                            del lookup[key]
+                        break
+
+    def reindex(self):
+        """Rebuilds the indexes, after the keys of items in the list were changed in place"""
+        self._rebuild()
+
+    def get(self, index: str, key, default=None):
+        """First item with the key in the index"""
+        bucket = self._lookup[index].get(key)
+        return bucket[0] if bucket else default
+
+    def get_all(self, index: str, key) -> list:
+        """Items with the key in the index, in list order"""
+        return list(self._lookup[index].get(key, ()))
+
+    def append(self, item):
+        super().append(item)
+        self._add(item)
+
+    def extend(self, items):
+        items = list(items)
+        super().extend(items)
+        for item in items:
+            self._add(item)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def remove(self, item):
+        i = self.index(item)
+        removed = self[i]
+        super().__delitem__(i)
+        self._discard(removed)
+
+    def pop(self, i=-1):
+        item = super().pop(i)
+        self._discard(item)
+        return item
+
+    def clear(self):
+        super().clear()
+        self._rebuild()
+
+    # changes that can reorder the list rebuild the indexes to keep the items of each key in list order
+    def insert(self, i, item):
+        super().insert(i, item)
+        self._rebuild()
+
+    def __setitem__(self, i, item):
+        super().__setitem__(i, item)
+        self._rebuild()
+
+    def __delitem__(self, i):
+        super().__delitem__(i)
+        self._rebuild()
+
+    def __imul__(self, n):
+        super().__imul__(n)
+        self._rebuild()
+        return self
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._rebuild()
+
+    def reverse(self):
+        super().reverse()
+        self._rebuild()
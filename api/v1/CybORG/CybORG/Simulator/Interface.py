@@ -5,6 +5,8 @@ from CybORG.Simulator.Entity import Entity
 
 
 class Interface(Entity):
+    __slots__ = ('name', 'interface_type', 'ip_address', 'subnet', 'data_links', 'max_range', 'blocked_ips', 'swarm')
+
     def __init__(self, name: str = None, ip_address: str = None, subnet: str = None, interface_type: str = 'wired', data_links: list = None, max_range: float = 100, swarm=False):
         super().__init__()
         self.name = name
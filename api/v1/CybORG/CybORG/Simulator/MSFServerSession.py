@@ -4,6 +4,7 @@ from CybORG.Simulator.Process import Process
 
 
 class MSFServerSession(Session):
+    __slots__ = ('routes',)
 
     def __init__(self, ident: str, hostname: str, user: str, agent: str,
                  process: Process, timeout: int = 0, session_type: str = 'msf server', name=None):
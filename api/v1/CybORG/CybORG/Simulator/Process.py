@@ -11,6 +11,9 @@ from CybORG.Simulator.User import User
 
 
 class Process(Entity):
+    __slots__ = ('name', 'pid', 'ppid', 'program', 'user', 'path', 'open_ports', 'decoy_type', 'connections',
+                 'properties', 'process_type', 'version', 'yaml_file_path')
+
     def __init__(self, process_name: str, pid: int, parent_pid: int, username: str, program_name: str = None,
                  path: str = None, open_ports: list = None, process_type: str = None, process_version: str = None,
                  decoy_type: DecoyType = DecoyType.NONE, properties: List[str] = None):
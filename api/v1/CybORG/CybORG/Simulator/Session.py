@@ -7,6 +7,8 @@ from CybORG.Simulator.Entity import Entity
 
 
 class Session(Entity):
+    __slots__ = ('ident', 'hostname', 'username', 'agent', 'timeout', 'pid', 'parent', 'session_type', 'active',
+                 'children', 'name', 'is_escalate_sandbox', 'user', 'ot_service')
 
     def __init__(self, ident: int, hostname: str, username: str, agent: str,
                  pid: int, timeout: int = 0, session_type: str = 'shell',
@@ -39,6 +41,7 @@ class Session(Entity):
 
 
 class RedAbstractSession(Session):
+    __slots__ = ('ports', 'operating_system')
     # a session that remembers previously seen information that can be used by actions
     def __init__(self, ident: int, hostname: str, username: str, agent: str,
                  pid: int, timeout: int = 0, session_type: str = 'shell', active: bool = True, parent=None, name=None):
@@ -60,6 +63,7 @@ class RedAbstractSession(Session):
         self.operating_system[hostname] = os
 
 class GreenAbstractSession(Session):
+    __slots__ = ('ports', 'operating_system')
     # Currently a clone of RedAbstractSession
     # a session that remembers previously seen information that can be used by actions
     def __init__(self, ident: int, hostname: str, username: str, agent: str,
@@ -79,6 +83,7 @@ class GreenAbstractSession(Session):
         self.operating_system[hostname] = os
 
 class VelociraptorServer(Session):
+    __slots__ = ('artifacts', 'sus_pids', 'sus_files')
     # a session that remembers previously seen information that can be used by actions
     def __init__(self, ident: int, hostname: str, username: str, agent: str,
                  pid: int, timeout: int = 0, session_type: str = 'shell', active: bool = True, parent=None, name=None,
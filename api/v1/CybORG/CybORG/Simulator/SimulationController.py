@@ -1,14 +1,18 @@
 # Copyright DST Group. Licensed under the MIT license.
+import pickle
+import zlib
 
-
-from CybORG.Shared import Scenario
+from CybORG.Shared import Scenario, CybORGTrace, CybORGProfiler
 from CybORG.Simulator.Actions.Action import Action, RemoteAction
 from CybORG.Shared.EnvironmentController import EnvironmentController
 from CybORG.Shared.Observation import Observation
 from CybORG.Shared.RewardCalculator import RewardCalculator
 from CybORG.Shared.Scenarios.ScenarioGenerator import ScenarioGenerator
+from CybORG.Shared.StepProfiler import ACTION_SECONDS
 from CybORG.Simulator.State import State
 
+_trace = CybORGTrace.get('simulation')
+
 
 class SimulationController(EnvironmentController):
     """The class that controls the Simulation environment.
@@ -17,6 +21,9 @@ class SimulationController(EnvironmentController):
     Most methods are either disabled or delegate their functionality to the State attribute.
     The main thing this class currently does is parse the scenario file.
     """
+    # attributes that snapshots leave out and forks share
+    SHARED_ATTRIBUTES = ('scenario_generator',)
+
     def __init__(self, scenario_generator: ScenarioGenerator, agents, np_random):
         self.state = None
         self.bandwidth_usage = {}
@@ -43,11 +50,18 @@ class SimulationController(EnvironmentController):
         -------
         None
         """
-        print('In SimulationController script')
+        timer = CybORGProfiler.timer()
         super(SimulationController, self).step(actions, skip_valid_action_check)
+        # the phases of the step above are recorded by EnvironmentController.step
+        timer.skip()
         for host in self.state.hosts.values():
             host.update(self.state)
+        timer.lap('update_hosts')
         self.state.update_data_links()
+        timer.lap('update_data_links')
+        timer.finish(step=True)
+        if _trace.enabled:
+            _trace.event('end_of_step', step=self.step_count, state_version=self.state.version)
 
     def pause(self):
         pass
@@ -57,20 +71,49 @@ class SimulationController(EnvironmentController):
         self.state.set_np_random(np_random)
 
     def execute_action(self, action: Action) -> Observation:
-        print('In simcontroller execute action')
-        print('action is:',action, 'its type is:', type(action))
-        return action.execute(self.state)
+        if _trace.enabled:
+            _trace.event('execute_action', action=action, action_type=type(action).__name__)
+        timer = CybORGProfiler.timer()
+        observation = action.execute(self.state)
+        timer.record(ACTION_SECONDS, action=type(action).__name__)
+        # actions modify hosts and sessions directly rather than through State
+        self.state.bump_version()
+        return observation
+
+    def snapshot(self) -> bytes:
+        """Captures the state, agent interfaces, reward calculators and random number generator as a pickle.
+
+        The scenario generator is not part of the snapshot, it is shared with every environment restored from it.
+        """
+        game = {key: value for key, value in self.__dict__.items() if key not in self.SHARED_ATTRIBUTES}
+        return pickle.dumps(game, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def restore_snapshot(self, snapshot: bytes):
+        self.__dict__.update(pickle.loads(snapshot))
+
+    def fork(self) -> 'SimulationController':
+        clone = type(self).__new__(type(self))
+        clone.__dict__.update({key: self.__dict__[key] for key in self.SHARED_ATTRIBUTES})
+        clone.restore_snapshot(self.snapshot())
+        return clone
 
     def restore(self, file: str):
-        pass
+        """Restores a snapshot written by save. The controller must use the same scenario generator."""
+        with open(file, 'rb') as f:
+            self.restore_snapshot(zlib.decompress(f.read()))
 
     def save(self, file: str):
-        pass
+        with open(file, 'wb') as f:
+            f.write(zlib.compress(self.snapshot()))
 
     def get_true_state(self, info: dict) -> Observation:
         output = self.state.get_true_state(info)
         return output
 
+    def get_cached_agent_state(self, agent_name: str, filtered: bool = True) -> Observation:
+        build = super(SimulationController, self).get_cached_agent_state
+        return self.state.memoise(('agent_state', agent_name, filtered), lambda: build(agent_name, filtered))
+
     def shutdown(self, **kwargs):
         pass
 
@@ -6,7 +6,8 @@ from ipaddress import IPv4Address
 from math import sqrt
 
 import networkx as nx
-from networkx import connected_components
+import numpy as np
+from networkx import connected_components, shortest_path, NetworkXNoPath
 
 from CybORG.Shared import Scenario, CybORGLogger
 from CybORG.Shared.Enums import SessionType
@@ -17,6 +18,13 @@ from CybORG.Simulator.Process import Process
 from CybORG.Simulator.Session import Session
 from CybORG.Simulator.Subnet import Subnet
 
+# events sent to the listeners registered with State.subscribe, always with the name of the affected host
+SESSION_CREATED = 'session_created'
+SESSION_REMOVED = 'session_removed'
+SESSION_CHANGED = 'session_changed'  # e.g. the user of the session was escalated
+PROCESS_KILLED = 'process_killed'
+PROCESS_STARTED = 'process_started'
+
 
 class State(CybORGLogger):
     """
@@ -33,12 +41,23 @@ class State(CybORGLogger):
 
         self.hosts = None  # contains mapping of hostnames to host objects
         self.sessions = None  # contains mapping of agent names to mapping of session id to session objects
+        self.pid_sessions = None  # contains mapping of (hostname, pid) to the (agent name, session id) of its sessions
         self.subnets = None  # contains mapping of subnet cidrs to subnet objects
 
         self.link_diagram = None
         self.connected_components = None
+        # derived from link_diagram and refreshed by link_diagram_changed
+        self._component_index = {}
+        self._routes = {}
 
         self.sessions_count = {}  # contains a mapping of agent name to number of sessions
+
+        # incremented on every mutation of the state, see bump_version and memoise
+        self.version = 0
+        self._memo = {}
+        self._memo_version = 0
+        self.listeners = []
+
         self._initialise_state(scenario)
         self.step = 0
         self.original_time = datetime(2020, 1, 1, 0, 0)
@@ -52,7 +71,7 @@ class State(CybORGLogger):
         true_obs = Observation()
         if info is None:
             raise ValueError('None is not a valid argument for the get true state function in the State class')
-        else:
+        with true_obs.building():
             for hostname, host in self.hosts.items():
                 if hostname in info:
                     if 'Processes' in info[hostname]:
@@ -110,6 +129,7 @@ class State(CybORGLogger):
 
         self.hosts = {}  # contains mapping of hostnames to host objects
         self.sessions = {}  # contains mapping of agent names to mapping of session id to session objects
+        self.pid_sessions = {}  # contains mapping of (hostname, pid) to the (agent name, session id) of its sessions
         self.subnets = {}  # contains mapping of subnet cidrs to subnet objects
 
         self.sessions_count = {}  # contains a mapping of agent name to number of sessions
@@ -151,6 +171,7 @@ class State(CybORGLogger):
                         ident=self.sessions_count[agent],
                         name=starting_session.name,
                         artifacts=starting_session.event_artifacts)
+                    self.index_session(agent, self.sessions[agent][self.sessions_count[agent]])
                     self.sessions_count[agent] += 1
             for starting_session in agent_info.starting_sessions:
                 if starting_session.parent is not None:
@@ -169,6 +190,7 @@ class State(CybORGLogger):
                         name=starting_session.name,
                         artifacts=starting_session.event_artifacts)
                     parent.children[self.sessions_count[agent]] = self.sessions[agent][self.sessions_count[agent]]
+                    self.index_session(agent, self.sessions[agent][self.sessions_count[agent]])
                     self.sessions_count[agent] += 1
 
         for host in self.hosts.values():
@@ -182,6 +204,49 @@ class State(CybORGLogger):
         # add datalink connections between hosts
         self.setup_data_links()
 
+    def __getstate__(self):
+        # memoised values are rebuilt on demand rather than carried into copies
+        state = self.__dict__.copy()
+        state['_memo'] = {}
+        return state
+
+    def bump_version(self):
+        """Marks the state as changed, invalidating every value memoised for the previous version.
+
+        The State methods below call this themselves. Code that modifies hosts, processes or
+        sessions directly (e.g. Action.execute) must call it afterwards.
+        """
+        self.version += 1
+
+    def memoise(self, key, build):
+        """Returns build(), computed at most once per state version and key.
+
+        The result is shared by every caller until the next mutation so it must be treated as read only.
+        """
+        if self._memo_version != self.version:
+            self._memo = {}
+            self._memo_version = self.version
+        if key not in self._memo:
+            self._memo[key] = build()
+        return self._memo[key]
+
+    def subscribe(self, listener):
+        """Registers listener(event, hostname) to be called on every session or process change"""
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def emit(self, event: str, hostname: str):
+        """Notifies the listeners of a change to hostname.
+
+        The State methods below emit their own events. Code that adds or removes sessions or
+        processes directly on a Host must emit the matching event itself.
+        """
+        for listener in self.listeners:
+            listener(event, hostname)
+
     def setup_data_links(self):
         # add datalink connections between hosts
         for hostname, host_info in self.hosts.items():
@@ -200,29 +265,88 @@ class State(CybORGLogger):
     def dist(pos_a, pos_b):
         return sqrt((pos_a[0]-pos_b[0])**2+(pos_a[1]-pos_b[1])**2)
 
-    def update_data_links(self):
-        distances = {hostname: {hostname: 0.} for hostname in self.hosts.keys()}
-        for hostname, host_info in self.hosts.items():
-            for hostname2, host_info2 in self.hosts.items():
-                if hostname2 not in distances[hostname]:
-                    distances[hostname][hostname2] = self.dist(host_info.position, host_info2.position)
-                    distances[hostname2][hostname] = distances[hostname][hostname2]
+    def link_diagram_changed(self):
+        """Recomputes the connected components and clears the cached routes.
 
-        for hostname, host_info in self.hosts.items():
-            for interface in host_info.interfaces:
-                if interface.interface_type != 'wired':
-                    old_data_links = interface.data_links
-                    interface.data_links = [other_hostname for other_hostname, other_host_info in self.hosts.items() if distances[hostname][other_hostname] < interface.max_range]
-                    for dl in old_data_links:
-                        if dl not in interface.data_links:
-                            self.link_diagram.remove_edge(hostname, dl)
-                        for interface2 in self.hosts[dl].interfaces:
-                            if hostname in interface2.data_links:
-                                interface2.data_links.remove(hostname)
-                    for dl in interface.data_links:
-                        if dl not in old_data_links:
-                            self.link_diagram.add_edge(hostname, dl)
+        Must be called whenever nodes or edges are added to or removed from link_diagram.
+        """
         self.connected_components = [i for i in connected_components(self.link_diagram)]
+        self._component_index = {hostname: i for i, component in enumerate(self.connected_components)
+                                 for hostname in component}
+        self._routes = {}
+
+    def get_route(self, source: str, target: str) -> list:
+        """Shortest list of hostnames from source to target, or None if there is no route.
+
+        Routes are cached until the link diagram changes and must not be modified by the caller.
+        """
+        key = (source, target)
+        if key not in self._routes:
+            try:
+                self._routes[key] = shortest_path(self.link_diagram, source=source, target=target)
+            except NetworkXNoPath:
+                self._routes[key] = None
+        return self._routes[key]
+
+    def is_routable(self, source: str, target: str) -> bool:
+        """Checks if source and target are in the same connected component, None if source is not in the link diagram"""
+        component = self._component_index.get(source)
+        if component is None:
+            return None
+        return self._component_index.get(target) == component
+
+    def update_data_links(self):
+        """Relinks every wireless interface to the hosts within its max_range.
+
+        Pairwise distances are computed in one go from the stacked host positions. Link
+        membership is tracked in sets and links dropped from other interfaces are only
+        filtered out of their lists once at the end, so the update is linear in the number
+        of links rather than scanning and editing lists for every old link.
+        """
+        wireless = [(row, hostname, interface) for row, (hostname, host_info) in enumerate(self.hosts.items())
+                    for interface in host_info.interfaces if interface.interface_type != 'wired']
+        changed = False
+        if wireless:
+            hostnames = list(self.hosts.keys())
+            positions = np.array([host_info.position for host_info in self.hosts.values()], dtype=float)
+            offsets = positions[:, None, :] - positions[None, :, :]
+            distances = np.sqrt((offsets ** 2).sum(axis=-1))
+            # id(interface) -> (interface, links in its current list, links removed from that list since)
+            links = {}
+
+            def get_links(iface):
+                if id(iface) not in links:
+                    links[id(iface)] = (iface, set(iface.data_links), set())
+                return links[id(iface)]
+
+            for row, hostname, interface in wireless:
+                _, current, removed = get_links(interface)
+                old_data_links = [dl for dl in interface.data_links if dl not in removed]
+                old_set = set(old_data_links)
+                interface.data_links = [hostnames[i] for i in np.flatnonzero(distances[row] < interface.max_range)]
+                new_set = set(interface.data_links)
+                removed = set()
+                links[id(interface)] = (interface, new_set, removed)
+                for dl in old_data_links:
+                    if dl not in new_set:
+                        self.link_diagram.remove_edge(hostname, dl)
+                        changed = True
+                    # the other end drops its link back to this host, it is re-added when that host is updated
+                    for interface2 in self.hosts[dl].interfaces:
+                        _, current2, removed2 = get_links(interface2)
+                        if hostname in current2:
+                            removed2.add(hostname)
+                for dl in interface.data_links:
+                    if dl not in removed and dl not in old_set and not self.link_diagram.has_edge(hostname, dl):
+                        self.link_diagram.add_edge(hostname, dl)
+                        changed = True
+            for interface, _, removed in links.values():
+                if removed:
+                    interface.data_links = [dl for dl in interface.data_links if dl not in removed]
+        if changed or self.connected_components is None:
+            self.link_diagram_changed()
+        if changed:
+            self.bump_version()
 
     def add_session(self, host: str, user: str, agent: str, parent: int, process=None, session_type: str = "shell",
             timeout: int = 0, is_escalate_sandbox: bool = False, ident: int = None) -> Session:
@@ -237,60 +361,94 @@ class State(CybORGLogger):
                                                    session_type=session_type, agent=agent, parent=parent,
                                                    is_escalate_sandbox=is_escalate_sandbox)
         self.sessions[agent][ident] = new_session
+        self.index_session(agent, new_session)
         if parent is not None:
             self.sessions[agent][parent].children[new_session.ident] = new_session
+        self.bump_version()
+        self.emit(SESSION_CREATED, host)
         return new_session
 
+    def index_session(self, agent: str, session: Session):
+        """Adds a session of self.sessions to the (hostname, pid) index used by get_session_from_pid.
+
+        add_session and remove_session keep the index up to date. Code that moves a session
+        within self.sessions, or changes its ident, must unindex it before and index it after.
+        """
+        self.pid_sessions.setdefault((session.hostname, session.pid), {})[(agent, session.ident)] = None
+
+    def unindex_session(self, agent: str, session: Session):
+        key = (session.hostname, session.pid)
+        entries = self.pid_sessions.get(key)
+        if entries is not None:
+            entries.pop((agent, session.ident), None)
+            if not entries:
+                del self.pid_sessions[key]
+
+    def remove_session(self, agent: str, ident: int) -> Session:
+        """Removes a session from self.sessions, its host and the pid index, and returns it"""
+        session = self.sessions[agent].pop(ident)
+        self.unindex_session(agent, session)
+        host_sessions = self.hosts[session.hostname].sessions.get(agent)
+        if host_sessions is not None and ident in host_sessions:
+            host_sessions.remove(ident)
+        return session
+
     def add_file(self, host: str, name: str, path: str, user: str = None, user_permissions: str = None,
                  group: str = None, group_permissions: int = None, default_permissions: int = None):
         host = self.hosts[host]
+        self.bump_version()
         return host.add_file(name, path, user, user_permissions, group, group_permissions, default_permissions)
 
     def add_user(self, host: str = None, username: str = None, password: str = None, password_hash_type: str = None):
         host = self.hosts[host]
+        self.bump_version()
         return host.add_user(username=username, password=password, password_hash_type=password_hash_type)
 
     def remove_process(self, hostname: str, pid: int):
         host = self.hosts[hostname]
         process = host.get_process(pid)
         if process is not None:
+            self.bump_version()
             agent, session = self.get_session_from_pid(hostname=hostname, pid=pid)
             host.processes.remove(process)
             if process.pid in [i['process'] for i in host.services.values() if i['active']]:
                 process.pid = None
-                host.add_process(**process.__dict__)
+                host.add_process(**process.serialize())
                 service = True
             else:
                 service = False
+            self.emit(PROCESS_KILLED, hostname)
             if session is not None:
-                host.sessions[agent].remove(session)
-                session = self.sessions[agent].pop(session)
+                session = self.remove_session(agent, session)
+                self.emit(SESSION_REMOVED, hostname)
                 if service:
                     session_reloaded = self.add_session(host=host.hostname, user=session.user,
                                                         session_type=session.session_type, agent=session.agent,
                                                         parent=session.parent, timeout=session.timeout)
 
     def get_session_from_pid(self, hostname, pid):
-        for agent, sessions in self.sessions.items():
-            for session in sessions:
-                if self.sessions[agent][session].pid == pid and self.sessions[agent][session].hostname == hostname:
-                    return agent, session
+        for agent, ident in self.pid_sessions.get((hostname, pid), ()):
+            session = self.sessions.get(agent, {}).get(ident)
+            if session is not None and session.pid == pid and session.hostname == hostname:
+                return agent, ident
         return None, None
 
     def kill_process(self, host: str, pid: int):
         host = self.hosts[host]
         process = host.get_process(pid)
-        session, agent = host.get_session(pid=pid)
+        agent, session = self.get_session_from_pid(hostname=host.hostname, pid=pid)
+        self.bump_version()
         host.processes.remove(process)
         if pid in [i['process'].pid for i in host.services.values()]:
             process.pid = None
-            host.add_process(**process.__dict__)
+            host.add_process(**process.serialize())
             service = True
         else:
             service = False
+        self.emit(PROCESS_KILLED, host.hostname)
         if session is not None:
-            host.sessions[agent].remove(session)
-            self.sessions[agent].pop(session.ident)
+            session = self.remove_session(agent, session)
+            self.emit(SESSION_REMOVED, host.hostname)
         if service:
             session_reloaded = self.add_session(host=host.hostname, user=session.user,
                                                 session_type=session.session_type, agent=session.agent,
@@ -299,12 +457,15 @@ class State(CybORGLogger):
 
     def reboot_host(self, hostname):
         host = self.hosts[hostname]
+        self.bump_version()
         for agent, sessions in host.sessions.items():
+            servers = [other_session for other_session in self.sessions[agent].values()
+                       if other_session.session_type == SessionType.MSF_SERVER]
             for session in sessions:
-                self.sessions[agent].pop(session)
-                for other_session in self.sessions[agent].values():
-                    if other_session.session_type == SessionType.MSF_SERVER and session in other_session.routes:
-                        other_session.routes.pop(session)
+                self.unindex_session(agent, self.sessions[agent].pop(session))
+                for server in servers:
+                    if session in server.routes:
+                        server.routes.pop(session)
         host.sessions = {}
         host.processes = []
         for file in host.files:
@@ -318,6 +479,9 @@ class State(CybORGLogger):
                 Process(pid=process.get('PID'), parent_pid=process.get('PPID'), username=process.get('user'),
                         process_name=process.get('Process Name'), path=process.get('Path'),
                         open_ports=process.get('Connections')))
+        self.emit(SESSION_REMOVED, hostname)
+        self.emit(PROCESS_KILLED, hostname)
+        self.emit(PROCESS_STARTED, hostname)
 
         for servicename, service in host.services.items():
             if service['active']:
@@ -326,11 +490,14 @@ class State(CybORGLogger):
     def stop_service(self, hostname: str, service_name: str):
         # stops a service, its process, and associated sessions
         process = self.hosts[hostname].stop_service(service_name)
+        self.bump_version()
         self.remove_process(hostname, process)
 
     def start_service(self, hostname: str, service_name: str):
         # stops a service, its process, and associated sessions
         process, session = self.hosts[hostname].start_service(service_name)
+        self.bump_version()
+        self.emit(PROCESS_STARTED, hostname)
         if session is not None:
             self.add_session(host=hostname, process=process, user=session.user, session_type=session.session_type,
                              agent=session.agent, parent=session.parent, timeout=session.timeout)
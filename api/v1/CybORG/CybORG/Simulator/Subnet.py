@@ -4,6 +4,8 @@ from ipaddress import IPv4Network
 
 
 class Subnet(Entity):
+    __slots__ = ('cidr', 'ip_addresses', 'nacls', 'name')
+
     def __init__(self, cidr: IPv4Network = None, ip_addresses: list = None, nacls: dict = None, name: str = None):
         super().__init__()
         self.cidr = cidr
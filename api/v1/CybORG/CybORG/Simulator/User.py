@@ -6,6 +6,9 @@ from CybORG.Simulator.LocalGroup import LocalGroup
 
 
 class User(Entity):
+    __slots__ = ('username', 'password', 'password_hash', 'bruteforceable', 'password_hash_type', 'groups',
+                 'logged_in', 'uid', 'disabled')
+
     def __init__(self, username: str, uid: int, password: str = None, password_hash: str = None,
                  password_hash_type: str = None, groups: list = None,
                  logged_in: bool = None, bruteforceable: bool = False):
@@ -0,0 +1,23 @@
+import inspect
+
+import pytest
+
+from CybORG import CybORG
+from CybORG.Agents import B_lineAgent, RedMeanderAgent, BlueReactRestoreAgent, BlueReactRemoveAgent, SleepAgent
+from CybORG.Shared.RewardCalculator import IncrementalRewardCalculator
+from CybORG.Simulator.Scenarios.FileReaderScenarioGenerator import FileReaderScenarioGenerator
+
+
+@pytest.mark.parametrize('red_agent', [B_lineAgent, RedMeanderAgent])
+@pytest.mark.parametrize('blue_agent', [BlueReactRestoreAgent, BlueReactRemoveAgent, SleepAgent])
+def test_incremental_reward_matches_rescan(monkeypatch, red_agent, blue_agent):
+    # in verify mode every incremental reward is asserted against a full rescan of the true state
+    monkeypatch.setattr(IncrementalRewardCalculator, 'verify', True)
+    path = str(inspect.getfile(CybORG))
+    path = path[:-7] + f'/Simulator/Scenarios/scenario_files/Scenario2.yaml'
+    sg = FileReaderScenarioGenerator(path)
+    cyborg = CybORG(scenario_generator=sg, agents={'Red': red_agent(), 'Blue': blue_agent()}, seed=1)
+    for episode in range(2):
+        cyborg.reset()
+        for step in range(30):
+            cyborg.step()
@@ -0,0 +1,106 @@
+import pytest
+
+from CybORG.CyborgAAS.Runner.GameWorkerPool import GameWorkerPool
+
+
+def game_kwargs(num_steps=10):
+    return dict(num_steps=num_steps, wrapper_type='simple', red_agent_type='B_lineAgent', blue_agent_type='BlueReactRemoveAgent')
+
+
+@pytest.fixture(scope='module')
+def pool():
+    pool = GameWorkerPool(num_workers=2)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def test_closing_stream_keeps_executed_steps(pool):
+    pool.create_game('cancelled', **game_kwargs())
+    steps = pool.iter_steps('cancelled')
+    received = [next(steps), next(steps)]
+    remaining = steps.close()
+    received += remaining
+    # the worker stops soon after the cancel instead of running the whole game
+    assert len(received) < 10
+    assert [state['current_step'] for state in received] == list(range(1, len(received) + 1))
+    assert all(state['state_snapshot'] for state in remaining)
+    # the worker is free again and the game carries on from the last executed step
+    assert pool.run_next_step('cancelled')['current_step'] == len(received) + 1
+    assert steps.close() == []
+    pool.end_game('cancelled')
+
+
+def test_exhausted_stream(pool):
+    pool.create_game('streamed', **game_kwargs(num_steps=3))
+    steps = pool.iter_steps('streamed')
+    assert [state['current_step'] for state in steps] == [1, 2, 3]
+    assert steps.close() == []
+    assert pool.iter_steps('streamed', 5).close() == []
+    assert list(pool.iter_steps('streamed', 5)) == []
+    pool.end_game('streamed')
+
+
+def test_games_go_to_least_loaded_worker(pool):
+    for game_id in ['a', 'b', 'c']:
+        keyframe = pool.create_game(game_id, **game_kwargs())
+        assert keyframe['current_step'] == 0
+        assert all(snapshot['keyframe'] for snapshot in keyframe['state_snapshot'].values())
+    assert sorted(pool.load().values()) == [1, 2]
+    assert pool.game_to_worker['a'] is pool.game_to_worker['c'] is not pool.game_to_worker['b']
+    pool.end_game('a')
+    assert sorted(pool.load().values()) == [1, 1]
+    pool.create_game('d', **game_kwargs())
+    assert sorted(pool.load().values()) == [1, 2]
+    for game_id in ['b', 'c', 'd']:
+        pool.end_game(game_id)
+    assert pool.load() == {worker.process.pid: 0 for worker in pool.workers}
+
+
+def test_failed_create_is_forgotten(pool):
+    # the game state collector cannot read the state of a wrapped environment
+    with pytest.raises(RuntimeError):
+        pool.create_game('wrapped', **dict(game_kwargs(), wrapper_type='wrap'))
+    assert not pool.has_game('wrapped')
+    assert sum(pool.load().values()) == 0
+
+
+def test_worker_errors_are_raised(pool):
+    pool.create_game('game', **game_kwargs())
+    with pytest.raises(RuntimeError, match='ValueError'):
+        pool.run_steps('game', 0)
+    with pytest.raises(RuntimeError, match='Unknown worker command'):
+        pool._get_worker('game').call('jump', 'game')
+    # the worker keeps serving after a failed command
+    assert pool.run_steps('game', 2)['current_step'] == 2
+    assert pool.run_next_step('game')['current_step'] == 3
+    assert pool.run_steps('game')['done']
+
+
+def test_end_game(pool):
+    pool.create_game('ended', **game_kwargs())
+    worker = pool.game_to_worker['ended']
+    pool.end_game('ended')
+    assert not pool.has_game('ended') and 'ended' not in worker.games
+    with pytest.raises(KeyError):
+        pool.run_next_step('ended')
+    with pytest.raises(KeyError):
+        pool.end_game('ended')
+    # the worker no longer hosts the game either
+    with pytest.raises(RuntimeError, match='KeyError'):
+        worker.call('step', 'ended')
+
+
+def test_metrics(monkeypatch):
+    # the workers read CYBORG_PROFILE when they import CybORG
+    monkeypatch.setenv('CYBORG_PROFILE', '1')
+    pool = GameWorkerPool(num_workers=1)
+    pool.start()
+    try:
+        assert pool.metrics() == []
+        pool.create_game('profiled', **game_kwargs())
+        pool.run_steps('profiled', 3)
+        steps = [data for data in pool.metrics() if data['name'] == 'cyborg_step_seconds']
+        assert steps[0]['count'] == 3
+    finally:
+        pool.shutdown()
@@ -0,0 +1,45 @@
+import pytest
+
+from CybORG.CyborgAAS.Runner.SimpleAgentRunner import SimpleAgentRunner
+
+
+@pytest.fixture()
+def runner():
+    runner = SimpleAgentRunner(num_steps=5, wrapper_type='simple', red_agent_type='B_lineAgent', blue_agent_type='BlueReactRemoveAgent')
+    runner.configure()
+    return runner
+
+
+def test_step_command(runner):
+    reply = runner.handle_command({'command': 'step', 'count': 2})
+    assert [state['current_step'] for state in reply['states']] == [1, 2]
+    assert reply['current_step'] == 2 and not reply['done']
+    # count defaults to a single step and the command to 'step'
+    assert runner.handle_command({})['current_step'] == 3
+    # a count past the end of the game stops at the last step
+    reply = runner.handle_command({'command': 'step', 'count': 10})
+    assert [state['current_step'] for state in reply['states']] == [4, 5]
+    assert reply['done']
+    assert runner.handle_command({'command': 'run'}) == {'states': [], 'current_step': 5, 'done': True}
+
+
+def test_run_command(runner):
+    reply = runner.handle_command({'command': 'run'})
+    assert len(reply['states']) == 5 and reply['done']
+
+
+@pytest.mark.parametrize('command', [5, 'Next Step', None, [], {'count': None}, {'count': '2'}, {'count': 0},
+                                     {'count': -1}, {'count': 1.5}, {'count': True}, {'command': 'jump'}])
+def test_invalid_commands(runner, command):
+    with pytest.raises(ValueError):
+        runner.handle_command(command)
+    assert runner.current_step == 0
+
+
+def test_iter_steps_limits(runner):
+    assert [state['current_step'] for state in runner.iter_steps(2)] == [1, 2]
+    assert list(runner.iter_steps(0)) == []
+    assert list(runner.iter_steps(-3)) == []
+    assert [state['current_step'] for state in runner.iter_steps()] == [3, 4, 5]
+    assert list(runner.iter_steps()) == []
+    assert runner.run_next_step() is None
@@ -0,0 +1,58 @@
+import copy
+import pickle
+
+import pytest
+
+from CybORG.Simulator.File import File
+from CybORG.Simulator.Interface import Interface
+from CybORG.Simulator.MSFServerSession import MSFServerSession
+from CybORG.Simulator.Process import Process
+from CybORG.Simulator.Session import Session, RedAbstractSession, VelociraptorServer
+from CybORG.Simulator.Subnet import Subnet
+from CybORG.Simulator.User import User
+
+
+ENTITIES = [
+    lambda: Process(process_name='sshd', pid=1, parent_pid=0, username='root',
+                    open_ports=[{'local_port': 22, 'local_address': '0.0.0.0'}]),
+    lambda: Session(ident=0, hostname='User0', username='root', agent='Red', pid=1),
+    lambda: RedAbstractSession(ident=0, hostname='User0', username='root', agent='Red', pid=1),
+    lambda: VelociraptorServer(ident=0, hostname='User0', username='root', agent='Blue', pid=1, artifacts=['a']),
+    lambda: MSFServerSession(ident=0, hostname='User0', user='root', agent='Red', process=1),
+    lambda: Interface(name='eth0', ip_address='10.0.0.1', subnet='10.0.0.0/24'),
+    lambda: File(name='cmd.sh', path='/tmp/', user='root'),
+    lambda: User(username='root', uid=0, groups=[{'Group Name': 'root', 'GID': 0}]),
+    lambda: Subnet(name='User'),
+]
+
+
+@pytest.mark.parametrize('create', ENTITIES)
+def test_entity_is_slotted(create):
+    entity = create()
+    assert not hasattr(entity, '__dict__')
+    with pytest.raises(AttributeError):
+        entity.not_an_attribute = 1
+
+
+@pytest.mark.parametrize('create', ENTITIES)
+def test_entity_copy_and_serialize(create):
+    entity = create()
+    state = entity.serialize()
+    assert state
+    for clone in (entity.copy(), copy.deepcopy(entity), pickle.loads(pickle.dumps(entity))):
+        assert type(clone) is type(entity)
+        assert clone.serialize().keys() == state.keys()
+        assert clone.get_state() == entity.get_state()
+    clone = entity.copy()
+    for name, value in state.items():
+        if type(value) in (list, dict, set):
+            assert getattr(clone, name) is not value
+        else:
+            assert getattr(clone, name) is value
+
+
+def test_unset_attributes_are_not_serialized():
+    process = ENTITIES[0]()
+    assert 'yaml_file_path' not in process.serialize()
+    process.yaml_file_path = '/tmp/'
+    assert process.serialize()['yaml_file_path'] == '/tmp/'
@@ -0,0 +1,97 @@
+import json
+from copy import deepcopy
+
+import pytest
+
+from CybORG.CyborgAAS.Runner.SimpleAgentRunner import SimpleAgentRunner
+from CybORG.GameVisualizer.GameStateCollector.delta import apply_delta, apply_snapshot, make_delta, reconstruct_snapshot
+
+
+def view(**kwargs):
+    view = {
+        'node_colors': ['green', 'green', 'green'],
+        'node_borders': ['black', 'black', 'black'],
+        'host_info': [{'host': 'a'}, {'host': 'b'}, {'host': 'c'}],
+        'link_diagram': {'nodes': ['a', 'b', 'c']},
+        'node_positions': [],
+        'compromised_hosts': [],
+        'host_map': {'a': '10.0.0.1'},
+        'action_info': {'action': '', 'success': None},
+    }
+    view.update(kwargs)
+    return view
+
+
+def json_round_trip(data):
+    return json.loads(json.dumps(data))
+
+
+def test_make_delta_holds_only_changes():
+    previous = view()
+    new = view(node_colors=['green', 'red', 'green'], compromised_hosts=['b'], action_info={'action': 'Exploit b', 'success': True})
+    delta = make_delta(previous, new)
+    assert delta == {'keyframe': False, 'action_info': new['action_info'], 'node_colors': {1: 'red'}, 'compromised_hosts': ['b']}
+    assert apply_delta(deepcopy(previous), json_round_trip(delta)) == new
+
+
+def test_delta_when_nodes_are_added():
+    previous = view()
+    new = view(node_colors=['green', 'green', 'green', 'red'], host_info=[{'host': 'a'}, {'host': 'b'}])
+    delta = json_round_trip(make_delta(previous, new))
+    assert apply_delta(deepcopy(previous), delta)['node_colors'] == new['node_colors']
+    # a shorter list is sent in full, apply_delta only overwrites existing entries
+    assert delta['host_info'] == {'0': {'host': 'a'}, '1': {'host': 'b'}}
+
+
+def test_apply_snapshot_starts_from_keyframe():
+    keyframe = {'Blue': dict(view(), keyframe=True)}
+    full = apply_snapshot(None, keyframe)
+    assert full == keyframe and full['Blue'] is not keyframe['Blue']
+    new = view(node_borders=['black', 'black', 'red'])
+    full = apply_snapshot(full, {'Blue': make_delta(view(), new)})
+    assert full == {'Blue': dict(new, keyframe=True)}
+    # an empty snapshot, e.g. a game that was never started, changes nothing
+    assert apply_snapshot(full, {}) is full
+    assert reconstruct_snapshot([]) is None
+
+
+def test_scenario2_round_trip():
+    runner = SimpleAgentRunner(num_steps=30, wrapper_type='simple', red_agent_type='B_lineAgent', blue_agent_type='BlueReactRemoveAgent')
+    runner.configure()
+    # what is stored in the database, step 0 holds the keyframe
+    stored = [json_round_trip(runner.keyframe)]
+    expected = [json_round_trip(runner.keyframe)]
+    for state in runner.iter_steps():
+        assert all(not snapshot['keyframe'] for snapshot in state['state_snapshot'].values())
+        stored.append(json_round_trip(state['state_snapshot']))
+        expected.append(json_round_trip({agent: dict(view, keyframe=True) for agent, view in runner.game_state_manager.last_views.items()}))
+    assert len(stored) == 31
+    for step in [0, 1, 15, 30]:
+        assert reconstruct_snapshot(stored[:step + 1]) == expected[step]
+
+
+def sqlite_session(models):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    engine = create_engine('sqlite://')
+    models.Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def test_get_game_states_up_to():
+    # needs the FastAPI app dependencies and the repository root on the path
+    crud = pytest.importorskip('api.v1.FastAPI.crud')
+    models = pytest.importorskip('api.v1.FastAPI.models')
+    db = sqlite_session(models)
+    db.add(models.GameConfiguration(game_id='game', red_agent='B_lineAgent', blue_agent='BlueReactRemoveAgent', wrapper='simple', steps=3))
+    db.commit()
+    snapshots = [{'Blue': dict(view(), keyframe=True)}]
+    for colour in ['red', 'blue', 'yellow']:
+        snapshots.append({'Blue': make_delta(view(), view(node_colors=[colour] * 3))})
+    # inserted out of order, with another game in between
+    crud.create_game_states('game', [{'current_step': step, 'state_snapshot': snapshots[step]} for step in [2, 0, 3, 1]], db)
+    crud.create_game_state('other', 1, {}, db)
+    states = crud.get_game_states_up_to('game', 2, db)
+    assert [state.step for state in states] == [0, 1, 2]
+    assert reconstruct_snapshot([state.data for state in states]) == {'Blue': dict(view(node_colors=['blue'] * 3), keyframe=True)}
+    assert crud.get_game_states_up_to('missing', 2, db) == []
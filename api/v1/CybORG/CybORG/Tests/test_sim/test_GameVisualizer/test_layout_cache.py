@@ -0,0 +1,93 @@
+import inspect
+
+import networkx as nx
+import pytest
+
+from CybORG import CybORG
+from CybORG.GameVisualizer.GameStateCollector import layout_cache
+from CybORG.GameVisualizer.GameStateCollector.layout_cache import get_node_positions, topology_fingerprint
+from CybORG.Simulator.Scenarios.FileReaderScenarioGenerator import FileReaderScenarioGenerator
+
+
+@pytest.fixture()
+def empty_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(layout_cache, '_layouts', layout_cache.OrderedDict())
+    monkeypatch.setattr(layout_cache, 'LAYOUT_CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+
+def count_layouts(monkeypatch):
+    calls = []
+    spring_layout = nx.spring_layout
+
+    def counted(*args, **kwargs):
+        calls.append(args[0])
+        return spring_layout(*args, **kwargs)
+
+    monkeypatch.setattr(layout_cache.nx, 'spring_layout', counted)
+    return calls
+
+
+def test_fingerprint_ignores_insertion_order():
+    graph = nx.Graph([('a', 'b'), ('b', 'c')])
+    reordered = nx.Graph()
+    reordered.add_nodes_from(['c', 'b', 'a'])
+    reordered.add_edges_from([('c', 'b'), ('b', 'a')])
+    assert topology_fingerprint(graph) == topology_fingerprint(reordered)
+    reordered.add_edge('a', 'c')
+    assert topology_fingerprint(graph) != topology_fingerprint(reordered)
+
+
+def test_layout_cache_hit_and_miss(empty_cache, monkeypatch):
+    calls = count_layouts(monkeypatch)
+    graph = nx.Graph([('a', 'b'), ('b', 'c')])
+    positions = get_node_positions(graph)
+    assert [p['id'] for p in positions] == ['a', 'b', 'c']
+    # the same topology built in another order reuses the layout, in its own node order
+    reordered = get_node_positions(nx.Graph([('b', 'c'), ('a', 'b')]))
+    assert [p['id'] for p in reordered] == ['b', 'c', 'a']
+    assert sorted(reordered, key=lambda p: p['id']) == positions
+    assert len(calls) == 1
+    get_node_positions(nx.Graph([('a', 'b')]))
+    assert len(calls) == 2
+    # layouts are only written to disk when persisting
+    assert list(empty_cache.iterdir()) == []
+
+
+def test_layout_cache_is_bounded(empty_cache, monkeypatch):
+    monkeypatch.setattr(layout_cache, 'MAX_CACHED_LAYOUTS', 2)
+    calls = count_layouts(monkeypatch)
+    graphs = [nx.path_graph(n) for n in range(2, 5)]
+    get_node_positions(graphs[0])
+    get_node_positions(graphs[1])
+    get_node_positions(graphs[0])
+    # graphs[1] is now the least recently used and is evicted
+    get_node_positions(graphs[2])
+    assert len(layout_cache._layouts) == 2
+    get_node_positions(graphs[0])
+    assert len(calls) == 3
+    get_node_positions(graphs[1])
+    assert len(calls) == 4
+
+
+def test_persisted_layouts(empty_cache, monkeypatch):
+    calls = count_layouts(monkeypatch)
+    package_files = sorted(layout_cache.LAYOUT_DIR.iterdir())
+    graph = nx.path_graph(5)
+    positions = get_node_positions(graph, persist=True)
+    assert [path.name for path in empty_cache.iterdir()] == [f'{topology_fingerprint(graph)}.json']
+    assert sorted(layout_cache.LAYOUT_DIR.iterdir()) == package_files
+    # a new process reads the saved layout instead of computing it again
+    layout_cache._layouts.clear()
+    assert get_node_positions(graph, persist=True) == positions
+    assert len(calls) == 1
+
+
+def test_scenario2_layout_is_packaged(empty_cache, monkeypatch):
+    calls = count_layouts(monkeypatch)
+    path = str(inspect.getfile(CybORG))
+    path = path[:-7] + f'/Simulator/Scenarios/scenario_files/Scenario2.yaml'
+    cyborg = CybORG(FileReaderScenarioGenerator(path), 'sim', seed=1)
+    get_node_positions(cyborg.environment_controller.state.link_diagram, persist=True)
+    assert calls == []
+    assert list(empty_cache.iterdir()) == []
@@ -0,0 +1,73 @@
+import copy
+import pickle
+
+from CybORG.Simulator.IndexedList import Attribute, IndexedList
+from CybORG.Simulator.Process import Process
+
+
+def assert_indexes_match(host):
+    for process in host.processes:
+        assert host.get_process(process.pid) is [p for p in host.processes if p.pid == process.pid][0]
+        for conn in process.connections:
+            if 'remote_port' not in conn and 'remote_address' not in conn:
+                assert process in host.get_listening_processes(conn['local_port'])
+    for user in host.users:
+        assert host.get_user(user.username) is [u for u in host.users if u.username == user.username][0]
+    for file in host.files:
+        assert host.get_file(file.name) is [f for f in host.files if f.name == file.name][0]
+        assert host.get_file(file.name, file.path) is \
+            [f for f in host.files if f.name == file.name and f.path == file.path][0]
+
+
+def test_indexed_list():
+    items = IndexedList({'pid': Attribute('pid')})
+    first = Process(process_name='a', pid=1, parent_pid=0, username='root')
+    second = Process(process_name='b', pid=1, parent_pid=0, username='root')
+    items.append(first)
+    items += [second]
+    assert items.get('pid', 1) is first
+    assert items.get_all('pid', 1) == [first, second]
+    items.remove(first)
+    assert items.get('pid', 1) is second
+    items.insert(0, first)
+    assert items.get_all('pid', 1) == [first, second]
+    items.pop(0)
+    items.clear()
+    assert items.get('pid', 1) is None
+    items.append(first)
+    for restored in (copy.deepcopy(items), pickle.loads(pickle.dumps(items))):
+        assert isinstance(restored, IndexedList)
+        assert restored.get('pid', 1) is restored[0]
+        assert restored.get_all('pid', 1) == [restored[0]]
+
+
+def test_host_indexes(create_cyborg_sim):
+    cyborg = create_cyborg_sim
+    state = cyborg.environment_controller.state
+    for host in state.hosts.values():
+        assert_indexes_match(host)
+    hostname, host = next((name, host) for name, host in state.hosts.items() if host.processes)
+    process = host.add_process(name='test', user='root', open_ports=[{'local_port': 1234, 'local_address': '0.0.0.0'}])
+    assert host.get_process(process.pid) is process
+    assert host.get_listening_processes(1234) == [process]
+    state.remove_process(hostname, process.pid)
+    assert host.get_process(process.pid) is None
+    assert host.get_listening_processes(1234) == []
+    file = host.add_file('test.sh', '/tmp/', user='root')
+    assert host.get_file('test.sh', '/tmp/') is file
+    host.files.remove(file)
+    assert host.get_file('test.sh') is None
+    state.reboot_host(hostname)
+    assert_indexes_match(host)
+    assert_indexes_match(pickle.loads(pickle.dumps(host)))
+
+
+def test_add_process_never_reuses_pids(create_cyborg_sim):
+    state = create_cyborg_sim.environment_controller.state
+    hostname, host = next((name, host) for name, host in state.hosts.items() if host.processes)
+    process = host.add_process(name='test', user='root')
+    state.remove_process(hostname, process.pid)
+    # the removed process held the highest pid
+    assert host.add_process(name='test', user='root').pid > process.pid
+    state.reboot_host(hostname)
+    assert host.add_process(name='test', user='root').pid > process.pid
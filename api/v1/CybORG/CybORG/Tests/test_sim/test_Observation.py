@@ -504,3 +504,73 @@ def test_repeat_adding_interface_info(create_observation):
     observation.add_interface_info(hostid="test", ip_address="127.0.0.1")
     observation.add_interface_info(hostid="test", ip_address="127.0.0.1")
     assert len(observation.get_dict()["test"]["Interface"]) == 1
+
+
+def build_observation(observation, seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(200):
+        hostid = f'host{rng.integers(3)}'
+        ip = IPv4Address(f'10.0.0.{rng.integers(5)}')
+        choice = rng.integers(4)
+        if choice == 0:
+            observation.add_process(hostid=hostid, pid=int(rng.integers(10)), local_port=int(rng.integers(3)),
+                                    local_address=ip)
+        elif choice == 1:
+            observation.add_process(hostid=hostid, pid=int(rng.integers(10)), username='user')
+        elif choice == 2:
+            observation.add_interface_info(hostid=hostid, interface_name=f'eth{rng.integers(3)}', ip_address=ip,
+                                           subnet=IPv4Network('10.0.0.0/24'))
+        else:
+            observation.add_session_info(hostid=hostid, username='user', session_id=int(rng.integers(3)),
+                                         agent='Red', pid=int(rng.integers(10)))
+    return observation
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_building_matches_plain_observation(seed):
+    expected = build_observation(Observation(), seed)
+    observation = Observation()
+    with observation.building():
+        build_observation(observation, seed)
+    assert observation.data == expected.data
+    assert observation._indexes is None
+
+
+def test_combine_obs_merges_processes_by_pid(create_observation):
+    observation = create_observation
+    observation.add_process(hostid='host', pid=1, username='root')
+    observation.add_process(hostid='host', pid=2, username='user')
+    other = Observation()
+    other.add_process(hostid='host', pid=1, local_port=22, local_address='10.0.0.1')
+    observation.combine_obs(other)
+    assert observation.data['host'] == {
+        'Processes': [{'PID': 2, 'Username': 'user'},
+                      {'PID': 1, 'Username': 'root',
+                       'Connections': [{'local_port': 22, 'local_address': IPv4Address('10.0.0.1')}]}],
+        'Interface': [{'IP Address': IPv4Address('10.0.0.1')}]}
+    assert observation._indexes is None
+
+
+def test_building_merges_processes_by_pid(create_observation):
+    observation = create_observation
+    with observation.building():
+        observation.add_process(hostid='host', pid=1, local_port=22, local_address='10.0.0.1')
+        observation.add_process(hostid='host', pid=2, username='root')
+        observation.add_process(hostid='host', pid=1, local_port=80, local_address='10.0.0.1')
+    assert observation.data['host']['Processes'] == [
+        {'PID': 2, 'Username': 'root'},
+        {'PID': 1, 'Connections': [{'local_port': 22, 'local_address': IPv4Address('10.0.0.1')},
+                                   {'local_port': 80, 'local_address': IPv4Address('10.0.0.1')}]}]
+    assert observation.data['host']['Interface'] == [{'IP Address': IPv4Address('10.0.0.1')}]
+
+
+def test_filter_addresses(create_observation):
+    observation = create_observation
+    observation.add_process(hostid='host', pid=1, local_port=22, local_address='10.0.0.1')
+    observation.add_process(hostid='host', pid=2, local_port=22, local_address='10.0.0.2')
+    observation.add_process(hostid='host', pid=3, local_port=22, local_address='10.0.0.1', remote_port=4444,
+                            remote_address='10.0.0.3')
+    observation.add_interface_info(hostid='host', ip_address='10.0.0.2', subnet='10.0.0.0/24')
+    observation.filter_addresses(ips=[IPv4Address('10.0.0.1')], cidrs=[IPv4Network('10.0.0.0/24')])
+    assert [process['PID'] for process in observation.data['host']['Processes']] == [1]
+    assert observation.data['host']['Interface'] == [{'IP Address': IPv4Address('10.0.0.1')}]
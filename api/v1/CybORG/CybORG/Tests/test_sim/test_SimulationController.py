@@ -4,6 +4,10 @@ import networkx as nx
 import pytest
 from matplotlib import pyplot as plt
 
+from CybORG import CybORG
+from CybORG.Simulator.Actions import DiscoverRemoteSystems
+from CybORG.Simulator.Scenarios import DroneSwarmScenarioGenerator
+
 
 @pytest.fixture()
 def create_simulation_controller(create_cyborg_sim):
@@ -39,3 +43,50 @@ def test_get_osint(create_simulation_controller):
 #     pos = nx.spring_layout(G, seed=225)  # Seed for reproducible layout
 #     nx.draw(G, pos)
 #     plt.show()
+
+
+def test_state_version_bumped_by_step(create_simulation_controller):
+    ctrl = create_simulation_controller
+    version = ctrl.state.version
+    subnet = next(iter(ctrl.subnet_cidr_map.values()))
+    ctrl.step({'Red': DiscoverRemoteSystems(subnet=subnet, agent='Red', session=0)}, skip_valid_action_check=True)
+    assert ctrl.state.version > version
+
+
+def test_cached_agent_state(create_simulation_controller):
+    ctrl = create_simulation_controller
+    ctrl.step()
+    cached = ctrl.get_cached_agent_state('True')
+    # shared until the state changes and equal to a freshly built true state
+    assert ctrl.get_cached_agent_state('True') is cached
+    assert cached.data == ctrl._filter_obs(ctrl.get_agent_state('True')).data
+    assert ctrl.get_cached_agent_state('True', filtered=False).data == ctrl.get_agent_state('True').data
+    ctrl.state.bump_version()
+    assert ctrl.get_cached_agent_state('True') is not cached
+
+
+def test_update_data_links_matches_range():
+    sg = DroneSwarmScenarioGenerator(num_drones=12, starting_num_red=0, max_length_data_links=30)
+    cyborg = CybORG(sg, 'sim', seed=1)
+    state = cyborg.environment_controller.state
+    for _ in range(5):
+        cyborg.step()
+        for hostname, host in state.hosts.items():
+            for other_hostname, other_host in state.hosts.items():
+                in_range = state.dist(host.position, other_host.position) < 30
+                assert state.link_diagram.has_edge(hostname, other_hostname) == in_range
+        assert sorted(map(sorted, state.connected_components)) == sorted(map(sorted, nx.connected_components(state.link_diagram)))
+
+
+def test_cached_routes_follow_link_diagram():
+    sg = DroneSwarmScenarioGenerator(num_drones=12, starting_num_red=0, max_length_data_links=30)
+    cyborg = CybORG(sg, 'sim', seed=1)
+    state = cyborg.environment_controller.state
+    for _ in range(5):
+        cyborg.step()
+        for source in state.hosts:
+            for target in state.hosts:
+                routable = nx.has_path(state.link_diagram, source, target)
+                assert state.is_routable(source, target) == routable
+                expected = nx.shortest_path(state.link_diagram, source, target) if routable else None
+                assert state.get_route(source, target) == expected
@@ -0,0 +1,53 @@
+import inspect
+import pickle
+
+import pytest
+
+from CybORG import CybORG
+from CybORG.Agents import B_lineAgent, BlueReactRestoreAgent, RedMeanderAgent, BlueReactRemoveAgent
+from CybORG.Simulator.Scenarios.DroneSwarmScenarioGenerator import DroneSwarmScenarioGenerator
+from CybORG.Simulator.Scenarios.FileReaderScenarioGenerator import FileReaderScenarioGenerator
+
+
+def assert_pid_index_matches(state):
+    expected = {}
+    for agent, sessions in state.sessions.items():
+        for ident, session in sessions.items():
+            expected.setdefault((session.hostname, session.pid), {})[(agent, ident)] = None
+    assert {key: set(entries) for key, entries in state.pid_sessions.items()} == \
+           {key: set(entries) for key, entries in expected.items()}
+    for (hostname, pid), entries in expected.items():
+        assert state.get_session_from_pid(hostname, pid) in entries
+
+
+@pytest.mark.parametrize('red, blue', [(B_lineAgent, BlueReactRestoreAgent), (RedMeanderAgent, BlueReactRemoveAgent)])
+def test_pid_index_follows_game(red, blue):
+    path = str(inspect.getfile(CybORG))[:-7] + '/Simulator/Scenarios/scenario_files/Scenario2.yaml'
+    cyborg = CybORG(FileReaderScenarioGenerator(path), seed=1, agents={'Red': red(), 'Blue': blue()})
+    for i in range(60):
+        cyborg.step()
+        assert_pid_index_matches(cyborg.environment_controller.state)
+    assert_pid_index_matches(pickle.loads(pickle.dumps(cyborg.environment_controller.state)))
+    cyborg.reset()
+    assert_pid_index_matches(cyborg.environment_controller.state)
+
+
+def test_pid_index_follows_drone_swarm():
+    cyborg = CybORG(DroneSwarmScenarioGenerator(num_drones=18), seed=1)
+    for i in range(40):
+        cyborg.step()
+        assert_pid_index_matches(cyborg.environment_controller.state)
+
+
+def test_remove_session(create_cyborg_sim):
+    state = create_cyborg_sim.environment_controller.state
+    session = state.sessions['Red'][0]
+    new_session = state.add_session(host=session.hostname, user='root', agent='Red', parent=0)
+    assert state.get_session_from_pid(new_session.hostname, new_session.pid) == ('Red', new_session.ident)
+    state.remove_process(new_session.hostname, new_session.pid)
+    assert new_session.ident not in state.sessions['Red']
+    assert new_session.ident not in state.hosts[new_session.hostname].sessions['Red']
+    assert state.get_session_from_pid(new_session.hostname, new_session.pid) == (None, None)
+    state.reboot_host(session.hostname)
+    assert state.get_session_from_pid(session.hostname, session.pid) == (None, None)
+    assert_pid_index_matches(state)
@@ -0,0 +1,84 @@
+import io
+import json
+
+import pytest
+
+from CybORG.Shared import CybORGProfiler
+from CybORG.Shared.StepProfiler import BUCKETS, Histogram, PHASE_SECONDS, STEP_SECONDS, ACTION_SECONDS
+
+PHASES = {'get_action', 'validate_actions', 'sort_action_order', 'execute_actions', 'end_turn_actions',
+          'update_agents', 'determine_done', 'rewards', 'update_hosts', 'update_data_links'}
+
+
+@pytest.fixture()
+def profiler():
+    CybORGProfiler.reset()
+    CybORGProfiler.enable()
+    yield CybORGProfiler
+    CybORGProfiler.disable()
+    CybORGProfiler.reset()
+
+
+def test_profiler_disabled_by_default(cyborg_scenario1b_bline):
+    assert not CybORGProfiler.enabled
+    CybORGProfiler.reset()
+    cyborg_scenario1b_bline.step()
+    assert CybORGProfiler.collect() == []
+
+
+def test_step_phases(cyborg_scenario1b_bline, profiler):
+    for _ in range(5):
+        cyborg_scenario1b_bline.step()
+    collection = profiler.collect()
+    phases = {data['labels']['phase']: data for data in collection if data['name'] == PHASE_SECONDS}
+    assert set(phases) == PHASES
+    assert all(data['count'] == 5 for data in phases.values())
+    step = [data for data in collection if data['name'] == STEP_SECONDS][0]
+    assert step['count'] == 5
+    # the phases account for nearly all of the step
+    assert sum(data['sum'] for data in phases.values()) <= step['sum']
+    actions = {data['labels']['action']: data['count'] for data in collection if data['name'] == ACTION_SECONDS}
+    assert 'DiscoverRemoteSystems' in actions
+    # Blue monitors at the end of every step
+    assert actions['Monitor'] >= 5
+
+
+def test_histogram():
+    histogram = Histogram()
+    for value in [0.001] * 50 + [0.1] * 49 + [20.0]:
+        histogram.observe(value)
+    assert histogram.count == 100
+    assert histogram.sum == pytest.approx(0.05 + 4.9 + 20.0)
+    assert histogram.counts[BUCKETS.index(0.001)] == 50
+    assert histogram.counts[-1] == 1
+    assert 0.0005 < histogram.quantile(0.5) <= 0.001
+    assert 0.05 < histogram.quantile(0.99) <= 0.1
+    assert histogram.quantile(1.0) == 20.0
+    other = Histogram.from_dict(histogram.to_dict())
+    other.merge(histogram)
+    assert other.count == 200
+    assert other.counts[-1] == 2
+
+
+def test_merge_and_export(profiler):
+    profiler.observe(PHASE_SECONDS, 0.002, phase='rewards')
+    first = profiler.collect()
+    profiler.reset()
+    profiler.observe(PHASE_SECONDS, 0.02, phase='rewards')
+    profiler.observe(STEP_SECONDS, 0.03)
+    merged = profiler.merge([first, profiler.collect()])
+    assert [(data['name'], data['count']) for data in merged] == [(PHASE_SECONDS, 2), (STEP_SECONDS, 1)]
+
+    text = profiler.to_prometheus(merged)
+    assert f'# TYPE {PHASE_SECONDS} histogram' in text
+    assert f'{PHASE_SECONDS}_bucket{{phase="rewards",le="0.0025"}} 1' in text
+    assert f'{PHASE_SECONDS}_bucket{{phase="rewards",le="+Inf"}} 2' in text
+    assert f'{PHASE_SECONDS}_count{{phase="rewards"}} 2' in text
+    assert f'{STEP_SECONDS}_count 1' in text
+
+    sink = io.StringIO()
+    profiler.dump(sink, merged)
+    dumped = json.loads(sink.getvalue())
+    assert dumped['histograms'] == merged
+    assert dumped['summary'][0]['labels'] == {'phase': 'rewards'}
+    assert dumped['summary'][0]['max_ms'] == pytest.approx(20.0)
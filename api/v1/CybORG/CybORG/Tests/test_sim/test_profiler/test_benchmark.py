@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from CybORG.profiler import benchmark, fps_calculator
+
+
+def test_calculate_fps_counts_every_step(monkeypatch):
+    times = iter([0.0, 1.0])
+    monkeypatch.setattr(fps_calculator.time, 'time', lambda: next(times))
+    # episodes do not finish within 5 steps, so all 2 * 5 steps are counted
+    assert fps_calculator.calculate_fps(2, maximum_steps=5, number_of_repeats=2) == 10
+
+
+def test_run_benchmark_metrics():
+    result = benchmark.run_benchmark('scenario2_bline_vs_react_remove', steps=120, warmup=1)
+    assert result['steps'] == 120
+    # episodes are ended after 100 steps
+    assert result['resets'] == 1
+    assert result['steps_per_sec'] == pytest.approx(120 / result['seconds'])
+    assert 0 < result['p50_ms'] <= result['p99_ms']
+    assert result['peak_rss_mb'] > 0
+
+
+def test_unknown_scenario():
+    with pytest.raises(ValueError):
+        benchmark.run_benchmarks(['not_a_scenario'])
+
+
+def test_compare():
+    base = {'steps_per_sec': 100.0, 'p50_ms': 10.0, 'p99_ms': 20.0, 'peak_rss_mb': 100.0}
+    baseline = {'scenarios': {'a': base, 'b': base, 'c': {'skipped': 'no redis'}}}
+    results = {'scenarios': {
+        # p99 latency is allowed twice the tolerance
+        'a': dict(base, steps_per_sec=85.0, p99_ms=27.0),
+        'b': dict(base, steps_per_sec=70.0, peak_rss_mb=130.0),
+        'c': base,
+        'd': base,
+    }}
+    regressions = benchmark.compare(results, baseline, tolerance=0.2)
+    assert len(regressions) == 2
+    assert all(regression.startswith('b: ') for regression in regressions)
+    assert len(benchmark.compare(results, baseline, tolerance=0.1)) == 4
+
+
+def test_main_saves_and_compares_baseline(tmp_path, capsys):
+    baseline = tmp_path / 'baseline.json'
+    output = tmp_path / 'results.json'
+    args = ['drone_swarm_18', '--steps', '5', '--baseline', str(baseline), '--output', str(output)]
+    assert benchmark.main(args + ['--save-baseline']) == 0
+    saved = json.loads(baseline.read_text())
+    assert saved['scenarios'] == json.loads(output.read_text())['scenarios']
+    # any run is a regression against a baseline that was impossibly fast
+    saved['scenarios']['drone_swarm_18']['steps_per_sec'] = 1e12
+    baseline.write_text(json.dumps(saved))
+    assert benchmark.main(args) == 1
+    assert 'REGRESSION drone_swarm_18: steps_per_sec' in capsys.readouterr().err
+
+
+def test_memory_benchmark():
+    result = benchmark.run_benchmark('host_memory_scenario2', steps=5)
+    assert result['hosts'] == 16
+    assert result['bytes_per_host'] > 0
+    shared = [0] * 1000
+    seen = set()
+    assert benchmark.deep_sizeof([shared], seen) > benchmark.deep_sizeof([shared], seen)
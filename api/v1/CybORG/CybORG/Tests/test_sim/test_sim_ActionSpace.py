@@ -1,9 +1,16 @@
+import inspect
+import pickle
 from ipaddress import IPv4Network, IPv4Address
 from random import choice
 
 import pytest
 
+from CybORG import CybORG
+from CybORG.Agents import B_lineAgent, BlueReactRemoveAgent
 from CybORG.Agents.Wrappers import EnumActionWrapper
+from CybORG.Agents.Wrappers.ActionTable import ActionTable
+from CybORG.Simulator.Actions import InvalidAction, Sleep
+from CybORG.Simulator.Scenarios.FileReaderScenarioGenerator import FileReaderScenarioGenerator
 
 from CybORG.Simulator.Actions import MSFPortscan, UpgradeToMeterpreter, SSHLoginExploit, DiscoverNetworkServices, \
     ExploitRemoteService
@@ -233,3 +240,55 @@ def test_reboot(reboot):
 #     state.reboot_host('Internal')
 #     action_space = cyborg.get_action_space(agent)
 #     assert sum(value is True for value in action_space['target_session'].values()) == 1
+
+
+def valid_by_dicts(action_space, action) -> bool:
+    """The check replace_action_if_invalid makes against the action space dicts"""
+    action_space = action_space.get_action_space()
+    if not action_space['action'].get(type(action)):
+        return False
+    return all(action_space[name].get(value, False) for name, value in action.get_params().items() if name in action_space)
+
+
+def assert_index_matches(action_space):
+    for key, values in action_space.get_action_space().items():
+        assert action_space.valid[key] == {value for value, known in values.items() if known}, key
+
+
+@pytest.mark.parametrize('scenario', ['Scenario1b', 'Scenario2'])
+def test_valid_index_follows_updates(scenario):
+    path = str(inspect.getfile(CybORG))[:-7] + f'/Simulator/Scenarios/scenario_files/{scenario}.yaml'
+    cyborg = CybORG(scenario_generator=FileReaderScenarioGenerator(path), seed=123,
+                    agents={'Red': B_lineAgent(), 'Blue': BlueReactRemoveAgent()})
+    for episode in range(2):
+        for i in range(15):
+            cyborg.step()
+            for agent in ('Red', 'Blue'):
+                action_space = cyborg.environment_controller.agent_interfaces[agent].action_space
+                assert_index_matches(action_space)
+                table = ActionTable()
+                table.compile(action_space.get_action_space())
+                for action in table:
+                    assert action_space.is_valid(action) == valid_by_dicts(action_space, action), action
+        cyborg.reset()
+        assert_index_matches(cyborg.environment_controller.agent_interfaces['Red'].action_space)
+    action_space = pickle.loads(pickle.dumps(cyborg.environment_controller.agent_interfaces['Red'].action_space))
+    assert_index_matches(action_space)
+
+
+def test_replace_invalid_actions(create_sim_action_space, create_cyborg_sim):
+    action_space, agent = create_sim_action_space
+    controller = create_cyborg_sim.environment_controller
+    subnet = next(iter(action_space.subnet))
+    obs = Observation()
+    obs.add_interface_info(subnet=subnet)
+    action_space.update(obs.data, known=False)
+    assert subnet not in action_space.valid['subnet']
+    valid = Sleep()
+    unknown = MSFPortscan(ip_address=IPv4Address('1.2.3.4'), session=0, agent=agent)
+    actions = controller.replace_invalid_actions({agent: valid})
+    assert actions[agent] is valid
+    actions = controller.replace_invalid_actions({agent: unknown})
+    assert type(actions[agent]) is InvalidAction
+    assert actions[agent].action is unknown
+
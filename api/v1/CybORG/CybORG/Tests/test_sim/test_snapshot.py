@@ -0,0 +1,61 @@
+import inspect
+
+import pytest
+
+from CybORG import CybORG
+from CybORG.Agents import B_lineAgent, BlueReactRemoveAgent, GreenAgent
+from CybORG.Shared.RewardCalculator import IncrementalRewardCalculator
+from CybORG.Simulator.Scenarios import DroneSwarmScenarioGenerator, FileReaderScenarioGenerator
+
+
+def scenario2_cyborg():
+    path = str(inspect.getfile(CybORG))
+    path = path[:-7] + f'/Simulator/Scenarios/scenario_files/Scenario2.yaml'
+    sg = FileReaderScenarioGenerator(path)
+    return CybORG(sg, 'sim', agents={'Red': B_lineAgent(), 'Green': GreenAgent(), 'Blue': BlueReactRemoveAgent()}, seed=1)
+
+
+def drone_cyborg():
+    return CybORG(DroneSwarmScenarioGenerator(num_drones=8, red_internal_only=False), 'sim', seed=1)
+
+
+def play(cyborg, steps):
+    trajectory = []
+    for _ in range(steps):
+        cyborg.step()
+        trajectory.append((str(cyborg.get_rewards()),
+                           {agent: str(cyborg.get_last_action(agent)) for agent in cyborg.agents},
+                           str(cyborg.get_cached_agent_state('True'))))
+    return trajectory
+
+
+@pytest.fixture(params=[scenario2_cyborg, drone_cyborg])
+def cyborg(request, monkeypatch):
+    monkeypatch.setattr(IncrementalRewardCalculator, 'verify', True)
+    cyborg = request.param()
+    play(cyborg, 5)
+    return cyborg
+
+
+def test_fork_replays_identically(cyborg):
+    fork = cyborg.fork()
+    assert fork.environment_controller.state is not cyborg.environment_controller.state
+    assert play(fork, 10) == play(cyborg, 10)
+
+
+def test_restore_snapshot(cyborg):
+    snapshot = cyborg.snapshot()
+    expected = play(cyborg, 10)
+    cyborg.restore_snapshot(snapshot)
+    assert play(cyborg, 10) == expected
+    # a snapshot can be restored more than once
+    cyborg.restore_snapshot(snapshot)
+    assert play(cyborg, 10) == expected
+
+
+def test_save_and_restore(cyborg, tmp_path):
+    file = tmp_path / 'game.snapshot'
+    cyborg.save(str(file))
+    expected = play(cyborg, 10)
+    cyborg.restore(str(file))
+    assert play(cyborg, 10) == expected
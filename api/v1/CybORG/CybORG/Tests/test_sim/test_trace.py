@@ -0,0 +1,30 @@
+import io
+import json
+
+from CybORG.Shared import CybORGTrace
+
+
+def test_trace_disabled_by_default(cyborg_scenario1b_bline, capsys):
+    cyborg = cyborg_scenario1b_bline
+    assert not any(tracer.enabled for tracer in CybORGTrace.tracers.values())
+    cyborg.step()
+    assert capsys.readouterr().out == ''
+
+
+def test_json_step_trace(cyborg_scenario1b_bline):
+    cyborg = cyborg_scenario1b_bline
+    sink = io.StringIO()
+    CybORGTrace.configure(subsystems=['controller', 'simulation'], json_file=sink)
+    try:
+        cyborg.step()
+    finally:
+        CybORGTrace.disable()
+    events = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert {event['subsystem'] for event in events} == {'controller', 'simulation'}
+    assert [event['event'] for event in events if event['subsystem'] == 'controller'][0] == 'actions'
+    assert events[-1]['event'] == 'end_of_step'
+    assert all(event['step'] == 1 for event in events if 'step' in event)
+
+    # nothing is written once tracing is disabled again
+    cyborg.step()
+    assert len(sink.getvalue().splitlines()) == len(events)
@@ -0,0 +1,71 @@
+import inspect
+import itertools
+
+import numpy as np
+import pytest
+
+from CybORG import CybORG
+from CybORG.Agents.Wrappers.ActionTable import ActionTable
+from CybORG.Agents.Wrappers.EnumActionWrapper import EnumActionWrapper
+from CybORG.Simulator.Scenarios.FileReaderScenarioGenerator import FileReaderScenarioGenerator
+
+
+@pytest.fixture(params=['Scenario1b', 'Scenario2'])
+def cyborg_full_action_space(request):
+    # Scenario1 actions take parameters that are not in the action space, so it cannot be enumerated
+    path = str(inspect.getfile(CybORG))
+    path = path[:-7] + f'/Simulator/Scenarios/scenario_files/{request.param}.yaml'
+    return CybORG(scenario_generator=FileReaderScenarioGenerator(path), seed=123)
+
+
+def expand_action_space(action_space: dict) -> list:
+    """Every (action class, params) combination in the order the wrappers enumerate them"""
+    expanded = []
+    for action_class in action_space['action']:
+        names = ActionTable.get_param_names(action_class)
+        for values in itertools.product(*[list(action_space[name]) for name in names]):
+            expanded.append((action_class, dict(zip(names, values))))
+    return expanded
+
+
+@pytest.mark.parametrize('agent', ['Red', 'Blue'])
+def test_action_table_matches_cartesian_product(cyborg_full_action_space, agent):
+    cyborg = cyborg_full_action_space
+    cyborg.step()
+    action_space = cyborg.get_action_space(agent)
+    table = ActionTable()
+    expected = expand_action_space(action_space)
+    assert table.compile(action_space) == len(expected)
+    for i, (action_class, params) in enumerate(expected):
+        assert table.get_params(i) == params
+        action = table[i]
+        assert type(action) is action_class
+        assert str(action) == str(action_class(**params))
+    expected_mask = [action_space['action'][action_class] and all(action_space[name][value] for name, value in params.items())
+                     for action_class, params in expected]
+    assert table.mask().tolist() == expected_mask
+
+
+def test_action_table_recompiles_on_change(create_cyborg_sim):
+    cyborg = create_cyborg_sim
+    action_space = cyborg.get_action_space('Red')
+    table = ActionTable()
+    table.compile(action_space)
+    rows = table.table
+    # an unchanged action space reuses the compiled table
+    table.compile(cyborg.get_action_space('Red'))
+    assert table.table is rows
+    action_space = dict(action_space, session={**action_space['session'], 99: False})
+    table.compile(action_space)
+    assert len(table) == len(expand_action_space(action_space))
+    assert not table.mask()[[i for i in range(len(table)) if table.get_params(i).get('session') == 99]].any()
+
+
+def test_enum_action_wrapper_mask(create_cyborg_sim):
+    wrapper = EnumActionWrapper(create_cyborg_sim)
+    result = wrapper.reset('Red')
+    mask = wrapper.action_mask()
+    assert mask.dtype == np.bool_
+    assert len(mask) == result.action_space
+    with pytest.raises(IndexError):
+        wrapper.possible_actions[result.action_space]
@@ -9,7 +9,7 @@ from CybORG import CybORG
 from CybORG.Simulator.Actions import Remove
 from CybORG.Shared.Enums import TrinaryEnum
 from CybORG.Agents.SimpleAgents.B_line import B_lineAgent
-from CybORG.Agents.Wrappers.BlueTableWrapper import BlueTableWrapper
+from CybORG.Agents.Wrappers.BlueTableWrapper import BlueTableWrapper, fingerprint
 from CybORG.Simulator.Actions.AbstractActions import Monitor
 from CybORG.Agents import MonitorAgent
 from CybORG.Simulator.Scenarios.FileReaderScenarioGenerator import FileReaderScenarioGenerator
@@ -182,6 +182,57 @@ def test_blue_vector():
         assert type(results.observation) == type(expected_vector)
         assert len(results.observation) == len(expected_vector)
 
+def test_blue_vector_matches_table():
+    path = str(inspect.getfile(CybORG))
+    path = path[:-7] + f'/Simulator/Scenarios/scenario_files/Scenario1b.yaml'
+    sg = FileReaderScenarioGenerator(path)
+    cyborg = BlueTableWrapper(env=CybORG(sg, 'sim', agents={'Red': B_lineAgent()}, seed=1), output_mode='vector')
+    cyborg.reset(agent='Blue')
+    activity_bits = {'None': [0, 0], 'Scan': [1, 0], 'Exploit': [1, 1]}
+    compromised_bits = {'No': [0, 0], 'Unknown': [1, 0], 'User': [0, 1], 'Privileged': [1, 1]}
+    seen = set()
+    for i in range(15):
+        action = Remove(hostname='User1', agent='Blue', session=0) if i % 5 == 4 else Monitor(session=0, agent='Blue')
+        vector = cyborg.step(action=action, agent='Blue').observation
+        assert vector.dtype == np.int8
+        # hosts are in the order of the initial observation, not the sorted order of the table
+        rows = {row[2]: row for row in cyborg.get_table()._rows}
+        expected = [bit for hostname in cyborg.blue_info
+                    for bit in activity_bits[rows[hostname][3]] + compromised_bits[rows[hostname][4]]]
+        assert vector.tolist() == expected
+        seen.update((row[3], row[4]) for row in rows.values())
+        # the returned vector is not changed by later steps
+        vector[:] = 1
+    assert ('Exploit', 'User') in seen
+
+def test_fingerprint():
+    process = {'PID': 1, 'Connections': [{'local_port': 22, 'local_address': IPv4Address('10.0.0.1')}]}
+    reordered = {'Connections': [{'local_address': IPv4Address('10.0.0.1'), 'local_port': 22}], 'PID': 1}
+    assert fingerprint(process) == fingerprint(reordered)
+    assert hash(fingerprint(process)) == hash(fingerprint(reordered))
+    assert fingerprint(process) != fingerprint({'PID': 1, 'Connections': [{'local_port': 23, 'local_address': IPv4Address('10.0.0.1')}]})
+    assert fingerprint({'Connections': [1, 2]}) != fingerprint({'Connections': [2, 1]})
+
+
+def test_detect_anomalies_uses_baseline_index():
+    path = str(inspect.getfile(CybORG))
+    path = path[:-7] + f'/Simulator/Scenarios/scenario_files/Scenario1b.yaml'
+    sg = FileReaderScenarioGenerator(path)
+    cyborg = BlueTableWrapper(env=CybORG(sg, 'sim', agents={'Red': B_lineAgent()}, seed=1), output_mode='anomaly')
+    cyborg.reset(agent='Blue')
+    hostid = next(hostid for hostid, host in cyborg.baseline.items() if host.get('Processes'))
+    host = cyborg.baseline[hostid]
+    # baseline processes with their keys in another order are not anomalies
+    processes = [dict(reversed(list(process.items()))) for process in host['Processes']]
+    new_process = {'PID': 99999, 'Connections': [{'local_port': 4444, 'remote_port': 4444}]}
+    observation = {'success': TrinaryEnum.TRUE, hostid: dict(host, Processes=processes + [new_process])}
+    anomalies = cyborg._detect_anomalies(observation)
+    assert anomalies == {hostid: {'Processes': [new_process]}}
+    # an unchanged host reuses the anomalies of the last step
+    assert cyborg._detect_anomalies(observation)[hostid] is anomalies[hostid]
+    assert cyborg._detect_anomalies({'success': TrinaryEnum.TRUE, hostid: host}) == {}
+
+
 @pytest.fixture(params=['table','raw'])
 def cyborg(request,agents = {'Blue':MonitorAgent(),'Red':B_lineAgent()},seed = 1):
     path = str(inspect.getfile(CybORG))
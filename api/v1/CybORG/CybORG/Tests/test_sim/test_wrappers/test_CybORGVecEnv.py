@@ -0,0 +1,60 @@
+import inspect
+
+import numpy as np
+import pytest
+
+from CybORG import CybORG
+from CybORG.Agents import B_lineAgent, GreenAgent
+from CybORG.Agents.Wrappers import ChallengeWrapper, CybORGVecEnv
+from CybORG.Simulator.Scenarios.FileReaderScenarioGenerator import FileReaderScenarioGenerator
+
+
+def make_env(seed):
+    path = str(inspect.getfile(CybORG))
+    path = path[:-7] + f'/Simulator/Scenarios/scenario_files/Scenario2.yaml'
+    sg = FileReaderScenarioGenerator(path)
+    cyborg = CybORG(sg, 'sim', agents={'Red': B_lineAgent(), 'Green': GreenAgent()}, seed=seed)
+    return ChallengeWrapper(agent_name='Blue', env=cyborg, max_steps=10)
+
+
+@pytest.fixture()
+def vec_env():
+    env = CybORGVecEnv(make_env, num_envs=2, seed=3, start_method='fork')
+    yield env
+    env.close()
+
+
+def test_vec_env_matches_single_envs(vec_env):
+    envs = [make_env(3), make_env(4)]
+    # Analyse fails on the Scenario2 hosts, so it is left out of the sampled actions
+    valid = [i for i, action in enumerate(envs[0].env.possible_actions) if type(action).__name__ != 'Analyse']
+    rng = np.random.default_rng(0)
+
+    observations = vec_env.reset()
+    assert observations.dtype == np.float32
+    assert observations.shape == (2,) + vec_env.observation_space.shape
+    assert np.array_equal(observations, np.stack([env.reset() for env in envs]))
+
+    resets = 0
+    for step in range(15):
+        actions = rng.choice(valid, size=2)
+        observations, rewards, dones, infos = vec_env.step(actions)
+        resets += dones.sum()
+        for i, (env, action) in enumerate(zip(envs, actions)):
+            observation, reward, done, info = env.step(action)
+            assert rewards[i] == np.float32(reward)
+            assert dones[i] == done
+            if done:
+                assert np.array_equal(infos[i]['terminal_observation'], observation)
+                observation = env.reset()
+            assert np.array_equal(observations[i], observation)
+    # max_steps is 10, so both environments were reset automatically once
+    assert resets == 2
+
+
+def test_vec_env_reports_worker_errors(vec_env):
+    vec_env.reset()
+    with pytest.raises(RuntimeError):
+        vec_env.env_method('not_a_method')
+    # the workers keep serving after a failed command
+    assert len(vec_env.reset()) == 2
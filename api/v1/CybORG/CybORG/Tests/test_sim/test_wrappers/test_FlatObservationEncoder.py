@@ -0,0 +1,92 @@
+from copy import deepcopy
+from ipaddress import IPv4Address, IPv4Network
+
+import numpy as np
+import pytest
+
+from CybORG.Agents.Wrappers import FixedFlatWrapper, IntFixedFlatWrapper
+from CybORG.Shared.Enums import OperatingSystemType, TrinaryEnum
+
+
+def host(hostname, processes=0):
+    return {
+        'System info': {'Hostname': hostname, 'OSType': OperatingSystemType.LINUX},
+        'Processes': [{'PID': 100 + i, 'Process Name': f'proc{i}'} for i in range(processes)],
+        'Interface': [{'Interface Name': 'eth0', 'IP Address': IPv4Address('10.0.0.1'), 'Subnet': IPv4Network('10.0.0.0/24')}],
+    }
+
+
+@pytest.fixture()
+def observation():
+    return {'success': TrinaryEnum.TRUE, 'User0': host('User0', processes=2), 'User1': host('User1')}
+
+
+def test_fixed_flat_values(observation):
+    wrapper = FixedFlatWrapper()
+    encoder = wrapper.get_encoder()
+    flat = wrapper.observation_change('Red', observation)
+    assert len(flat) == encoder.size == 1 + 4 * encoder.host_size
+    assert flat[0] == TrinaryEnum.TRUE.value / 3
+    assert flat[1:3] == [0.0, OperatingSystemType.LINUX.value / len(OperatingSystemType.__members__)]
+    # second process of the first host
+    process = 1 + 7 + wrapper.MAX_PATCHES
+    process_size = 9 + 6 * wrapper.MAX_CONNECTIONS + wrapper.MAX_VULNERABILITIES
+    assert flat[process + process_size:process + process_size + 3] == [101 / 32768, -1.0, 1.0]
+    # the second host is numbered after the first one
+    assert flat[1 + encoder.host_size] == 1 / wrapper.MAX_HOSTS
+    # padding hosts are left as -1
+    assert set(flat[1 + 2 * encoder.host_size:]) == {-1.0}
+    assert wrapper.hostname == {'User0': 0, 'User1': 1}
+    assert wrapper.process_name == {'proc0': 0, 'proc1': 1}
+
+
+def test_observation_is_not_modified(observation):
+    expected = deepcopy(observation)
+    first = FixedFlatWrapper().observation_change('Red', observation)
+    assert observation == expected
+    assert IntFixedFlatWrapper().observation_change('Red', observation)
+    assert observation == expected
+    # padding is deterministic
+    assert FixedFlatWrapper().observation_change('Red', observation) == first
+
+
+@pytest.mark.parametrize('wrapper_class', [FixedFlatWrapper, IntFixedFlatWrapper])
+def test_encode_into_batch_row(wrapper_class, observation):
+    flat = wrapper_class().observation_change('Red', observation)
+    wrapper = wrapper_class()
+    batch = np.zeros((2, len(flat)), dtype=np.float32)
+    returned = wrapper.encode_observation(observation, batch[1])
+    assert np.shares_memory(returned, batch)
+    assert np.array_equal(batch[1], np.array(flat, dtype=np.float32))
+    assert not batch[0].any()
+    with pytest.raises(ValueError):
+        wrapper.encode_observation(observation, np.zeros(len(flat) - 1, dtype=np.float32))
+
+
+def test_limits(observation):
+    wrapper = IntFixedFlatWrapper()
+    size = len(wrapper.observation_change('Red', observation))
+    # processes past MAX_PROCESSES are dropped
+    observation['User0']['Processes'] = [{'PID': i} for i in range(10)]
+    flat = wrapper.observation_change('Red', observation)
+    assert len(flat) == size
+    assert list(wrapper.pid) == [100, 101, 0, 1, 2]
+    # hosts past MAX_HOSTS are dropped
+    many_hosts = dict(observation, **{f'Host{i}': host(f'Host{i}') for i in range(10)})
+    assert len(wrapper.observation_change('Red', many_hosts)) == size
+    # 'success' counts as one of the MAX_HOSTS entries
+    assert list(wrapper.hostname) == ['User0', 'User1', 'Host0', 'Host1']
+    # the limits can be changed after the wrapper is created
+    wrapper.MAX_PROCESSES = 4
+    assert len(wrapper.observation_change('Red', observation)) > size
+    assert wrapper.get_encoder().ids['pid'] is wrapper.pid
+    observation['User0']['System info']['os_patches'] = [-1] * (wrapper.MAX_PATCHES + 1)
+    with pytest.raises(ValueError):
+        wrapper.observation_change('Red', observation)
+
+
+def test_reset_clears_ids(cyborg_scenario1b):
+    wrapper = IntFixedFlatWrapper(cyborg_scenario1b)
+    first = wrapper.reset('Red').observation
+    assert wrapper.hostname
+    assert wrapper.reset('Red').observation == first
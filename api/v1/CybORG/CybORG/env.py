@@ -1,11 +1,12 @@
 # Copyright DST Group. Licensed under the MIT license.
+import copy
 import warnings
 from typing import Any, Union
 
 import gym
 from gym.utils import seeding
 
-from CybORG.Shared import Observation, Results, CybORGLogger
+from CybORG.Shared import Observation, Results, CybORGLogger, CybORGTrace
 from CybORG.Shared.Enums import DecoyType
 from CybORG.Shared.EnvironmentController import EnvironmentController
 from CybORG.Shared.Scenarios.ScenarioGenerator import ScenarioGenerator
@@ -17,6 +18,8 @@ from CybORG.Simulator.Actions.ConcreteActions.ControlTraffic import BlockTraffic
 from CybORG.Simulator.Actions.ConcreteActions.ExploitActions.ExploitAction import ExploitAction
 from CybORG.Simulator.Scenarios import DroneSwarmScenarioGenerator
 from CybORG.Tests.utils import CustomGenerator
+
+_trace = CybORGTrace.get('env')
 # from CybORG.render.renderer import Renderer
 
 
@@ -72,7 +75,7 @@ class CybORG(CybORGLogger):
             If None agents will be loaded from description in scenario file (default=None).
         """
         self.env = environment
-        print('env is:',self.env)
+        self._log_debug(f"Using environment {self.env}")
         assert issubclass(type(scenario_generator), ScenarioGenerator), f'Scenario generator object of type {type(scenario_generator)} must be a subclass of ScenarioGenerator'
         self.scenario_generator = scenario_generator
         self._log_info(f"Using scenario generator {str(scenario_generator)}")
@@ -153,7 +156,8 @@ class CybORG(CybORGLogger):
             action = {}
         else:
             action = {agent: action}
-        print('action is:',action)
+        if _trace.enabled:
+            _trace.event('step', agent=agent, action=action)
         self.environment_controller.step(action, skip_valid_action_check)
         self.environment_controller.send_messages(messages)
         if agent is None:
@@ -217,6 +221,23 @@ class CybORG(CybORGLogger):
         """
         return self.environment_controller.get_agent_state(agent_name).data
 
+    def get_cached_agent_state(self, agent_name) -> dict:
+        """
+        Like get_agent_state, but the result is computed once per change of the state and shared by every caller.
+
+        Parameters
+        ----------
+        agent : str
+            The agent to get the state for.
+            Set as 'True' to get the true-state.
+
+        Returns
+        -------
+        dict
+            The state of the specified agent. It must be treated as read only.
+        """
+        return self.environment_controller.get_cached_agent_state(agent_name, filtered=False).data
+
     def reset(self, agent: str = None, seed: int = None) -> Results:
         """
         Resets CybORG and gets initial observation and action-space for the specified agent.
@@ -291,6 +312,45 @@ class CybORG(CybORGLogger):
             Path to file to restore environment from.
         """
         self.environment_controller.restore(filepath)
+        self.np_random = self.environment_controller.np_random
+
+    def snapshot(self) -> bytes:
+        """
+        Captures the current game in memory, including the state, agents, reward calculators and random number
+        generator.
+
+        Returns
+        -------
+        bytes
+            Snapshot that can be passed to restore_snapshot any number of times.
+        """
+        return self.environment_controller.snapshot()
+
+    def restore_snapshot(self, snapshot: bytes):
+        """
+        Returns the environment to a snapshot taken from an environment with the same scenario generator.
+
+        Parameters
+        ----------
+        snapshot : bytes
+            Snapshot returned by snapshot.
+        """
+        self.environment_controller.restore_snapshot(snapshot)
+        self.np_random = self.environment_controller.np_random
+
+    def fork(self) -> 'CybORG':
+        """
+        Creates an independent copy of the environment that continues from the current step.
+
+        Returns
+        -------
+        CybORG
+            The copy, which shares only the scenario generator with this environment.
+        """
+        clone = copy.copy(self)
+        clone.environment_controller = self.environment_controller.fork()
+        clone.np_random = clone.environment_controller.np_random
+        return clone
 
     def get_observation(self, agent: str) -> dict:
         """
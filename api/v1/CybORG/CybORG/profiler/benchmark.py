@@ -0,0 +1,436 @@
+"""Reproducible benchmarks of the simulation, the wrappers and the API step endpoint.
+
+Each named scenario is stepped for a fixed number of steps with fixed seeds and reports
+steps per second (resets included), the p50/p99 latency of a single step and the peak RSS
+of the process running it. Scenarios run one at a time in a fresh process, so the peak
+RSS of one does not leak into the next. Memory scenarios instead report the bytes held by
+the hosts of the simulated state, per host, after a fixed number of steps.
+
+Results are written as JSON and compared against a stored baseline, any scenario that got
+slower or larger by more than the tolerance is reported as a regression:
+
+    python -m CybORG.profiler.benchmark                      # every scenario
+    python -m CybORG.profiler.benchmark drone_swarm_18 --steps 100 --output results.json
+    python -m CybORG.profiler.benchmark --save-baseline      # store the results as the new baseline
+    python -m CybORG.profiler.benchmark drone_swarm_50 --profile  # add the per phase step timings
+
+Baselines are only comparable on the machine they were recorded on.
+"""
+import argparse
+import contextlib
+import inspect
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from multiprocessing import get_context
+from types import FunctionType, ModuleType
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from CybORG import CybORG
+from CybORG.Agents import B_lineAgent, BlueReactRemoveAgent, GreenAgent
+from CybORG.Shared.StepProfiler import CybORGProfiler
+from CybORG.Agents.Wrappers import ChallengeWrapper, FixedFlatWrapper, IntFixedFlatWrapper, \
+    OpenAIGymWrapper, PettingZooParallelWrapper
+from CybORG.Simulator.Scenarios import DroneSwarmScenarioGenerator
+from CybORG.Simulator.Scenarios.FileReaderScenarioGenerator import FileReaderScenarioGenerator
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+# metrics compared against the baseline: (whether a larger value is better, multiple of the tolerance allowed),
+# tail latency varies the most between runs
+COMPARED_METRICS = {'steps_per_sec': (True, 1), 'p50_ms': (False, 1), 'p99_ms': (False, 2), 'peak_rss_mb': (False, 1),
+                    'bytes_per_host': (False, 1)}
+# Analyse fails on the Scenario2 hosts, so it is left out of the sampled actions
+EXCLUDED_ACTIONS = ('Analyse',)
+
+SCENARIOS = {}
+
+
+class BenchmarkUnavailable(Exception):
+    """Raised by a scenario whose dependencies or services are not available"""
+
+
+def scenario(name: str, steps: int, episode_length: int = 100):
+    """Registers a setup function under `name`.
+
+    The setup function takes a seed and returns (step, reset, close) callables, step
+    returns whether the episode is done. Episodes are also ended after episode_length steps.
+    """
+    def register(setup: Callable):
+        SCENARIOS[name] = {'setup': setup, 'steps': steps, 'episode_length': episode_length}
+        return setup
+    return register
+
+
+def memory_scenario(name: str, steps: int):
+    """Registers a setup function under `name` that takes a seed and returns a CybORG.
+
+    The hosts of its state are measured with deep_sizeof after `steps` steps.
+    """
+    def register(setup: Callable):
+        SCENARIOS[name] = {'setup': setup, 'steps': steps, 'memory': True}
+        return setup
+    return register
+
+
+def scenario_path(name: str) -> str:
+    path = str(inspect.getfile(CybORG))
+    return path[:-7] + f'/Simulator/Scenarios/scenario_files/{name}.yaml'
+
+
+def cyborg_runner(cyborg: CybORG):
+    def step():
+        cyborg.step()
+        return cyborg.environment_controller.done
+    return step, cyborg.reset, lambda: None
+
+
+def gym_runner(env, possible_actions, seed: int):
+    """Steps a gym environment with actions sampled from the possible actions"""
+    rng = np.random.default_rng(seed)
+    actions = [i for i, action in enumerate(possible_actions) if type(action).__name__ not in EXCLUDED_ACTIONS]
+
+    def step():
+        return env.step(int(rng.choice(actions)))[2]
+    return step, env.reset, lambda: None
+
+
+@scenario('scenario2_bline_vs_react_remove', steps=1000)
+def scenario2_bline_vs_react_remove(seed: int):
+    agents = {'Red': B_lineAgent(), 'Blue': BlueReactRemoveAgent(), 'Green': GreenAgent()}
+    return cyborg_runner(CybORG(FileReaderScenarioGenerator(scenario_path('Scenario2')), 'sim', agents=agents, seed=seed))
+
+
+def drone_swarm(num_drones: int):
+    def setup(seed: int):
+        return cyborg_runner(CybORG(DroneSwarmScenarioGenerator(num_drones=num_drones), 'sim', seed=seed))
+    return setup
+
+
+scenario('drone_swarm_18', steps=500)(drone_swarm(18))
+scenario('drone_swarm_50', steps=200)(drone_swarm(50))
+scenario('drone_swarm_100', steps=100)(drone_swarm(100))
+
+
+def scenario2_blue(seed: int) -> CybORG:
+    agents = {'Red': B_lineAgent(), 'Green': GreenAgent()}
+    return CybORG(FileReaderScenarioGenerator(scenario_path('Scenario2')), 'sim', agents=agents, seed=seed)
+
+
+@scenario('wrapper_challenge_blue', steps=1000)
+def wrapper_challenge_blue(seed: int):
+    env = ChallengeWrapper(agent_name='Blue', env=scenario2_blue(seed))
+    return gym_runner(env, env.env.possible_actions, seed)
+
+
+@scenario('wrapper_fixed_flat_blue', steps=1000)
+def wrapper_fixed_flat_blue(seed: int):
+    env = OpenAIGymWrapper(env=FixedFlatWrapper(scenario2_blue(seed)), agent_name='Blue')
+    return gym_runner(env, env.possible_actions, seed)
+
+
+@scenario('wrapper_int_fixed_flat_blue', steps=1000)
+def wrapper_int_fixed_flat_blue(seed: int):
+    env = OpenAIGymWrapper(env=IntFixedFlatWrapper(scenario2_blue(seed)), agent_name='Blue')
+    return gym_runner(env, env.possible_actions, seed)
+
+
+@scenario('wrapper_pettingzoo_drone_swarm_18', steps=500)
+def wrapper_pettingzoo_drone_swarm_18(seed: int):
+    env = PettingZooParallelWrapper(env=CybORG(DroneSwarmScenarioGenerator(num_drones=18), 'sim', seed=seed))
+    for i, agent in enumerate(env.possible_agents):
+        env.action_space(agent).seed(seed + i)
+
+    def step():
+        actions = {agent: env.action_space(agent).sample() for agent in env.agents}
+        _, _, dones, _ = env.step(actions)
+        return all(dones.values())
+    return step, env.reset, lambda: None
+
+
+@memory_scenario('host_memory_scenario2', steps=100)
+def host_memory_scenario2(seed: int):
+    agents = {'Red': B_lineAgent(), 'Blue': BlueReactRemoveAgent(), 'Green': GreenAgent()}
+    return CybORG(FileReaderScenarioGenerator(scenario_path('Scenario2')), 'sim', agents=agents, seed=seed)
+
+
+@memory_scenario('host_memory_drone_swarm_100', steps=20)
+def host_memory_drone_swarm_100(seed: int):
+    return CybORG(DroneSwarmScenarioGenerator(num_drones=100), 'sim', seed=seed)
+
+
+@scenario('api_step', steps=200)
+def api_step(seed: int):
+    """The POST /api/games/{game_id} endpoint, with a SQLite database in place of Postgres.
+
+    Needs the API dependencies and a Redis server at REDIS_SERVER (default localhost).
+    """
+    # the API imports its modules both from the repository root and from api/v1
+    api_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    for path in (os.path.dirname(os.path.dirname(api_root)), api_root):
+        if path not in sys.path:
+            sys.path.append(path)
+    try:
+        import redis
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from api.v1.FastAPI import models
+        from api.v1.FastAPI.api.routes import games
+    except ImportError as e:
+        raise BenchmarkUnavailable(f'API dependencies are missing: {e}')
+    try:
+        redis.Redis(host=os.getenv('REDIS_SERVER', 'localhost'), port=6379).ping()
+    except redis.exceptions.ConnectionError as e:
+        raise BenchmarkUnavailable(f'Redis is not reachable: {e}')
+
+    db_dir = tempfile.TemporaryDirectory()
+    engine = create_engine(f'sqlite:///{db_dir.name}/benchmark.db', connect_args={'check_same_thread': False})
+    models.Base.metadata.create_all(bind=engine)
+    games.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def get_db():
+        db = games.SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(games.router, prefix='/api/games')
+    app.dependency_overrides[games.get_db] = get_db
+    client = TestClient(app)
+    games.game_worker_pool.start()
+    config = {'red_agent': 'B_lineAgent', 'blue_agent': 'BlueReactRemoveAgent', 'wrapper': 'simple',
+              'steps': SCENARIOS['api_step']['episode_length']}
+    game = {}
+
+    def reset():
+        if 'id' in game:
+            client.delete(f"/api/games/{game['id']}")
+        response = client.post('/api/games/start', json=config)
+        response.raise_for_status()
+        game['id'] = response.json()['game_id']
+
+    def step():
+        response = client.post(f"/api/games/{game['id']}")
+        response.raise_for_status()
+        return response.json() == {'Status': 'End of Game'}
+
+    def close():
+        games.game_worker_pool.shutdown()
+        client.close()
+        engine.dispose()
+        db_dir.cleanup()
+    return step, reset, close
+
+
+def peak_rss_mb() -> float:
+    """Largest resident set size of this process and of its finished child processes"""
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # bytes on macOS, kilobytes elsewhere
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+# shared by every host, or not part of the simulated state
+SHARED_TYPES = (type, ModuleType, FunctionType, Enum, np.random.RandomState, np.random.Generator)
+
+
+def deep_sizeof(obj, seen: set = None) -> int:
+    """Bytes held by obj and every object it references through attributes and containers.
+
+    Objects whose id is in `seen` are not counted, and their ids are added to it, so sharing
+    `seen` between calls counts an object referenced from several places once.
+    """
+    seen = set() if seen is None else seen
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        if hasattr(obj, '__dict__'):
+            stack.append(obj.__dict__)
+        for cls in type(obj).__mro__:
+            slots = cls.__dict__.get('__slots__', ())
+            for slot in (slots,) if isinstance(slots, str) else slots:
+                if slot not in ('__dict__', '__weakref__') and hasattr(obj, slot):
+                    stack.append(getattr(obj, slot))
+    return size
+
+
+def run_memory_benchmark(name: str, steps: Optional[int] = None, seed: int = 0) -> dict:
+    config = SCENARIOS[name]
+    steps = config['steps'] if steps is None else steps
+    cyborg = config['setup'](seed)
+    for _ in range(steps):
+        cyborg.step()
+    hosts = list(cyborg.environment_controller.state.hosts.values())
+    seen = set()
+    total = sum(deep_sizeof(host, seen) for host in hosts)
+    return {'steps': steps, 'hosts': len(hosts), 'bytes_per_host': total / len(hosts)}
+
+
+def run_benchmark(name: str, steps: Optional[int] = None, seed: int = 0, warmup: int = 10, quiet: bool = True,
+                  profile: bool = False) -> dict:
+    """Runs one scenario in this process and returns its metrics, or {'skipped': reason}.
+
+    With profile=True the summary of the CybORGProfiler histograms of the timed steps is added
+    under 'profile'. Only phases of steps run in this process are recorded, not those of API workers.
+    """
+    config = SCENARIOS[name]
+    if config.get('memory'):
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull if quiet else sys.stdout):
+            return run_memory_benchmark(name, steps, seed)
+    steps = config['steps'] if steps is None else steps
+    latencies = np.zeros(steps)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull if quiet else sys.stdout):
+        try:
+            step, reset, close = config['setup'](seed)
+        except BenchmarkUnavailable as e:
+            return {'skipped': str(e)}
+        try:
+            reset()
+            for _ in range(warmup):
+                if step():
+                    reset()
+            reset()
+            resets = 0
+            episode_step = 0
+            if profile:
+                CybORGProfiler.reset()
+                CybORGProfiler.enable()
+            start = time.perf_counter()
+            for i in range(steps):
+                step_start = time.perf_counter()
+                done = step()
+                latencies[i] = time.perf_counter() - step_start
+                episode_step += 1
+                if done or episode_step >= config['episode_length']:
+                    reset()
+                    resets += 1
+                    episode_step = 0
+            elapsed = time.perf_counter() - start
+        finally:
+            if profile:
+                CybORGProfiler.disable()
+            close()
+    result = {
+        'steps': steps,
+        'resets': resets,
+        'seconds': elapsed,
+        'steps_per_sec': steps / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)) * 1000,
+        'p99_ms': float(np.percentile(latencies, 99)) * 1000,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+    if profile:
+        result['profile'] = CybORGProfiler.summary()
+    return result
+
+
+def run_isolated(name: str, **kwargs) -> dict:
+    """Runs one scenario in a fresh process"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+        return executor.submit(run_benchmark, name, **kwargs).result()
+
+
+def run_benchmarks(names: Optional[List[str]] = None, isolate: bool = True, **kwargs) -> dict:
+    names = list(SCENARIOS) if not names else names
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f'Unknown benchmark scenarios {unknown}, choose from {list(SCENARIOS)}')
+    run = run_isolated if isolate else run_benchmark
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scenarios': {name: run(name, **kwargs) for name in names},
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.2) -> List[str]:
+    """Regressions of the results against the baseline, as readable messages.
+
+    A metric regresses when it is worse than the baseline by more than `tolerance`, a
+    fraction of the baseline value, twice that for p99 latency. Scenarios skipped or missing
+    on either side are ignored, as are metrics a scenario does not report.
+    """
+    regressions = []
+    for name, metrics in results['scenarios'].items():
+        base = baseline.get('scenarios', {}).get(name)
+        if base is None or 'skipped' in base or 'skipped' in metrics:
+            continue
+        for metric, (higher_is_better, scale) in COMPARED_METRICS.items():
+            if metric not in metrics or metric not in base:
+                continue
+            value, base_value = metrics[metric], base[metric]
+            if higher_is_better:
+                regressed = value < base_value * (1 - tolerance * scale)
+            else:
+                regressed = value > base_value * (1 + tolerance * scale)
+            if regressed:
+                regressions.append(f'{name}: {metric} {value:.2f} against baseline {base_value:.2f}')
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmarks the simulation, the wrappers and the API')
+    parser.add_argument('scenarios', nargs='*', help=f'scenarios to run, default all of {list(SCENARIOS)}')
+    parser.add_argument('--steps', type=int, default=None, help='steps per scenario, overrides the scenario default')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help='file to write the results to, printed if not given')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed fraction a metric may be worse than the baseline')
+    parser.add_argument('--profile', action='store_true', help='add the per phase and per action step timings, '
+                                                               'which slows the steps down a little')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.scenarios, steps=args.steps, seed=args.seed, profile=args.profile)
+    output = json.dumps(results, indent=2)
+    if args.output is None:
+        print(output)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(output)
+
+    if args.save_baseline:
+        baseline = {'scenarios': {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        # scenarios that were skipped or not run keep their stored values
+        baseline.update({key: value for key, value in results.items() if key != 'scenarios'})
+        baseline['scenarios'].update({name: metrics for name, metrics in results['scenarios'].items()
+                                      if 'skipped' not in metrics})
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2)
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f'No baseline at {args.baseline}, run with --save-baseline to store one', file=sys.stderr)
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    for regression in regressions:
+        print(f'REGRESSION {regression}', file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
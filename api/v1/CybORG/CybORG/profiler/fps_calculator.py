@@ -7,7 +7,7 @@ from gym import Env, spaces
 from pettingzoo import AECEnv, ParallelEnv
 
 from CybORG import CybORG
-from CybORG.Agents.Wrappers import OpenAIGymWrapper, ChallengeWrapper, FixedFlatWrapper, EnumActionWrapper
+from CybORG.Agents.Wrappers import OpenAIGymWrapper, ChallengeWrapper, FixedFlatWrapper, EnumActionWrapper, CybORGVecEnv
 from CybORG.Simulator.Scenarios import DroneSwarmScenarioGenerator
 
 
@@ -25,6 +25,20 @@ def fps_calculator_open_ai_gym(env: Env, max_frames: int = 10000):
     # print(f'{round(max_frames/(end_time-start_time), 2)} fps')
 
 
+def fps_calculator_vec_env(env: CybORGVecEnv, max_frames: int = 10000, verbose=False):
+    """Measures the combined steps per second of all environments in a CybORGVecEnv"""
+    env.reset()
+    num_steps = max(round(max_frames / env.num_envs), 1)
+    start_time = time.time()
+    for i in range(num_steps):
+        env.step([env.action_space.sample() for _ in range(env.num_envs)])
+    end_time = time.time()
+    if verbose:
+        print(f'Time taken: {end_time - start_time} seconds for {num_steps * env.num_envs} steps over {env.num_envs} envs')
+        print(f'{round(num_steps * env.num_envs / (end_time - start_time), 2)} fps')
+    return num_steps * env.num_envs / (end_time - start_time)
+
+
 def fps_calculator_single_petting_zoo(env: AECEnv, max_frames: int = 10000):
     num_resets = 0
     env.reset()
@@ -66,12 +80,11 @@ def calculate_fps(number_of_drones, maximum_steps=100, number_of_repeats=100):
     cyborg = CybORG(sg)
     start_time = time.time()
     total_steps = 0
-    i = 0
     for j in range(number_of_repeats):
         for i in range(maximum_steps):
             cyborg.step()
+            total_steps += 1
             if cyborg.environment_controller.done:
-                total_steps += i
                 break
         cyborg.reset()
     end_time = time.time()
@@ -1,7 +1,4 @@
 # main.py
-import signal
-import subprocess
-import psutil
 from fastapi import (
     APIRouter,
     Depends,
@@ -12,9 +9,9 @@ from fastapi import (
     WebSocketDisconnect,
     HTTPException,
 )
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, AsyncGenerator
+from typing import Dict, AsyncGenerator, Optional
 import sys
 import os
 import redis.asyncio as redis
@@ -27,12 +24,8 @@ from FastAPI import crud
 from FastAPI.database import SessionLocal
 from FastAPI.schemas import GameConfig
 import logging
-import inspect
-import api.v1.CybORG.CybORG.CyborgAAS.Runner.SimpleAgentRunner
-
-# Retrieve the file path using inspect
-agent_runner_file_path = inspect.getfile(api.v1.CybORG.CybORG.CyborgAAS.Runner.SimpleAgentRunner)
-agent_runner_abs_path = os.path.abspath(agent_runner_file_path)
+from CybORG.CyborgAAS.Runner.GameWorkerPool import GameWorkerPool
+from CybORG.GameVisualizer.GameStateCollector.delta import apply_snapshot, reconstruct_snapshot
 
 router = APIRouter()
 
@@ -50,9 +43,11 @@ redis_client = redis.Redis(host=redis_server, port=6379, db=0, decode_responses=
 # Initialize WebSocket Connection Manager
 websocket_connection_manager = WebSocketConnectionManager()
 
-# Global dictionaries to keep track of subprocesses and tasks
-active_runner_procs = {}
-runner_proc_tasks = {}
+# Warm worker processes hosting the running games
+game_worker_pool = GameWorkerPool()
+
+# Latest full view of each running game, rebuilt from the deltas sent by the workers
+latest_views = {}
 
 async def subscribe_to_channel(channel: str) -> AsyncGenerator[str, None]:
     pubsub = redis_client.pubsub()
@@ -85,58 +80,20 @@ async def start_game(config: GameConfig, db: Session = Depends(get_db)):
         # Generate game_id and initialize state
         game_id = str(uuid.uuid4())
 
-        crud.start_new_game(game_id, config, db)
-
-        print(f"AgentRunner.py Path: {agent_runner_abs_path}")
-
-        # Start the subprocess using asyncio
-        runner_proc = await asyncio.create_subprocess_exec(
-            "python3",
-            "-u",  # Unbuffered stdout
-            agent_runner_abs_path,  # Path to SimpleAgentRunner.py
-            "--game_id", game_id,
-            "--num_steps", str(config.steps),
-            "--wrapper_type", config.wrapper,
-            "--red_agent_type", config.red_agent,
-            "--blue_agent_type", config.blue_agent,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            preexec_fn=os.setsid  # Start in a new session
+        # Host the game on the least loaded worker
+        data = await asyncio.to_thread(
+            game_worker_pool.create_game,
+            game_id,
+            num_steps=config.steps,
+            wrapper_type=config.wrapper,
+            red_agent_type=config.red_agent,
+            blue_agent_type=config.blue_agent,
         )
+        keyframe = data.get("state_snapshot")
+        latest_views[game_id] = apply_snapshot(None, keyframe)
 
-        if not runner_proc:
-            raise HTTPException(status_code=500, detail="Failed to start runner process")
-
-        print(runner_proc.pid, "Running")
-
-        # Store active game info in Redis
-        game_data = {
-            "runner_proc_pid": runner_proc.pid
-        }
-        await redis_client.hset(f"game:{game_id}", mapping=game_data)
-
-        # Function to read stream and publish to Redis channel
-        async def read_stream_and_publish(stream, channel_name):
-            try:
-                while True:
-                    line = await stream.readline()
-                    if not line:
-                        break
-                    message = line.decode().rstrip()
-                    await redis_client.publish(channel_name, message)
-            except Exception as e:
-                print(f"Error reading stream: {e}")
-
-        # Start tasks to read from stdout and stderr
-        stdout_channel = f"game:{game_id}:stdout"
-        stderr_channel = f"game:{game_id}:stderr"
-
-        task_stdout = asyncio.create_task(read_stream_and_publish(runner_proc.stdout, stdout_channel))
-        task_stderr = asyncio.create_task(read_stream_and_publish(runner_proc.stderr, stderr_channel))
-
-        # Keep track of the subprocess and tasks
-        active_runner_procs[game_id] = runner_proc
-        runner_proc_tasks[game_id] = [task_stdout, task_stderr]
+        # The keyframe is stored as step 0
+        crud.start_new_game(game_id, config, db, initial_state=keyframe)
 
         return {"game_id": game_id}
 
@@ -161,77 +118,82 @@ async def run_next_step(game_id: str, db: Session = Depends(get_db)):
     Run the next step in the game and return the game state.
     No body for this request
     """
-    # Retrieve game info from Redis
-    game_info = await redis_client.hgetall(f"game:{game_id}")
-    if not game_info:
+    if not game_worker_pool.has_game(game_id):
         raise HTTPException(status_code=404, detail="Game not found or expired")
 
-    runner_proc_pid = int(game_info.get('runner_proc_pid', 0))
-    print(runner_proc_pid)
-
-    if not runner_proc_pid:
-        raise HTTPException(status_code=404, detail="Runner process not found")
-
-    # Check if the subprocess is still running
-    if not psutil.pid_exists(runner_proc_pid):
-        raise HTTPException(status_code=404, detail="Runner process not running")
-
-    # Publish a message to trigger the next step
-    await redis_client.publish(f'game_{game_id}_main', "Next Step")
-
-    # Using Redis Lists
-    state_list_key = f"game:{game_id}:states"
-    state_snapshot = await redis_client.brpop(state_list_key, timeout=300)
-
-    if not state_snapshot:
-        return {"Status": "End of Game or Timeout"}
+    try:
+        data = await asyncio.to_thread(game_worker_pool.run_next_step, game_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-    _, state_data = state_snapshot
-    data = json.loads(state_data)
     state_snapshot = data.get("state_snapshot")
     current_step = data.get("current_step")
 
     if not state_snapshot:
         return {"Status": "End of Game"}
 
-    # Store in DB
+    # Let websocket listeners follow the game progress
+    await redis_client.publish(f"game:{game_id}:stdout", f"Completed step {current_step}.")
+
+    # Store the delta in DB, but answer with the full view
     crud.create_game_state(game_id, current_step, state_snapshot, db)
 
-    return state_snapshot
+    latest_views[game_id] = apply_snapshot(latest_views.get(game_id), state_snapshot)
+    return latest_views[game_id]
+
+@router.post("/{game_id}/steps")
+async def run_steps(game_id: str, count: Optional[int] = Query(None, ge=1)):
+    """
+    Run `count` steps back to back, or the rest of the game if count is omitted.
+    The state snapshots are streamed as NDJSON, one {"current_step", "state_snapshot"} per line,
+    where state_snapshot is the delta against the previous step (see GameStateCollector.delta),
+    and stored in the database with a single bulk insert once the batch has finished.
+    """
+    if not game_worker_pool.has_game(game_id):
+        raise HTTPException(status_code=404, detail="Game not found or expired")
+
+    steps = game_worker_pool.iter_steps(game_id, count)
+
+    async def stream_states():
+        states = []
+        try:
+            while True:
+                state = await asyncio.to_thread(next, steps, None)
+                if state is None:
+                    break
+                states.append(state)
+                latest_views[game_id] = apply_snapshot(latest_views.get(game_id), state["state_snapshot"])
+                yield json.dumps(state) + "\n"
+        except Exception as e:
+            yield json.dumps({"error": str(e)}) + "\n"
+        finally:
+            # a client that disconnects early stops the game after its current step,
+            # the steps it did not receive are still stored so the delta chain stays complete
+            for state in await asyncio.to_thread(steps.close):
+                states.append(state)
+                latest_views[game_id] = apply_snapshot(latest_views.get(game_id), state["state_snapshot"])
+            if states:
+                # the request scoped session may already be closed while streaming
+                db = SessionLocal()
+                try:
+                    crud.create_game_states(game_id, states, db)
+                finally:
+                    db.close()
+                await redis_client.publish(f"game:{game_id}:stdout", f"Completed step {states[-1]['current_step']}.")
+
+    return StreamingResponse(stream_states(), media_type="application/x-ndjson")
 
 @router.delete("/{game_id}")
 async def end_game(game_id: str, db: Session = Depends(get_db)):
     """
     Delete a game and associated game states from the database and Redis cache
     """
-    # Retrieve game info from Redis
-    game_info = await redis_client.hgetall(f"game:{game_id}")
-    if game_info:
-
-      runner_proc_pid = int(game_info.get('runner_proc_pid', 0))
-
-      if runner_proc_pid:
-          try:
-              # Terminate the process group
-              os.killpg(os.getpgid(runner_proc_pid), signal.SIGTERM)
-              # Wait for the child process to prevent it from becoming a zombie
-              os.waitpid(runner_proc_pid, 0)
-          except ProcessLookupError:
-              # Process or process group does not exist
-              pass
-          except Exception as e:
-              raise HTTPException(status_code=500, detail=f"Error terminating runner process: {str(e)}")
-
-      # Cancel associated tasks
-      tasks = runner_proc_tasks.pop(game_id, [])
-      for task in tasks:
-          task.cancel()
-
-      # Remove from active_runner_procs
-      active_runner_procs.pop(game_id, None)
-
-      # Remove from Redis
-      await redis_client.delete(f"game:{game_id}")
+    if game_worker_pool.has_game(game_id):
+        try:
+            await asyncio.to_thread(game_worker_pool.end_game, game_id)
+            latest_views.pop(game_id, None)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error ending game on worker: {str(e)}")
 
     # Delete game from database
     deleted_count = crud.delete_game(game_id, db)
@@ -243,11 +205,12 @@ async def end_game(game_id: str, db: Session = Depends(get_db)):
 @router.get("/{game_id}/step/{step}")
 async def get_step_state(game_id: str, step: int, db: Session = Depends(get_db)):
     """
-    Returns the state of the game at the given step
+    Returns the full state of the game at the given step,
+    rebuilt from the step 0 keyframe and the stored deltas
     """
-    game_state = crud.get_game_state(game_id, step, db)
-    if game_state:
-        return game_state.data
+    game_states = crud.get_game_states_up_to(game_id, step, db)
+    if game_states and game_states[-1].step == step:
+        return reconstruct_snapshot([game_state.data for game_state in game_states]) or {}
     else:
         raise HTTPException(status_code=404, detail="Game state not found")
 
@@ -282,44 +245,12 @@ async def websocket_endpoint(websocket: WebSocket, game_id: str):
 @router.on_event("startup")
 async def startup_event():
     """
-    Initialize active game runner processes and tasks
-     - Fetch all game IDs from Redis
-     - Check if their runner processes are still running
-     - If so, reconstruct the subprocess and (tasks to read stdout and stderr is not supported)
-     """
-    await initialize_active_games()
-
-async def initialize_active_games():
-    keys = await redis_client.keys('game:*')
-    for key in keys:
-        # Check if the key is of type 'hash'
-        key_type = await redis_client.type(key)
-        if key_type == 'hash':
-            game_info = await redis_client.hgetall(key)
-            game_id = key.split(":")[1]
-            runner_proc_pid = int(game_info.get('runner_proc_pid', 0))
-            # Reconstruct active_runner_procs
-            if psutil.pid_exists(runner_proc_pid):
-                # Note: You may need to adjust how you reconstruct the subprocess
-                runner_proc = psutil.Process(runner_proc_pid)
-                active_runner_procs[game_id] = runner_proc
+    Start the game worker pool.
+    Games live in the worker processes, so games from a previous run are not resumed.
+    """
+    game_worker_pool.start()
 
 @router.on_event("shutdown")
 async def shutdown_event():
-    # Retrieve all active games
-    keys = await redis_client.keys('game:*')
-    for key in keys:
-        # Check if the key is of type 'hash'
-        key_type = await redis_client.type(key)
-        if key_type == 'hash':
-            game_info = await redis_client.hgetall(key)
-            game_id = key.split(":")[1]
-            runner_proc_pid = int(game_info.get('runner_proc_pid', 0))
-            if runner_proc_pid:
-                try:
-                    os.kill(runner_proc_pid, signal.SIGTERM)
-                    os.waitpid(runner_proc_pid, 0)
-                except OSError:
-                    pass
-            # Optionally, delete the game key
-            await redis_client.delete(game_id)
\ No newline at end of file
+    # Stop all workers along with the games they host
+    await asyncio.to_thread(game_worker_pool.shutdown)
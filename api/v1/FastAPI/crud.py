@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 from api.v1.FastAPI import models, schemas
 from api.v1.FastAPI.schemas import GameConfig
 
-def start_new_game(game_id: str, game_config: GameConfig, db: Session):
+def start_new_game(game_id: str, game_config: GameConfig, db: Session, initial_state: dict = None):
     red_agent, blue_agent, wrapper, steps = game_config.red_agent, game_config.blue_agent, game_config.wrapper, game_config.steps
     new_game_config = models.GameConfiguration(game_id=game_id, red_agent=red_agent, blue_agent=blue_agent, wrapper=wrapper, steps=steps)
     db.add(new_game_config)
@@ -13,7 +13,7 @@ def start_new_game(game_id: str, game_config: GameConfig, db: Session):
     db.refresh(new_game_config)
     # this is not working properly cause game.py active_games objects would not be updated
     # how can we solve this problem?
-    create_game_state(game_id, 0, {}, db)
+    create_game_state(game_id, 0, initial_state or {}, db)
     return new_game_config
 
 def get_all_games(db: Session):
@@ -115,9 +115,27 @@ def create_game_state(game_id: str, step: int, data: dict, db: Session):
     db.refresh(new_game_state)
     return new_game_state
     
+def create_game_states(game_id: str, states: list, db: Session):
+    """Bulk insert a batch of {'current_step', 'state_snapshot'} dicts in a single statement"""
+    db.bulk_insert_mappings(models.GameState, [
+        {"game_id": game_id, "step": state["current_step"], "data": state["state_snapshot"]}
+        for state in states
+    ])
+    db.commit()
+    return len(states)
+
 def get_game_state(game_id: str, step: int, db: Session):
     return db.query(models.GameState).filter(models.GameState.game_id == game_id, models.GameState.step == step).first()
 
+def get_game_states_up_to(game_id: str, step: int, db: Session):
+    """Returns the stored snapshots from step 0 up to the given step, in step order"""
+    return (
+        db.query(models.GameState)
+        .filter(models.GameState.game_id == game_id, models.GameState.step <= step)
+        .order_by(models.GameState.step)
+        .all()
+    )
+
 def get_game_config(game_id: str, db: Session):
     return db.query(models.GameConfiguration).filter(models.GameConfiguration.game_id == game_id).first()
 
@@ -1,12 +1,15 @@
 from fastapi import FastAPI, HTTPException, Request, Depends
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Dict, Union
 from pprint import pprint
+import asyncio
 
 from api.v1.FastAPI import models
 from api.v1.FastAPI.database import engine
 from api.v1.FastAPI.api.main import api_router
+from api.v1.FastAPI.api.routes.games import game_worker_pool
+from CybORG.Shared.StepProfiler import CybORGProfiler
 
 # Create all tables
 models.Base.metadata.create_all(bind=engine)
@@ -28,6 +31,18 @@ app.add_middleware(
 # Include Routers
 app.include_router(api_router, prefix="/api")
 
+@app.get("/metrics")
+async def metrics(format: str = "prometheus"):
+    """
+    Step timing histograms of the game workers, in the Prometheus text format
+    or as JSON with format=json. Workers only record them when the server is
+    started with CYBORG_PROFILE=1.
+    """
+    collection = await asyncio.to_thread(game_worker_pool.metrics)
+    if format == "json":
+        return JSONResponse({"summary": CybORGProfiler.summary(collection), "histograms": collection})
+    return PlainTextResponse(CybORGProfiler.to_prometheus(collection))
+
 # Will be deprecated soon
 @app.get("/", response_class=HTMLResponse)
 def read_root():